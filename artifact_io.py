@@ -0,0 +1,103 @@
+import io
+import os
+import gzip
+import shutil
+
+try:
+    import zstandard
+except ImportError:  # optional dependency, only needed for zstd compressed artifacts
+    zstandard = None
+
+# Suffix appended to an artifact's name for each compression method, in lookup order
+COMPRESSION_SUFFIXES = {
+    'gzip': '.gz',
+    'zstd': '.zst'
+}
+COPY_BUFFER_SIZE = 1024 * 1024
+
+
+def resolve_artifact(path):
+    """Return the file that holds the artifact at path: path itself or its compressed variant.
+
+    Falls back to path if none exists, so callers can report the expected name.
+    """
+    if os.path.exists(path):
+        return path
+    for suffix in COMPRESSION_SUFFIXES.values():
+        if os.path.exists(path + suffix):
+            return path + suffix
+    return path
+
+
+def artifact_exists(path):
+    return os.path.exists(resolve_artifact(path))
+
+
+def is_compressed(path):
+    return resolve_artifact(path) != path
+
+
+def artifact_name(file_name):
+    """Return the logical artifact name of a file name, i.e. without a compression suffix."""
+    for suffix in COMPRESSION_SUFFIXES.values():
+        if file_name.endswith(suffix):
+            return file_name[:-len(suffix)]
+    return file_name
+
+
+def open_artifact(path, mode='r', encoding='utf-8', newline=None):
+    """Open an artifact for reading, decompressing a .gz/.zst variant on the fly.
+
+    mode is 'r' (text) or 'rb'; compressed files are streamed, never loaded as a whole.
+    """
+    actual_path = resolve_artifact(path)
+    binary = 'b' in mode
+    if actual_path.endswith(COMPRESSION_SUFFIXES['gzip']):
+        raw = gzip.open(actual_path, 'rb')
+    elif actual_path.endswith(COMPRESSION_SUFFIXES['zstd']):
+        if zstandard is None:
+            raise Exception(f"Reading {actual_path} requires the 'zstandard' package")
+        raw = zstandard.ZstdDecompressor().stream_reader(open(actual_path, 'rb'), closefd=True)
+        raw = io.BufferedReader(raw, COPY_BUFFER_SIZE)
+    else:
+        if binary:
+            return open(actual_path, 'rb')
+        return open(actual_path, 'r', encoding=encoding, newline=newline)
+    if binary:
+        return raw
+    return io.TextIOWrapper(raw, encoding=encoding, newline=newline)
+
+
+def compress_artifact(path, method='gzip', level=6):
+    """Compress a file in place (path -> path.gz / path.zst) and return the new path.
+
+    The compressed file keeps the original modification time. zstd falls back to gzip if the
+    optional 'zstandard' package is not installed (the level is clamped to gzip's 0-9 range).
+    """
+    if method == 'zstd' and zstandard is None:
+        print("Warning: 'zstandard' is not installed, compressing with gzip instead")
+        method = 'gzip'
+    if method not in COMPRESSION_SUFFIXES:
+        raise Exception(f"Unknown compression method: {method}")
+
+    output_path = path + COMPRESSION_SUFFIXES[method]
+    tmp_path = output_path + ".tmp"
+    stat = os.stat(path)
+    try:
+        with open(path, 'rb') as source, open(tmp_path, 'wb') as target:
+            if method == 'gzip':
+                with gzip.GzipFile(filename=os.path.basename(path), mode='wb', fileobj=target,
+                                   compresslevel=max(0, min(level, 9)), mtime=int(stat.st_mtime)) as compressed:
+                    shutil.copyfileobj(source, compressed, COPY_BUFFER_SIZE)
+            else:
+                compressor = zstandard.ZstdCompressor(level=level)
+                compressor.copy_stream(source, target, read_size=COPY_BUFFER_SIZE, write_size=COPY_BUFFER_SIZE)
+        os.utime(tmp_path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+        os.replace(tmp_path, output_path)
+    except BaseException:
+        # Don't leave a partial .tmp next to the original, which is kept
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    os.remove(path)
+    return output_path
@@ -0,0 +1,137 @@
+import queue
+import atexit
+import shlex
+import posixpath
+import threading
+import time
+from instrumentation import bind_context
+
+DEFAULT_WORKERS = 2
+DEFAULT_QUEUE_SIZE = 4
+SNAPSHOT_DIR_NAME = "artifact_snapshots"
+
+
+class ArtifactPipeline:
+    """Processes the artifacts of finished runs in background threads while the campaign moves on.
+
+    submit() first moves the run's remote files into a per-run snapshot directory on the remote
+    host (synchronously, so the cleanup at the start of the next LoadRunner.run_test cannot delete
+    them) and then queues the processing job. The queue is bounded: when the workers fall behind,
+    submit() blocks instead of piling up snapshots. close() drains the queue and stops the workers.
+    """
+
+    def __init__(self, ssh_manager, workers=DEFAULT_WORKERS, queue_size=DEFAULT_QUEUE_SIZE):
+        self.ssh = ssh_manager
+        self.workers = max(1, workers)
+        self._queue = queue.Queue(maxsize=max(1, queue_size))
+        self._lock = threading.Lock()
+        self.completed = 0
+        self.failed = []
+        self._closed = False
+        self._threads = []
+        for idx in range(self.workers):
+            # Daemon threads so that an aborted campaign cannot hang on exit; close() drains them
+            thread = threading.Thread(target=self._work, name=f"artifact-pipeline-{idx + 1}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        atexit.register(self.close)
+
+    def snapshot(self, run_id, remote_paths):
+        """Move the run's remote files into <dir of first file>/artifact_snapshots/<run_id>/.
+
+        Returns {name: snapshot path} for the files that exist (missing files are skipped).
+        """
+        paths = {name: path for name, path in remote_paths.items() if path}
+        if not paths:
+            return {}
+        snapshot_dir = posixpath.join(posixpath.dirname(next(iter(paths.values()))) or ".",
+                                      SNAPSHOT_DIR_NAME, run_id)
+        snapshots = {name: posixpath.join(snapshot_dir, name) for name in paths}
+        commands = [f"mkdir -p {shlex.quote(snapshot_dir)}"]
+        for name, path in paths.items():
+            # mv within one file system is a rename, so large logs are not copied; the names of the
+            # moved files are echoed so that missing ones can be left out
+            commands.append(f"if [ -f {shlex.quote(path)} ]; then mv -f {shlex.quote(path)} "
+                            f"{shlex.quote(snapshots[name])} && echo {shlex.quote(name)}; fi")
+        exit_status, out, err = self.ssh.run_command(" && ".join(commands))
+        if exit_status != 0:
+            raise Exception(f"Failed to snapshot remote artifacts of {run_id}: {err.strip()}")
+        moved = set(out.splitlines())
+        missing = [name for name in snapshots if name not in moved]
+        if missing:
+            print(f"Remote artifacts of {run_id} not found, skipping: {', '.join(missing)}")
+        if not moved:
+            self.ssh.run_command(f"rmdir {shlex.quote(snapshot_dir)}")
+        return {name: path for name, path in snapshots.items() if name in moved}
+
+    def submit(self, run_id, remote_paths, process):
+        """Snapshot remote_paths ({name: remote path}) and queue process(snapshots) for a worker.
+
+        process returns True if the run's artifacts are complete; the remote snapshot is then
+        removed, otherwise it is kept for a manual retry.
+        """
+        if self._closed:
+            raise Exception("Artifact pipeline is closed")
+        snapshots = self.snapshot(run_id, remote_paths)
+        if self._queue.full():
+            print(f"Artifact pipeline is busy ({self._queue.qsize()} runs queued), waiting for a free slot...")
+        # The worker runs process in the submitter's context, so its spans keep the run's tags
+        self._queue.put((run_id, snapshots, bind_context(process)))
+        print(f"Queued artifacts of {run_id} for background processing")
+
+    def _work(self):
+        while True:
+            job = self._queue.get()
+            try:
+                if job is None:
+                    return
+                self._process(*job)
+            finally:
+                self._queue.task_done()
+
+    def _process(self, run_id, snapshots, process):
+        start = time.time()
+        try:
+            complete = process(snapshots)
+        except Exception as e:
+            print(f"Background processing of {run_id} failed: {e}")
+            complete = False
+        if complete:
+            self._remove_snapshots(snapshots)
+        else:
+            print(f"Artifacts of {run_id} are incomplete, keeping remote snapshot: {list(snapshots.values())}")
+        with self._lock:
+            if complete:
+                self.completed += 1
+            else:
+                self.failed.append(run_id)
+        print(f"Background processing of {run_id} finished in {time.time() - start:.1f}s")
+
+    def _remove_snapshots(self, snapshots):
+        if not snapshots:
+            return
+        snapshot_dir = posixpath.dirname(next(iter(snapshots.values())))
+        try:
+            self.ssh.run_command(f"rm -rf {shlex.quote(snapshot_dir)}")
+        except Exception as e:
+            print(f"Warning: Failed to remove remote snapshot {snapshot_dir}: {e}")
+
+    def drain(self):
+        """Block until every queued run has been processed."""
+        pending = self._queue.qsize()
+        if pending:
+            print(f"Waiting for the artifact pipeline to finish {pending} queued run(s)...")
+        self._queue.join()
+
+    def close(self):
+        """Drain the queue and stop the workers (safe to call more than once)."""
+        if self._closed:
+            return
+        self.drain()
+        self._closed = True
+        for _ in self._threads:
+            self._queue.put(None)
+        for thread in self._threads:
+            thread.join()
+        print(f"Artifact pipeline closed: {self.completed} run(s) complete, {len(self.failed)} incomplete"
+              + (f" ({', '.join(self.failed)})" if self.failed else ""))
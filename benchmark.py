@@ -0,0 +1,282 @@
+#!/usr/bin/env python3
+import io
+import os
+import sys
+import csv
+import json
+import time
+import random
+import shutil
+import resource
+import argparse
+import platform
+import tempfile
+import contextlib
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+# Raw error messages of a failed request (placeholders are filled per request) and their weight
+DEFAULT_ERROR_MIX = {
+    "ReadTimeout(HTTPConnectionPool(host='{ip}', port={port}): Read timed out. (read timeout={timeout}))": 0.45,
+    "ConnectionError(MaxRetryError(\"HTTPConnectionPool(host='{ip}', port={port}): Max retries exceeded\"))": 0.35,
+    "HTTPError('503 Server Error: Service Unavailable for url: http://{ip}:{port}/api/imagedetect')": 0.15,
+    "RemoteDisconnected('Remote end closed connection without response')": 0.05
+}
+ENDPOINT = ("POST", "/api/imagedetect")
+STATS_HEADER = (f"{'Type':<8} {'Name':<74} {'# reqs':>7} {'# fails':>12} |    Avg     Min     Max    Med |"
+                f"   req/s  failures/s")
+STATS_SEPARATOR = "-" * 8 + "|" + "-" * 76 + "|" + "-" * 7 + "|" + "-" * 13 + "|" + "|".join(["-" * 7] * 4) + \
+    "|" + "-" * 8 + "|" + "-" * 11
+
+BENCHMARKS = ("process_result_directory", "extract_metrics_from_console_log", "count_unique_users_in_csv")
+
+
+def _stats_row(label_type, name, requests, failures, response_times, duration):
+    avg = sum(response_times) / len(response_times) if response_times else 0
+    ordered = sorted(response_times)
+    median = ordered[len(ordered) // 2] if ordered else 0
+    low = ordered[0] if ordered else 0
+    high = ordered[-1] if ordered else 0
+    percent = failures / requests * 100 if requests else 0.0
+    return (f"{label_type:<8} {name:<74} {requests:>7} {f'{failures}({percent:.2f}%)':>12} | "
+            f"{avg:>6.0f} {low:>7.0f} {high:>7.0f} {median:>6.0f} | "
+            f"{requests / duration:>7.2f} {failures / duration:>11.2f}")
+
+
+def _stats_block(requests, failures, response_times, duration):
+    method, name = ENDPOINT
+    return [
+        STATS_HEADER,
+        STATS_SEPARATOR,
+        _stats_row(method, name, requests, failures, response_times, duration),
+        STATS_SEPARATOR,
+        _stats_row("", "Aggregated", requests, failures, response_times, duration),
+        ""
+    ]
+
+
+def generate_result_dir(base_dir, experiment="network-loss-75-schedule", user_count=8, mode="concurrent_mode",
+                        timeout=3.0, rows=100000, failure_ratio=0.1, error_mix=None, stats_blocks=20, seed=0):
+    """Write a synthetic result directory (CSV log, console log, metadata, chaos config) and return its path.
+
+    Requests are spread over the run with exponential response times; failed requests get an error
+    drawn from error_mix (message template -> weight) with randomised hosts and ports, as in real runs.
+    """
+    rng = random.Random(seed)
+    error_mix = error_mix or DEFAULT_ERROR_MIX
+    templates = list(error_mix)
+    weights = [error_mix[template] for template in templates]
+    timestamp = time.strftime("%Y%m%dT%H%M%S", time.gmtime(1700000000 + seed))
+    result_dir = os.path.join(base_dir, experiment, f"users_{user_count}", mode, f"timeout_{timeout}s_{timestamp}")
+    os.makedirs(result_dir, exist_ok=True)
+
+    duration = max(1.0, rows / 50.0)
+    start = 1700000000.0
+    failures = 0
+    error_report = {}
+    block_rows = max(1, rows // max(1, stats_blocks))
+    response_times = []
+    console_lines = [f"[2023-11-14 22:13:20,000] client/INFO/locust.main: Run time limit set to {duration:.0f} seconds",
+                     f"[2023-11-14 22:13:20,001] client/INFO/locust.main: Starting Locust with {user_count} users"]
+
+    with open(os.path.join(result_dir, "locust_log.csv"), 'w', encoding='utf-8', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(["Timestamp", "User ID", "Status", "Response Time (ms)", "Error Type"])
+        for idx in range(rows):
+            request_time = start + duration * idx / rows
+            response_time = rng.expovariate(1 / 150.0)
+            user_id = f"user_{rng.randint(1, user_count)}"
+            if rng.random() < failure_ratio:
+                failures += 1
+                response_time = min(response_time * 8, timeout * 1000)
+                message = rng.choices(templates, weights)[0].format(
+                    ip=f"10.0.{rng.randint(0, 3)}.{rng.randint(1, 254)}", port=rng.choice((30080, 30081, 30443)),
+                    timeout=timeout)
+                error_report[message] = error_report.get(message, 0) + 1
+                writer.writerow([f"{request_time:.3f}", user_id, "failure", f"{response_time:.2f}", message])
+            else:
+                writer.writerow([f"{request_time:.3f}", user_id, "success", f"{response_time:.2f}", ""])
+            response_times.append(response_time)
+            if (idx + 1) % block_rows == 0 and idx + 1 < rows:
+                # Periodic cumulative stats table, as printed by Locust during the run
+                console_lines.extend(_stats_block(idx + 1, failures, response_times, duration * (idx + 1) / rows))
+
+    console_lines.append("[2023-11-14 22:13:20,002] client/INFO/locust.main: --run-time limit reached, shutting down")
+    console_lines.extend(_stats_block(rows, failures, response_times, duration))
+    console_lines.append("Response time percentiles (approximated)")
+    console_lines.append("")
+    console_lines.append("Error report")
+    console_lines.append(f"{'# occurrences':<18} {'Error':<100}")
+    console_lines.append("-" * 18 + "|" + "-" * 101)
+    method, name = ENDPOINT
+    for message, count in sorted(error_report.items(), key=lambda item: -item[1]):
+        console_lines.append(f"{count:<18} {method} {name}: {message}")
+    console_lines.append("-" * 18 + "|" + "-" * 101)
+
+    with open(os.path.join(result_dir, "console_output.log"), 'w', encoding='utf-8') as f:
+        f.write("\n".join(console_lines) + "\n")
+
+    metadata = {
+        "user_count": user_count,
+        "timeout": timeout,
+        "request_mode": mode.replace("_mode", "") if mode.endswith("_mode") else "rate",
+        "synthetic": {"rows": rows, "failure_ratio": failure_ratio, "seed": seed}
+    }
+    with open(os.path.join(result_dir, "metadata.json"), 'w', encoding='utf-8') as f:
+        json.dump(metadata, f, indent=2)
+    with open(os.path.join(result_dir, "chaos_config.yaml"), 'w', encoding='utf-8') as f:
+        f.write(f"apiVersion: chaos-mesh.org/v1alpha1\nkind: Schedule\nmetadata:\n  name: {experiment}\n")
+    return result_dir
+
+
+def _peak_rss_mb():
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in kilobytes on Linux and in bytes on macOS
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def _run_benchmark(name, result_dir, processor_options):
+    """Run one benchmark target in a fresh process; returns (seconds, peak_rss_mb, baseline_rss_mb)."""
+    from csv_processor import CSVProcessor
+    processor = CSVProcessor(**processor_options)
+    baseline_rss = _peak_rss_mb()
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        start = time.perf_counter()
+        if name == "process_result_directory":
+            processor.process_result_directory(result_dir, schedule_name=os.path.basename(
+                os.path.dirname(os.path.dirname(os.path.dirname(result_dir)))))
+        elif name == "extract_metrics_from_console_log":
+            processor.extract_metrics_from_console_log(os.path.join(result_dir, "console_output.log"))
+        elif name == "count_unique_users_in_csv":
+            processor.count_unique_users_in_csv(os.path.join(result_dir, "locust_log.csv"))
+        else:
+            raise Exception(f"Unknown benchmark: {name}")
+        elapsed = time.perf_counter() - start
+    return elapsed, _peak_rss_mb(), baseline_rss
+
+
+def run_benchmarks(result_dir, rows, repeat=3, processor_options=None, names=BENCHMARKS):
+    """Time every benchmark target (best of repeat runs, each in a new process) and return the results."""
+    results = {}
+    context = multiprocessing.get_context('spawn')
+    input_bytes = {
+        "process_result_directory": os.path.getsize(os.path.join(result_dir, "locust_log.csv")) +
+        os.path.getsize(os.path.join(result_dir, "console_output.log")),
+        "extract_metrics_from_console_log": os.path.getsize(os.path.join(result_dir, "console_output.log")),
+        "count_unique_users_in_csv": os.path.getsize(os.path.join(result_dir, "locust_log.csv"))
+    }
+    for name in names:
+        timings = []
+        peaks = []
+        baselines = []
+        for _ in range(repeat):
+            with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+                elapsed, peak_rss, baseline_rss = executor.submit(
+                    _run_benchmark, name, result_dir, processor_options or {}).result()
+            timings.append(elapsed)
+            peaks.append(peak_rss)
+            baselines.append(baseline_rss)
+        best = min(timings)
+        results[name] = {
+            'seconds': round(best, 4),
+            'seconds_all': [round(value, 4) for value in timings],
+            'rows_per_second': round(rows / best, 1) if name != "extract_metrics_from_console_log" else None,
+            'mb_per_second': round(input_bytes[name] / (1024 * 1024) / best, 2),
+            'peak_rss_mb': round(max(peaks), 1),
+            'rss_growth_mb': round(max(peak - base for peak, base in zip(peaks, baselines)), 1)
+        }
+        print(f"{name:<36} {best:>8.3f}s  {results[name]['mb_per_second']:>8.2f} MB/s  "
+              f"peak RSS {results[name]['peak_rss_mb']:>7.1f} MB (+{results[name]['rss_growth_mb']:.1f} MB)")
+    return results
+
+
+def compare_reports(report, baseline, max_slowdown=0.2, max_rss_growth=0.2):
+    """Return the list of regressions of report against baseline (relative thresholds)."""
+    regressions = []
+    for name, result in report['results'].items():
+        previous = baseline.get('results', {}).get(name)
+        if not previous:
+            continue
+        if previous['seconds'] and result['seconds'] > previous['seconds'] * (1 + max_slowdown):
+            regressions.append(f"{name}: {result['seconds']:.3f}s vs baseline {previous['seconds']:.3f}s "
+                               f"(+{result['seconds'] / previous['seconds'] - 1:.0%})")
+        if previous['rss_growth_mb'] and result['rss_growth_mb'] > previous['rss_growth_mb'] * (1 + max_rss_growth):
+            regressions.append(f"{name}: RSS growth {result['rss_growth_mb']:.1f} MB vs baseline "
+                               f"{previous['rss_growth_mb']:.1f} MB")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the result analysis pipeline on synthetic data')
+    parser.add_argument('--rows', type=int, default=200000, help='Requests in the synthetic CSV log (default: 200000)')
+    parser.add_argument('--failure-ratio', type=float, default=0.1, help='Share of failed requests (default: 0.1)')
+    parser.add_argument('--users', type=int, default=8, help='Distinct users in the log (default: 8)')
+    parser.add_argument('--error-mix', type=str,
+                        help='JSON file mapping error message templates ({ip}, {port}, {timeout}) to weights')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed of the generator (default: 0)')
+    parser.add_argument('--repeat', type=int, default=3, help='Runs per benchmark, the fastest counts (default: 3)')
+    parser.add_argument('--workdir', type=str, help='Directory for the synthetic data (default: temporary)')
+    parser.add_argument('--keep', action='store_true', help='Keep the generated data')
+    parser.add_argument('--output', type=str, default='benchmark_report.json',
+                        help='Report file (default: benchmark_report.json)')
+    parser.add_argument('--baseline', type=str, help='Earlier report to compare against')
+    parser.add_argument('--max-slowdown', type=float, default=0.2,
+                        help='Allowed relative slowdown against the baseline (default: 0.2)')
+    parser.add_argument('--max-rss-growth', type=float, default=0.2,
+                        help='Allowed relative increase of memory growth against the baseline (default: 0.2)')
+    args = parser.parse_args()
+
+    error_mix = None
+    if args.error_mix:
+        with open(args.error_mix, 'r', encoding='utf-8') as f:
+            error_mix = json.load(f)
+
+    workdir = args.workdir or tempfile.mkdtemp(prefix="locust_benchmark_")
+    try:
+        start = time.time()
+        result_dir = generate_result_dir(workdir, user_count=args.users, rows=args.rows,
+                                         failure_ratio=args.failure_ratio, error_mix=error_mix, seed=args.seed)
+        csv_bytes = os.path.getsize(os.path.join(result_dir, "locust_log.csv"))
+        print(f"Generated {args.rows} requests ({csv_bytes / (1024 * 1024):.1f} MB CSV) in "
+              f"{time.time() - start:.1f}s: {result_dir}")
+
+        report = {
+            'created_at': time.strftime("%Y-%m-%dT%H:%M:%S"),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'dataset': {
+                'rows': args.rows,
+                'failure_ratio': args.failure_ratio,
+                'users': args.users,
+                'seed': args.seed,
+                'csv_bytes': csv_bytes,
+                'console_log_bytes': os.path.getsize(os.path.join(result_dir, "console_output.log"))
+            },
+            'results': run_benchmarks(result_dir, args.rows, repeat=args.repeat)
+        }
+    finally:
+        if not args.keep and not args.workdir:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(f"Benchmark report written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        if baseline.get('dataset', {}).get('rows') != args.rows:
+            print("Warning: Baseline was measured on a different number of rows")
+        regressions = compare_reports(report, baseline, args.max_slowdown, args.max_rss_growth)
+        if regressions:
+            print("Performance regressions against baseline:")
+            for regression in regressions:
+                print(f"  - {regression}")
+            sys.exit(1)
+        print("No regressions against baseline")
+
+
+if __name__ == "__main__":
+    main()
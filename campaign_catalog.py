@@ -0,0 +1,304 @@
+#!/usr/bin/env python3
+import os
+import re
+import sys
+import json
+import time
+import sqlite3
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+from csv_processor import read_summary_header
+from latency_histogram import histogram_path_for
+from resilience_timeline import timeline_path_for
+from result_tree import iter_result_dirs, parse_result_dir
+from artifact_io import artifact_exists, resolve_artifact
+
+CATALOG_NAME = "campaign_catalog.sqlite"
+
+RUN_COLUMNS = (
+    ('result_dir', 'TEXT PRIMARY KEY'),
+    ('experiment_name', 'TEXT'),
+    ('fault_type', 'TEXT'),
+    ('intensity', 'INTEGER'),
+    ('user_count', 'INTEGER'),
+    ('request_mode', 'TEXT'),
+    ('request_rate', 'REAL'),
+    ('timeout', 'REAL'),
+    ('master_nodes', 'INTEGER'),
+    ('worker_nodes', 'INTEGER'),
+    ('run_timestamp', 'TEXT'),
+    ('total_requests', 'INTEGER'),
+    ('failed_requests', 'INTEGER'),
+    ('success_rate', 'REAL'),
+    ('avg_response_time', 'REAL'),
+    ('avg_success_response_time', 'REAL'),
+    ('p50_response_time', 'REAL'),
+    ('p95_response_time', 'REAL'),
+    ('p99_response_time', 'REAL'),
+    ('max_response_time', 'REAL'),
+    ('error_occurrences', 'INTEGER'),
+    ('availability', 'REAL'),
+    ('longest_outage_seconds', 'REAL'),
+    ('mean_recovery_time_seconds', 'REAL'),
+    ('summary_path', 'TEXT'),
+    ('csv_path', 'TEXT'),
+    ('console_log_path', 'TEXT'),
+    ('histogram_path', 'TEXT'),
+    ('timeline_path', 'TEXT'),
+    ('updated_at', 'REAL')
+)
+COLUMN_NAMES = tuple(name for name, _ in RUN_COLUMNS)
+
+# Number words used by the node_offline shell scripts (kill-random-one-node.sh, kill-all-three-nodes.sh)
+NUMBER_WORDS = {'one': 1, 'two': 2, 'three': 3, 'four': 4, 'five': 5}
+FAULT_ALIASES = {
+    'kill-containers': 'container-kill',
+    'kill-pods': 'pod-kill',
+    'cpu-stress-pods': 'pod-cpu-stress'
+}
+
+
+def parse_experiment_label(experiment_name):
+    """Derive (fault_type, intensity) from an experiment label such as 'network-loss-75-schedule'."""
+    name = os.path.basename(experiment_name or "")
+    if name.endswith('.sh'):
+        name = name[:-3]
+        if 'node' in name:
+            intensity = None
+            for word in name.split('-'):
+                if word in NUMBER_WORDS:
+                    intensity = NUMBER_WORDS[word]
+            return ('node-notready' if 'notready' in name else 'node-offline'), intensity
+    if name.endswith('-schedule'):
+        name = name[:-len('-schedule')]
+
+    match = re.search(r'-(\d+)(?=-|$)', name)
+    if not match:
+        return name or None, None
+    intensity = int(match.group(1))
+    fault = (name[:match.start()] + name[match.end():]).strip('-')
+    return FAULT_ALIASES.get(fault, fault), intensity
+
+
+def _number(values, cast=float):
+    try:
+        return cast(values[0])
+    except (TypeError, ValueError, IndexError):
+        return None
+
+
+def build_run_row(result_dir, summary_path=None):
+    """Collect the catalog row of one result directory from its summary, metadata and timeline."""
+    result_dir = os.path.abspath(result_dir)
+    layout = parse_result_dir(result_dir) or {}
+    csv_path = os.path.join(result_dir, "locust_log.csv")
+    summary_path = summary_path or os.path.join(result_dir, "locust_log_summary.csv")
+    if not os.path.exists(summary_path):
+        return None
+
+    fields, sections = read_summary_header(summary_path)
+    experiment_name = layout.get('experiment_name') or (fields.get('Experiment Name') or [None])[0]
+    fault_type, intensity = parse_experiment_label(experiment_name)
+
+    metadata = {}
+    metadata_path = os.path.join(result_dir, "metadata.json")
+    if os.path.exists(metadata_path):
+        try:
+            with open(metadata_path, 'r', encoding='utf-8') as f:
+                metadata = json.load(f)
+        except Exception:
+            metadata = {}
+
+    request_rate = layout.get('request_rate', metadata.get('request_rate'))
+    if request_rate == -1 or metadata.get('request_mode') == 'concurrent':
+        request_mode = 'concurrent'
+    elif request_rate == -2 or metadata.get('request_mode') == 'piggyback':
+        request_mode = 'piggyback'
+    else:
+        request_mode = 'rate'
+
+    total_requests = _number(fields.get('Total Requests'), int)
+    failed_requests = _number(fields.get('Failed Requests'), int)
+    success_rate = None
+    if total_requests:
+        success_rate = (total_requests - (failed_requests or 0)) / total_requests
+
+    percentiles = {}
+    labels = fields.get('Response Time Percentiles (ms)') or []
+    for item in sections.get('Response Time Percentiles (ms)', []):
+        if item and item[0] == 'all':
+            percentiles = dict(zip(labels, (_number([value]) for value in item[1:])))
+
+    timeline_metrics = {}
+    timeline_path = timeline_path_for(csv_path)
+    if os.path.exists(timeline_path):
+        try:
+            with open(timeline_path, 'r', encoding='utf-8') as f:
+                timeline_metrics = json.load(f).get('metrics', {})
+        except Exception:
+            timeline_metrics = {}
+
+    histogram_path = histogram_path_for(summary_path)
+    row = {
+        'result_dir': result_dir,
+        'experiment_name': experiment_name,
+        'fault_type': fault_type,
+        'intensity': intensity,
+        'user_count': metadata.get('user_count', layout.get('user_count')),
+        'request_mode': request_mode,
+        'request_rate': request_rate if request_mode == 'rate' else None,
+        'timeout': layout.get('timeout', metadata.get('timeout')),
+        'master_nodes': _number(fields.get('Master Nodes'), int),
+        'worker_nodes': _number(fields.get('Worker Nodes'), int),
+        'run_timestamp': layout.get('timestamp'),
+        'total_requests': total_requests,
+        'failed_requests': failed_requests,
+        'success_rate': success_rate,
+        'avg_response_time': _number(fields.get('Average Response Time (ms)')),
+        'avg_success_response_time': _number(fields.get('Average Successful Response Time (ms)')),
+        'p50_response_time': percentiles.get('p50'),
+        'p95_response_time': percentiles.get('p95'),
+        'p99_response_time': percentiles.get('p99'),
+        'max_response_time': percentiles.get('max'),
+        'error_occurrences': _number(fields.get('Total Error Occurrences'), int),
+        'availability': timeline_metrics.get('availability'),
+        'longest_outage_seconds': timeline_metrics.get('longest_outage_seconds'),
+        'mean_recovery_time_seconds': timeline_metrics.get('mean_recovery_time_seconds'),
+        'summary_path': summary_path,
+        'csv_path': resolve_artifact(csv_path) if artifact_exists(csv_path) else None,
+        'console_log_path': resolve_artifact(os.path.join(result_dir, "console_output.log")),
+        'histogram_path': histogram_path if os.path.exists(histogram_path) else None,
+        'timeline_path': timeline_path if os.path.exists(timeline_path) else None,
+        'updated_at': time.time()
+    }
+    return row
+
+
+class CampaignCatalog:
+    """SQLite index with one row per summarised run, for fast queries across the whole campaign."""
+
+    def __init__(self, db_path):
+        self.db_path = db_path
+        db_dir = os.path.dirname(db_path)
+        if db_dir:
+            os.makedirs(db_dir, exist_ok=True)
+        self.conn = sqlite3.connect(db_path, timeout=30)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute(
+            f"CREATE TABLE IF NOT EXISTS runs ({', '.join(f'{name} {kind}' for name, kind in RUN_COLUMNS)})"
+        )
+        self.conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_runs_matrix ON runs (fault_type, intensity, user_count, timeout)"
+        )
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_runs_experiment ON runs (experiment_name)")
+        self.conn.commit()
+
+    def close(self):
+        self.conn.close()
+
+    def upsert_runs(self, rows):
+        placeholders = ', '.join('?' for _ in COLUMN_NAMES)
+        with self.conn:
+            self.conn.executemany(
+                f"INSERT OR REPLACE INTO runs ({', '.join(COLUMN_NAMES)}) VALUES ({placeholders})",
+                [tuple(row.get(name) for name in COLUMN_NAMES) for row in rows if row]
+            )
+
+    def upsert_run(self, result_dir, summary_path=None):
+        """Index (or re-index) one result directory; returns the stored row or None."""
+        row = build_run_row(result_dir, summary_path=summary_path)
+        if row:
+            self.upsert_runs([row])
+        return row
+
+    def query(self, experiment=None, fault_type=None, intensity=None, user_count=None,
+              timeout=None, request_mode=None):
+        """Return the runs matching all given filters (None means any value)."""
+        filters = {
+            'experiment_name': experiment,
+            'fault_type': fault_type,
+            'intensity': intensity,
+            'user_count': user_count,
+            'timeout': timeout,
+            'request_mode': request_mode
+        }
+        clauses = [f"{name} = ?" for name, value in filters.items() if value is not None]
+        params = [value for value in filters.values() if value is not None]
+        sql = "SELECT * FROM runs"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY experiment_name, user_count, timeout, run_timestamp"
+        return [dict(row) for row in self.conn.execute(sql, params)]
+
+
+def backfill(result_base, db_path, workers=None):
+    """Build or refresh the catalog from an existing results tree in parallel."""
+    result_dirs = list(iter_result_dirs(result_base))
+    print(f"Indexing {len(result_dirs)} result directories from {result_base} into {db_path}...")
+    start = time.time()
+    catalog = CampaignCatalog(db_path)
+    indexed = 0
+    try:
+        batch = []
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            for row in executor.map(build_run_row, result_dirs, chunksize=64):
+                if row:
+                    batch.append(row)
+                if len(batch) >= 500:
+                    catalog.upsert_runs(batch)
+                    indexed += len(batch)
+                    batch = []
+        catalog.upsert_runs(batch)
+        indexed += len(batch)
+    finally:
+        catalog.close()
+    print(f"Indexed {indexed} runs ({len(result_dirs) - indexed} without summary) in {time.time() - start:.1f}s")
+    return indexed
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Build and query the campaign catalog of result directories')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    backfill_parser = subparsers.add_parser('backfill', help='Index every summarised run under a results tree')
+    backfill_parser.add_argument('result_base', type=str, help='Results base directory')
+    backfill_parser.add_argument('--db', type=str, help=f'Catalog file (default: <result_base>/{CATALOG_NAME})')
+    backfill_parser.add_argument('--workers', type=int, default=None, help='Number of worker processes')
+
+    query_parser = subparsers.add_parser('query', help='List runs matching the given filters')
+    query_parser.add_argument('--db', type=str, required=True, help='Catalog file')
+    query_parser.add_argument('--experiment', type=str)
+    query_parser.add_argument('--fault', type=str, help='Fault type, e.g. network-loss')
+    query_parser.add_argument('--intensity', type=int)
+    query_parser.add_argument('--users', type=int)
+    query_parser.add_argument('--timeout', type=float)
+    query_parser.add_argument('--mode', type=str, choices=('rate', 'concurrent', 'piggyback'))
+    args = parser.parse_args()
+
+    if args.command == 'backfill':
+        if not os.path.isdir(args.result_base):
+            print(f"Error: Results directory not found at {args.result_base}")
+            sys.exit(1)
+        backfill(args.result_base, args.db or os.path.join(args.result_base, CATALOG_NAME), workers=args.workers)
+        return
+
+    if not os.path.isfile(args.db):
+        print(f"Error: Catalog not found at {args.db}")
+        sys.exit(1)
+    catalog = CampaignCatalog(args.db)
+    try:
+        start = time.time()
+        rows = catalog.query(experiment=args.experiment, fault_type=args.fault, intensity=args.intensity,
+                             user_count=args.users, timeout=args.timeout, request_mode=args.mode)
+        elapsed_ms = (time.time() - start) * 1000
+        for row in rows:
+            print(f"{row['experiment_name']}\tusers={row['user_count']}\ttimeout={row['timeout']}s\t"
+                  f"requests={row['total_requests']}\tsuccess_rate={row['success_rate']}\t{row['result_dir']}")
+        print(f"{len(rows)} runs ({elapsed_ms:.1f} ms)")
+    finally:
+        catalog.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+import re
+import math
+import hashlib
+
+USER_ID_PATTERN = re.compile(r'^(.*?)(\d+)$')
+# IDs with a larger numeric suffix are kept as strings instead of growing the bitmap further
+MAX_BITMAP_ID = 1 << 24
+
+
+def _popcount(data):
+    return bin(int.from_bytes(data, 'little')).count('1')
+
+
+class ExactUserCounter:
+    """Exact distinct counter for user IDs with a compact integer representation.
+
+    IDs of the form <prefix><number> (e.g. '17' or 'user_17') are interned as bits in one
+    bitmap per prefix, so a million numeric IDs cost about 125 KB instead of a set of strings.
+    Anything else falls back to a set.
+    """
+
+    def __init__(self):
+        self.bitmaps = {}
+        self.others = set()
+        self._count = 0
+
+    def add(self, user_id):
+        match = USER_ID_PATTERN.match(user_id)
+        if match:
+            digits = match.group(2)
+            # Leading zeros would make '07' and '7' collide, keep those as strings
+            if digits[0] != '0' or len(digits) == 1:
+                number = int(digits)
+                if number < MAX_BITMAP_ID:
+                    prefix = match.group(1)
+                    bitmap = self.bitmaps.get(prefix)
+                    if bitmap is None:
+                        bitmap = self.bitmaps[prefix] = bytearray()
+                    byte, bit = divmod(number, 8)
+                    if byte >= len(bitmap):
+                        bitmap.extend(bytes(byte - len(bitmap) + 1))
+                    mask = 1 << bit
+                    if not bitmap[byte] & mask:
+                        bitmap[byte] |= mask
+                        self._count += 1
+                    return
+        if user_id not in self.others:
+            self.others.add(user_id)
+            self._count += 1
+
+    def merge(self, other):
+        for prefix, other_bitmap in other.bitmaps.items():
+            bitmap = self.bitmaps.get(prefix)
+            if bitmap is None:
+                self.bitmaps[prefix] = bytearray(other_bitmap)
+                continue
+            if len(bitmap) < len(other_bitmap):
+                bitmap.extend(bytes(len(other_bitmap) - len(bitmap)))
+            for idx, value in enumerate(other_bitmap):
+                if value:
+                    bitmap[idx] |= value
+        self.others |= other.others
+        self._count = sum(_popcount(bitmap) for bitmap in self.bitmaps.values()) + len(self.others)
+        return self
+
+    def count(self):
+        return self._count
+
+
+class HyperLogLog:
+    """Approximate distinct counter with memory independent of the number of values.
+
+    The precision is derived from the requested relative standard error (1.04 / sqrt(m)),
+    e.g. error=0.01 uses 2^14 one-byte registers (16 KB).
+    """
+
+    def __init__(self, error=0.01):
+        self.precision = min(18, max(4, math.ceil(2 * math.log2(1.04 / error))))
+        self.registers = bytearray(1 << self.precision)
+
+    def add(self, value):
+        hashed = int.from_bytes(hashlib.blake2b(value.encode('utf-8'), digest_size=8).digest(), 'big')
+        rest_bits = 64 - self.precision
+        idx = hashed >> rest_bits
+        rest = hashed & ((1 << rest_bits) - 1)
+        rank = rest_bits - rest.bit_length() + 1
+        if rank > self.registers[idx]:
+            self.registers[idx] = rank
+
+    def merge(self, other):
+        if other.precision != self.precision:
+            raise ValueError("Cannot merge HyperLogLog counters with different precision")
+        self.registers = bytearray(map(max, self.registers, other.registers))
+        return self
+
+    def count(self):
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / sum(2.0 ** -register for register in self.registers)
+        zeros = self.registers.count(0)
+        if estimate <= 2.5 * m and zeros:
+            # Small range correction (linear counting)
+            estimate = m * math.log(m / zeros)
+        return int(round(estimate))
+
+
+def make_user_counter(mode='exact', error=0.01):
+    """Create the distinct user counter for the configured mode ('exact' or 'approximate')."""
+    if mode == 'approximate':
+        return HyperLogLog(error=error)
+    if mode != 'exact':
+        raise ValueError(f"Unknown user count mode: {mode}")
+    return ExactUserCounter()
@@ -1,5 +1,7 @@
 import re
 import time
+import asyncio
+from instrumentation import annotate, traced
 
 class ClusterChecker:
     """Performs pre-experiment health checks on Kubernetes cluster."""
@@ -7,13 +9,25 @@ class ClusterChecker:
     def __init__(self, ssh_manager):
         self.ssh = ssh_manager
 
-    def check_nodes_ready(self):
-        """Check if all Kubernetes nodes are in Ready state."""
-        cmd = "kubectl get nodes -o wide"
+    def nodes_command(self):
+        return "kubectl get nodes -o wide"
+
+    def schedules_command(self):
+        return "kubectl get schedules -n chaos-mesh"
+
+    def pods_command(self, namespace="image-detection"):
+        return f"kubectl get pods -n {namespace}"
+
+    def check_nodes_ready(self, result=None):
+        """Check if all Kubernetes nodes are in Ready state.
+
+        result is the (exit_status, stdout, stderr) of the command if it already ran.
+        """
+        cmd = self.nodes_command()
         print(f"Checking node status with command: {cmd}")
         
         try:
-            exit_status, out, err = self.ssh.run_command(cmd)
+            exit_status, out, err = result or self.ssh.run_command(cmd, idempotent=True)
             if exit_status != 0:
                 print(f"Failed to get node status: {err.strip()}")
                 return False
@@ -51,13 +65,13 @@ class ClusterChecker:
             print(f"Error checking node status: {e}")
             return False
 
-    def check_no_chaos_schedules(self):
+    def check_no_chaos_schedules(self, result=None):
         """Check that no Chaos Mesh schedules are currently running."""
-        cmd = "kubectl get schedules -n chaos-mesh"
+        cmd = self.schedules_command()
         print(f"Checking for active chaos schedules with command: {cmd}")
         
         try:
-            exit_status, out, err = self.ssh.run_command(cmd)
+            exit_status, out, err = result or self.ssh.run_command(cmd, idempotent=True)
             if exit_status != 0:
                 # Check if it's just "No resources found"
                 if "No resources found" in err:
@@ -91,13 +105,13 @@ class ClusterChecker:
             print(f"Error checking chaos schedules: {e}")
             return False
 
-    def check_application_pods(self, namespace="image-detection"):
+    def check_application_pods(self, namespace="image-detection", result=None):
         """Check if all application pods are running and ready."""
-        cmd = f"kubectl get pods -n {namespace}"
+        cmd = self.pods_command(namespace)
         print(f"Checking application pods in namespace '{namespace}' with command: {cmd}")
         
         try:
-            exit_status, out, err = self.ssh.run_command(cmd)
+            exit_status, out, err = result or self.ssh.run_command(cmd, idempotent=True)
             if exit_status != 0:
                 print(f"Failed to get pod status: {err.strip()}")
                 return False
@@ -145,14 +159,24 @@ class ClusterChecker:
             print(f"Error checking pod status: {e}")
             return False
 
+    @traced('kubectl', 'health_checks')
     def perform_all_checks(self, app_namespace="image-detection"):
         """Perform all cluster health checks and return overall status."""
         print("\n=== PERFORMING PRE-EXPERIMENT CLUSTER HEALTH CHECKS ===\n")
         
-        nodes_ready = self.check_nodes_ready()
-        no_chaos = self.check_no_chaos_schedules()
-        pods_ready = self.check_application_pods(namespace=app_namespace)
-        
+        # The three kubectl queries are independent and run in one concurrent batch
+        nodes_result, schedules_result, pods_result = [result[:3] for result in self.ssh.run_commands([
+            self.nodes_command(),
+            self.schedules_command(),
+            self.pods_command(app_namespace)
+        ], idempotent=True)]
+        return self._report_checks(
+            self.check_nodes_ready(result=nodes_result),
+            self.check_no_chaos_schedules(result=schedules_result),
+            self.check_application_pods(namespace=app_namespace, result=pods_result)
+        )
+
+    def _report_checks(self, nodes_ready, no_chaos, pods_ready):
         all_checks_passed = nodes_ready and no_chaos and pods_ready
         
         print("\n=== CLUSTER HEALTH CHECK SUMMARY ===")
@@ -161,9 +185,46 @@ class ClusterChecker:
         print(f"Application Pods Ready: {'✓' if pods_ready else '✗'}")
         print(f"Overall Status: {'PASSED' if all_checks_passed else 'FAILED'}")
         print("=====================================\n")
+        if not all_checks_passed:
+            annotate(outcome='failed')
         
         return all_checks_passed
         
+    @traced('kubectl', 'health_checks')
+    async def perform_all_checks_async(self, app_namespace="image-detection"):
+        """Coroutine version of perform_all_checks; the three queries run concurrently."""
+        print("\n=== PERFORMING PRE-EXPERIMENT CLUSTER HEALTH CHECKS ===\n")
+        nodes_result, schedules_result, pods_result = [result[:3] for result in await self.ssh.run_commands_async([
+            self.nodes_command(),
+            self.schedules_command(),
+            self.pods_command(app_namespace)
+        ], idempotent=True)]
+        return self._report_checks(
+            self.check_nodes_ready(result=nodes_result),
+            self.check_no_chaos_schedules(result=schedules_result),
+            self.check_application_pods(namespace=app_namespace, result=pods_result)
+        )
+
+    @traced('kubectl', 'wait_for_healthy')
+    async def wait_for_healthy_cluster_async(self, app_namespace="image-detection", max_wait_attempts=30,
+                                             retry_interval=10):
+        """Coroutine version of wait_for_healthy_cluster (sleeps without blocking the event loop)."""
+        print(f"\n=== WAITING FOR CLUSTER TO BECOME HEALTHY (max wait: {max_wait_attempts*retry_interval}s) ===\n")
+        for attempt in range(1, max_wait_attempts + 1):
+            print(f"Health check attempt {attempt}/{max_wait_attempts}...")
+            if await self.perform_all_checks_async(app_namespace=app_namespace):
+                print(f"Cluster health check passed after {attempt} attempts ({attempt*retry_interval}s)")
+                annotate(retries=attempt - 1)
+                return True
+            if attempt >= max_wait_attempts:
+                print(f"Maximum wait time reached ({max_wait_attempts*retry_interval}s). Cluster is still not healthy.")
+                annotate(outcome='failed', retries=attempt - 1)
+                return False
+            print(f"Waiting {retry_interval}s before next health check...")
+            await asyncio.sleep(retry_interval)
+        return False
+
+    @traced('kubectl', 'wait_for_healthy')
     def wait_for_healthy_cluster(self, app_namespace="image-detection", max_wait_attempts=30, retry_interval=10):
         """Wait for cluster to reach a healthy state, retrying up to max_wait_attempts.
         
@@ -182,11 +243,13 @@ class ClusterChecker:
             
             if self.perform_all_checks(app_namespace=app_namespace):
                 print(f"Cluster health check passed after {attempt} attempts ({attempt*retry_interval}s)")
+                annotate(retries=attempt - 1)
                 return True
                 
             # If maximum attempts reached, return failure
             if attempt >= max_wait_attempts:
                 print(f"Maximum wait time reached ({max_wait_attempts*retry_interval}s). Cluster is still not healthy.")
+                annotate(outcome='failed', retries=attempt - 1)
                 return False
                 
             # Wait before retrying
@@ -196,6 +259,7 @@ class ClusterChecker:
         # This should not be reached, but just in case
         return False
         
+    @traced('kubectl', 'restart_deployments')
     def restart_deployments(self, app_namespace="image-detection"):
         """Restart all deployments in the specified namespace in parallel."""
         print(f"\n=== RESTART DEPLOYMENTS (NAMESPACE: {app_namespace}) ===\n")
@@ -205,7 +269,7 @@ class ClusterChecker:
         print(f"Getting deployments with command: {cmd}")
         
         try:
-            exit_status, out, err = self.ssh.run_command(cmd)
+            exit_status, out, err = self.ssh.run_command(cmd, idempotent=True)
             if exit_status != 0:
                 print(f"Error getting deployments: {err}")
                 return False
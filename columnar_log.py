@@ -0,0 +1,335 @@
+import os
+import sys
+import csv
+import json
+import math
+import mmap
+import struct
+from array import array
+from datetime import datetime
+
+MAGIC = b'LCOLv1\x00\x00'
+ALIGNMENT = 8
+COLUMNAR_EXT = ".cols"
+# Per-value number of decimals of a numeric column: EMPTY for "", VERBATIM for text kept as is
+EMPTY = -1
+VERBATIM = -2
+MAX_DECIMALS = 100
+
+TIMESTAMP_HEADERS = ('timestamp', 'time', 'start time', 'request time')
+RESPONSE_TIME_HEADERS = ('Response Time (ms)', 'Response Time')
+
+
+def columnar_path_for(csv_path):
+    """Return the path of the column file that belongs to a CSV log."""
+    file_name, _ = os.path.splitext(csv_path)
+    return file_name + COLUMNAR_EXT
+
+
+def parse_timestamp(value):
+    value = value.strip()
+    if not value:
+        return math.nan
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    try:
+        return datetime.fromisoformat(value.replace('Z', '+00:00')).timestamp()
+    except ValueError:
+        return math.nan
+
+
+def parse_number(value):
+    if not value:
+        return math.nan
+    try:
+        return float(value)
+    except ValueError:
+        return math.nan
+
+
+def column_kind(header):
+    """Return how a CSV column is typed: 'timestamp', 'number' or 'dictionary' (text)."""
+    if header.strip().lower() in TIMESTAMP_HEADERS:
+        return 'timestamp'
+    if header in RESPONSE_TIME_HEADERS:
+        return 'number'
+    return 'dictionary'
+
+
+def _index_typecode(size):
+    if size <= 0xFF:
+        return 'B'
+    if size <= 0xFFFF:
+        return 'H'
+    return 'I'
+
+
+def _format_number(value):
+    if math.isnan(value):
+        return ""
+    if value.is_integer():
+        return str(int(value))
+    return repr(value)
+
+
+def _decimals(raw, value):
+    """Number of decimals that renders value back to raw, EMPTY for "" or VERBATIM if none does."""
+    if not raw:
+        return EMPTY
+    dot = raw.find('.')
+    decimals = len(raw) - dot - 1 if dot >= 0 else 0
+    if decimals > MAX_DECIMALS or math.isnan(value) or f"{value:.{decimals}f}" != raw:
+        return VERBATIM
+    return decimals
+
+
+def convert_csv(csv_path, output_path=None):
+    """Convert a Locust CSV log into a typed, column-oriented file and return its path.
+
+    Timestamps and response times are stored as float64 arrays (NaN for missing values),
+    every other column is dictionary encoded into the smallest fitting unsigned integer array.
+    The file is lossless: numeric columns also keep the number of decimals of every value, and
+    the original text of values that do not round-trip (ISO timestamps with a time zone,
+    unparseable numbers, exponent notation) is stored verbatim, so the CSV cells can be restored
+    exactly (rows shorter than the header are padded with empty cells).
+    """
+    output_path = output_path or columnar_path_for(csv_path)
+    source_stat = os.stat(csv_path)
+
+    with open(csv_path, 'r', encoding='utf-8', newline='') as f:
+        reader = csv.reader(f)
+        headers = next(reader, None) or []
+
+        kinds = [column_kind(header) for header in headers]
+
+        values = [array('d') if kind != 'dictionary' else array('I') for kind in kinds]
+        dictionaries = [{} if kind == 'dictionary' else None for kind in kinds]
+        decimals = [array('b') if kind != 'dictionary' else None for kind in kinds]
+        verbatim = [{} if kind != 'dictionary' else None for kind in kinds]
+        column_count = len(headers)
+        rows = 0
+
+        for row in reader:
+            if not row:
+                continue
+            rows += 1
+            row_len = len(row)
+            for idx in range(column_count):
+                raw = row[idx] if idx < row_len else ""
+                kind = kinds[idx]
+                if kind == 'dictionary':
+                    codes = dictionaries[idx]
+                    code = codes.get(raw)
+                    if code is None:
+                        code = codes[raw] = len(codes)
+                    values[idx].append(code)
+                else:
+                    value = parse_timestamp(raw) if kind == 'timestamp' else parse_number(raw)
+                    values[idx].append(value)
+                    places = _decimals(raw, value)
+                    decimals[idx].append(places)
+                    if places == VERBATIM:
+                        verbatim[idx][rows - 1] = raw
+
+    columns = []
+    blobs = []
+    offset = 0
+
+    def add_blob(data):
+        nonlocal offset
+        placement = {'type': data.typecode, 'offset': offset, 'length': len(data)}
+        blob = data.tobytes()
+        padding = (-len(blob)) % ALIGNMENT
+        blobs.append(blob + b'\x00' * padding)
+        offset += len(blob) + padding
+        return placement
+
+    for idx, header in enumerate(headers):
+        column = {'name': header, 'kind': kinds[idx]}
+        data = values[idx]
+        if kinds[idx] == 'dictionary':
+            typecode = _index_typecode(len(dictionaries[idx]))
+            if typecode != data.typecode:
+                data = array(typecode, data)
+            column['dictionary'] = list(dictionaries[idx])
+        column.update(add_blob(data))
+        if kinds[idx] != 'dictionary':
+            # One number of decimals for the whole column in the common case, else one per value
+            distinct = set(decimals[idx])
+            column['decimals'] = distinct.pop() if len(distinct) == 1 else add_blob(decimals[idx])
+            column['verbatim'] = {str(row): raw for row, raw in verbatim[idx].items()}
+        columns.append(column)
+
+    header = {
+        'version': 2,
+        'rows': rows,
+        'byteorder': sys.byteorder,
+        'source': {
+            'name': os.path.basename(csv_path),
+            'size': source_stat.st_size,
+            'mtime_ns': source_stat.st_mtime_ns
+        },
+        'columns': columns
+    }
+    header_bytes = json.dumps(header, ensure_ascii=False).encode('utf-8')
+    header_bytes += b' ' * ((-(len(MAGIC) + 8 + len(header_bytes))) % ALIGNMENT)
+
+    tmp_path = output_path + ".tmp"
+    with open(tmp_path, 'wb') as out:
+        out.write(MAGIC)
+        out.write(struct.pack('<Q', len(header_bytes)))
+        out.write(header_bytes)
+        for blob in blobs:
+            out.write(blob)
+    os.replace(tmp_path, output_path)
+    return output_path
+
+
+class ColumnarLog:
+    """Memory-mapped reader for a column file written by convert_csv."""
+
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, 'rb')
+        self._map = None
+        try:
+            if os.fstat(self._file.fileno()).st_size <= len(MAGIC) + 8:
+                raise ValueError(f"{path} is not a columnar log file")
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            if self._map[:len(MAGIC)] != MAGIC:
+                raise ValueError(f"{path} is not a columnar log file")
+            (header_len,) = struct.unpack_from('<Q', self._map, len(MAGIC))
+            header_start = len(MAGIC) + 8
+            self.header = json.loads(bytes(self._map[header_start:header_start + header_len]).decode('utf-8'))
+            self._data_start = header_start + header_len
+        except Exception:
+            if self._map is not None:
+                self._map.close()
+            self._file.close()
+            raise
+        self._views = []
+        self.rows = self.header['rows']
+        self.columns = [column['name'] for column in self.header['columns']]
+        self._by_name = {column['name']: column for column in self.header['columns']}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        for view in self._views:
+            view.release()
+        self._views = []
+        if self._map is not None:
+            try:
+                self._map.close()
+            except BufferError:
+                # A caller still holds a column view; the mapping is released with it
+                pass
+            self._map = None
+        self._file.close()
+
+    def is_fresh_for(self, csv_path):
+        """True if this file was converted from csv_path as it currently exists on disk."""
+        if not os.path.exists(csv_path):
+            return True
+        stat = os.stat(csv_path)
+        source = self.header.get('source', {})
+        return source.get('size') == stat.st_size and source.get('mtime_ns') == stat.st_mtime_ns
+
+    def column_info(self, name):
+        return self._by_name[name]
+
+    def column(self, name):
+        """Return the raw typed values of a column (zero-copy where the byte order matches)."""
+        info = self._by_name[name]
+        itemsize = array(info['type']).itemsize
+        start = self._data_start + info['offset']
+        end = start + info['length'] * itemsize
+        if self.header.get('byteorder') == sys.byteorder:
+            view = memoryview(self._map)[start:end].cast(info['type'])
+            self._views.append(view)
+            return view
+        values = array(info['type'])
+        values.frombytes(self._map[start:end])
+        values.byteswap()
+        return values
+
+    def dictionary(self, name):
+        """Return the distinct raw strings of a dictionary-encoded column, indexed by code."""
+        return self._by_name[name].get('dictionary')
+
+    def _array(self, placement):
+        itemsize = array(placement['type']).itemsize
+        start = self._data_start + placement['offset']
+        values = array(placement['type'])
+        values.frombytes(self._map[start:start + placement['length'] * itemsize])
+        if self.header.get('byteorder') != sys.byteorder:
+            values.byteswap()
+        return values
+
+    def strings(self, name):
+        """Iterate over a column decoded back to its original text."""
+        info = self._by_name[name]
+        if info['kind'] == 'dictionary':
+            dictionary = info['dictionary']
+            return (dictionary[code] for code in self.column(name))
+        if 'decimals' not in info:
+            # Version 1 files kept no formatting
+            return (_format_number(value) for value in self.column(name))
+        decimals = info['decimals']
+        if isinstance(decimals, dict):
+            decimals = self._array(decimals)
+        else:
+            decimals = [decimals] * info['length']
+        return self._render(self.column(name), decimals, info.get('verbatim', {}))
+
+    @staticmethod
+    def _render(values, decimals, verbatim):
+        for row, (value, places) in enumerate(zip(values, decimals)):
+            if places == EMPTY:
+                yield ""
+            elif places == VERBATIM:
+                yield verbatim[str(row)]
+            else:
+                yield f"{value:.{places}f}"
+
+    def iter_rows(self):
+        """Iterate over the records as lists of strings, in the original column order."""
+        return zip(*(self.strings(name) for name in self.columns))
+
+
+def restores_csv(cols_path, csv_path):
+    """True if the column file restores every cell of csv_path (rows padded to the header width)."""
+    with ColumnarLog(cols_path) as log, open(csv_path, 'r', encoding='utf-8', newline='') as f:
+        reader = csv.reader(f)
+        if (next(reader, None) or []) != log.columns:
+            return False
+        width = len(log.columns)
+        restored = log.iter_rows()
+        for row in reader:
+            if not row:
+                continue
+            if len(row) > width or tuple(row) + ("",) * (width - len(row)) != next(restored, None):
+                return False
+        return next(restored, None) is None
+
+
+def open_fresh_columnar(csv_path):
+    """Open the column file of csv_path if it exists and is up to date, otherwise return None."""
+    cols_path = columnar_path_for(csv_path)
+    if not os.path.exists(cols_path):
+        return None
+    try:
+        log = ColumnarLog(cols_path)
+    except Exception as e:
+        print(f"Warning: Could not open columnar log {cols_path}: {e}")
+        return None
+    if not log.is_fresh_for(csv_path):
+        log.close()
+        return None
+    return log
@@ -0,0 +1,275 @@
+#!/usr/bin/env python3
+import os
+import re
+import csv
+import sys
+import json
+import time
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+from csv_processor import read_summary_header
+from latency_histogram import LatencyHistogram, histogram_path_for, load_histograms
+from campaign_catalog import parse_experiment_label
+from result_tree import iter_result_dirs, parse_result_dir
+
+STATE_NAME = "comparison_state.json"
+STATE_VERSION = 2
+MATRIX_NAME = "comparison_matrix.csv"
+ERROR_ITEM_PATTERN = re.compile(r'^(\d+) × (.+)$')
+MATRIX_PERCENTILES = (50, 95, 99)
+TOP_ERRORS = 3
+
+
+def _stat_fingerprint(path):
+    try:
+        stat = os.stat(path)
+        return [stat.st_size, stat.st_mtime_ns]
+    except FileNotFoundError:
+        return None
+
+
+def run_fingerprint(result_dir):
+    """Cheap change marker of the per-run outputs a matrix contribution is built from."""
+    summary_path = os.path.join(result_dir, "locust_log_summary.csv")
+    return [_stat_fingerprint(summary_path), _stat_fingerprint(histogram_path_for(summary_path))]
+
+
+def run_contribution(result_dir):
+    """Reduce one summarised run to its matrix contribution (counts, error mix, histogram file).
+
+    Only the summary header is read; the histogram is referenced by path and merged per cell
+    (see update_contributions). Raw request rows are never read.
+    """
+    layout = parse_result_dir(result_dir)
+    summary_path = os.path.join(result_dir, "locust_log_summary.csv")
+    if not layout or not os.path.exists(summary_path):
+        return None
+    fields, sections = read_summary_header(summary_path)
+
+    def number(label):
+        try:
+            return int(float(fields.get(label, [None])[0]))
+        except (TypeError, ValueError, IndexError):
+            return 0
+
+    errors = {}
+    for item in sections.get('Error Types', []):
+        match = ERROR_ITEM_PATTERN.match(item[0])
+        if match:
+            errors[match.group(2)] = errors.get(match.group(2), 0) + int(match.group(1))
+
+    histogram_path = histogram_path_for(summary_path)
+    fault_type, intensity = parse_experiment_label(layout['experiment_name'])
+    return {
+        'key': [fault_type, intensity, layout['user_count'], layout['mode'], layout['timeout']],
+        'fingerprint': run_fingerprint(result_dir),
+        'total_requests': number('Total Requests'),
+        'failed_requests': number('Failed Requests'),
+        'errors': errors,
+        'histogram_path': histogram_path if os.path.exists(histogram_path) else None
+    }
+
+
+def cell_id(key):
+    return json.dumps(key)
+
+
+class MatrixCell:
+    """Merged statistics of all repeated runs that share one matrix coordinate."""
+
+    def __init__(self):
+        self.runs = 0
+        self.total_requests = 0
+        self.failed_requests = 0
+        self.errors = {}
+        self.histogram = LatencyHistogram()
+
+    def add(self, contribution):
+        self.runs += 1
+        self.total_requests += contribution['total_requests']
+        self.failed_requests += contribution['failed_requests']
+        for error, count in contribution['errors'].items():
+            self.errors[error] = self.errors.get(error, 0) + count
+
+    @property
+    def success_rate(self):
+        if not self.total_requests:
+            return None
+        return (self.total_requests - self.failed_requests) / self.total_requests
+
+    def error_mix(self):
+        total = sum(self.errors.values())
+        top = sorted(self.errors.items(), key=lambda item: -item[1])[:TOP_ERRORS]
+        return "; ".join(f"{error} ({count / total:.0%})" for error, count in top) if total else ""
+
+
+class ComparisonMatrix:
+    """Fault type x intensity x user count x request mode x timeout matrix over per-run contributions."""
+
+    def __init__(self):
+        self.cells = {}
+
+    def add_run(self, contribution):
+        key = tuple(contribution['key'])
+        self.cells.setdefault(key, MatrixCell()).add(contribution)
+
+    def set_histograms(self, cell_histograms):
+        """Attach the merged latency histograms ({cell_id(key): LatencyHistogram}) to the cells."""
+        for key, cell in self.cells.items():
+            histogram = cell_histograms.get(cell_id(list(key)))
+            if histogram is not None:
+                cell.histogram = histogram
+
+    def rows(self, baseline_fault=None):
+        """Return one dict per cell, with deltas against the baseline fault type's matching cell."""
+        rows = []
+        for key in sorted(self.cells, key=lambda k: tuple((value is None, str(value)) for value in k)):
+            fault_type, intensity, user_count, mode, timeout = key
+            cell = self.cells[key]
+            row = {
+                'fault_type': fault_type,
+                'intensity': intensity,
+                'user_count': user_count,
+                'request_mode': mode,
+                'timeout': timeout,
+                'runs': cell.runs,
+                'total_requests': cell.total_requests,
+                'failed_requests': cell.failed_requests,
+                'success_rate': round(cell.success_rate, 4) if cell.success_rate is not None else None
+            }
+            for percent in MATRIX_PERCENTILES:
+                row[f'p{percent}'] = round(cell.histogram.percentile(percent), 2) if cell.histogram.count else None
+            row['max'] = round(cell.histogram.max, 2) if cell.histogram.count else None
+            row['error_mix'] = cell.error_mix()
+
+            if baseline_fault:
+                baseline = self._baseline_cell(baseline_fault, user_count, mode, timeout)
+                row['delta_success_rate'] = None
+                row['delta_p95'] = None
+                if baseline is not None and fault_type != baseline_fault:
+                    if cell.success_rate is not None and baseline.success_rate is not None:
+                        row['delta_success_rate'] = round(cell.success_rate - baseline.success_rate, 4)
+                    if cell.histogram.count and baseline.histogram.count:
+                        row['delta_p95'] = round(cell.histogram.percentile(95) - baseline.histogram.percentile(95), 2)
+            rows.append(row)
+        return rows
+
+    def _baseline_cell(self, baseline_fault, user_count, mode, timeout):
+        merged = None
+        for (fault_type, _, cell_users, cell_mode, cell_timeout), cell in self.cells.items():
+            if fault_type == baseline_fault and (cell_users, cell_mode, cell_timeout) == (user_count, mode, timeout):
+                if merged is None:
+                    merged = MatrixCell()
+                merged.runs += cell.runs
+                merged.total_requests += cell.total_requests
+                merged.failed_requests += cell.failed_requests
+                merged.histogram.merge(cell.histogram)
+        return merged
+
+    def write_csv(self, path, baseline_fault=None):
+        rows = self.rows(baseline_fault=baseline_fault)
+        if not rows:
+            return None
+        with open(path, 'w', encoding='utf-8', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=list(rows[0].keys()))
+            writer.writeheader()
+            writer.writerows(rows)
+        return path
+
+
+def merge_cell_histogram(contributions):
+    histogram = LatencyHistogram()
+    for contribution in contributions:
+        if contribution.get('histogram_path') and os.path.exists(contribution['histogram_path']):
+            histogram.merge(load_histograms(contribution['histogram_path'])[0])
+    return histogram
+
+
+def update_contributions(result_base, state_path, workers=None):
+    """Refresh the cached per-run contributions and per-cell merged histograms.
+
+    Only new or changed runs are re-read, and only the cells they (or removed runs) belong to
+    have their histogram re-merged from the runs' histogram files. The state file holds the
+    small per-run records plus one merged histogram per cell, so its size grows with the number
+    of matrix cells rather than with the runs' histograms, and it is only rewritten when
+    something changed. Returns (contributions, {cell_id: LatencyHistogram}, refreshed runs).
+    """
+    state = {}
+    if os.path.exists(state_path):
+        try:
+            with open(state_path, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+        except ValueError:
+            state = {}
+    if state.get('version') != STATE_VERSION:
+        # Older state files embedded every run's histogram; they are rebuilt once
+        state = {}
+    runs = state.get('runs', {})
+    cells = state.get('cells', {})
+
+    result_dirs = list(iter_result_dirs(result_base))
+    stale = [result_dir for result_dir in result_dirs
+             if result_dir not in runs or runs[result_dir].get('fingerprint') != run_fingerprint(result_dir)]
+
+    current = {result_dir: runs[result_dir] for result_dir in result_dirs
+               if result_dir in runs and result_dir not in stale}
+    dirty = {cell_id(contribution['key']) for result_dir, contribution in runs.items() if result_dir not in current}
+    if stale:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            for result_dir, contribution in zip(stale, executor.map(run_contribution, stale, chunksize=32)):
+                if contribution:
+                    current[result_dir] = contribution
+                    dirty.add(cell_id(contribution['key']))
+
+    by_cell = {}
+    for contribution in current.values():
+        by_cell.setdefault(cell_id(contribution['key']), []).append(contribution)
+    for cell in dirty | (set(by_cell) - set(cells)):
+        if cell in by_cell:
+            cells[cell] = merge_cell_histogram(by_cell[cell]).to_dict()
+        else:
+            cells.pop(cell, None)
+
+    if dirty or set(runs) != set(current):
+        tmp_path = state_path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'version': STATE_VERSION, 'runs': current, 'cells': cells}, f)
+        os.replace(tmp_path, state_path)
+    histograms = {cell: LatencyHistogram.from_dict(data) for cell, data in cells.items()}
+    return current, histograms, len(stale)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Aggregate all summarised runs into a cross-experiment comparison matrix')
+    parser.add_argument('result_base', type=str, help='Results base directory')
+    parser.add_argument('--output', type=str, help=f'Matrix CSV path (default: <result_base>/{MATRIX_NAME})')
+    parser.add_argument('--state', type=str, help=f'Incremental state file (default: <result_base>/{STATE_NAME})')
+    parser.add_argument('--baseline', type=str, default=None,
+                        help='Fault type used as baseline for delta columns (e.g. the no-chaos experiment)')
+    parser.add_argument('--workers', type=int, default=None, help='Number of worker processes')
+    args = parser.parse_args()
+
+    if not os.path.isdir(args.result_base):
+        print(f"Error: Results directory not found at {args.result_base}")
+        sys.exit(1)
+
+    start = time.time()
+    state_path = args.state or os.path.join(args.result_base, STATE_NAME)
+    contributions, histograms, refreshed = update_contributions(args.result_base, state_path, workers=args.workers)
+    print(f"Loaded {len(contributions)} run contributions ({refreshed} new or changed)")
+
+    matrix = ComparisonMatrix()
+    for contribution in contributions.values():
+        matrix.add_run(contribution)
+    matrix.set_histograms(histograms)
+
+    output_path = args.output or os.path.join(args.result_base, MATRIX_NAME)
+    if matrix.write_csv(output_path, baseline_fault=args.baseline):
+        print(f"Comparison matrix with {len(matrix.cells)} cells written to {output_path} "
+              f"in {time.time() - start:.1f}s")
+    else:
+        print("No summarised runs found, nothing written")
+
+
+if __name__ == "__main__":
+    main()
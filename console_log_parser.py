@@ -0,0 +1,172 @@
+import os
+import re
+from artifact_io import is_compressed, open_artifact
+
+# (method, name) patterns of the endpoints Locust reports for each application namespace
+APP_ENDPOINT_PATTERNS = {
+    'image-detection': (r'POST', r'/api/imagedetect'),
+    'sock-shop': (r'GET|POST|PUT|PATCH|DELETE', r'/\S*?')
+}
+DEFAULT_ENDPOINT_PATTERN = (r'[A-Z]+', r'\S+?')
+
+READ_BLOCK_SIZE = 64 * 1024
+
+_compiled_patterns = {}
+
+
+class ConsoleLogPatterns:
+    """Precompiled line patterns of a Locust console log for one application's endpoints."""
+
+    def __init__(self, method_pattern, name_pattern):
+        # Final stats table: "POST     /api/imagedetect    1234   12(0.97%) |    345      12    5000    300 | ..."
+        self.endpoint_row = re.compile(
+            rf'^\s*({method_pattern})\s+({name_pattern})\s+(\d+)\s+(\d+)\(\d+\.\d+%\)\s*\|'
+            r'\s*(\d+)\s+(\d+)\s+(\d+)\s+(\d+)')
+        self.aggregated_row = re.compile(r'Aggregated\s+(\d+)\s+(\d+)\(\d+\.\d+%\)\s*\|\s*(\d+)')
+        self.table_header = re.compile(r'^\s*Type\s+Name\s')
+        # Error report: "12                 POST /api/imagedetect: ConnectionError(...)"
+        self.error_row = re.compile(rf'(\d+)\s+((?:{method_pattern}) {name_pattern}): (.+)')
+
+
+def patterns_for(app_namespace=None):
+    """Return the compiled patterns for an application namespace (compiled once per process)."""
+    key = app_namespace if app_namespace in APP_ENDPOINT_PATTERNS else None
+    patterns = _compiled_patterns.get(key)
+    if patterns is None:
+        patterns = _compiled_patterns[key] = ConsoleLogPatterns(
+            *APP_ENDPOINT_PATTERNS.get(key, DEFAULT_ENDPOINT_PATTERN))
+    return patterns
+
+
+def iter_lines_reversed(f, block_size=READ_BLOCK_SIZE):
+    """Yield the lines of a binary file from last to first, reading fixed-size blocks from the end."""
+    f.seek(0, os.SEEK_END)
+    position = f.tell()
+    remainder = b''
+    while position > 0:
+        read_size = min(block_size, position)
+        position -= read_size
+        f.seek(position)
+        lines = (f.read(read_size) + remainder).split(b'\n')
+        remainder = lines[0]
+        for line in reversed(lines[1:]):
+            yield line.rstrip(b'\r').decode('utf-8', errors='replace')
+    if remainder:
+        yield remainder.rstrip(b'\r').decode('utf-8', errors='replace')
+
+
+def _aggregate(match):
+    return {
+        'total_requests': int(match.group(1)),
+        'failed_requests': int(match.group(2)),
+        'avg_response_time': float(match.group(3))
+    }
+
+
+def _endpoint(match):
+    method, name, requests, failures, avg, min_rt, max_rt, median = match.groups()
+    return {
+        'method': method,
+        'name': name,
+        'requests': int(requests),
+        'failures': int(failures),
+        'avg_response_time': float(avg),
+        'min_response_time': int(min_rt),
+        'max_response_time': int(max_rt),
+        'median_response_time': int(median),
+        'errors': {}
+    }
+
+
+def _error(match):
+    return int(match.group(1)), match.group(2), match.group(3).strip()
+
+
+def _scan_backward(f, patterns, block_size):
+    aggregate = None
+    endpoints = []
+    errors = []
+    for line in iter_lines_reversed(f, block_size):
+        if aggregate is None:
+            match = patterns.aggregated_row.search(line)
+            if match:
+                aggregate = _aggregate(match)
+                continue
+            match = patterns.error_row.search(line)
+            if match:
+                errors.append(_error(match))
+            continue
+
+        # The block ends at its table header (or at the previous block's aggregate line)
+        if patterns.table_header.match(line) or patterns.aggregated_row.search(line):
+            break
+        match = patterns.endpoint_row.match(line)
+        if match:
+            endpoints.append(_endpoint(match))
+
+    endpoints.reverse()
+    errors.reverse()
+    return aggregate, endpoints, errors
+
+
+def _scan_forward(lines, patterns):
+    # Same result as _scan_backward for streams that cannot seek backwards (compressed logs);
+    # only the stats block currently being read and the errors after the last one are kept
+    aggregate = None
+    endpoints = []
+    table_rows = []
+    errors = []
+    for line in lines:
+        if patterns.table_header.match(line):
+            table_rows = []
+            continue
+        match = patterns.aggregated_row.search(line)
+        if match:
+            aggregate = _aggregate(match)
+            endpoints = table_rows
+            table_rows = []
+            errors = []
+            continue
+        match = patterns.endpoint_row.match(line)
+        if match:
+            table_rows.append(_endpoint(match))
+            continue
+        match = patterns.error_row.search(line)
+        if match:
+            errors.append(_error(match))
+    return aggregate, endpoints, errors
+
+
+def parse_console_log(console_log_path, app_namespace=None, block_size=READ_BLOCK_SIZE):
+    """Parse the final statistics block of a Locust console log, reading backwards from the end.
+
+    Locust prints the cumulative stats table periodically and once more when the run ends,
+    followed by the error report, so only the tail after the last stats table header is read.
+    Memory is bounded by the block size and the size of that final block. Compressed logs are
+    streamed forwards instead, keeping only the latest block.
+
+    Returns a dict with the aggregate ('total_requests', 'failed_requests', 'avg_response_time',
+    None if no stats table was found), 'endpoints' (per-endpoint requests, failures, avg/min/max/
+    median response time and error counts) and 'errors' (list of (count, endpoint, message) in
+    report order).
+    """
+    patterns = patterns_for(app_namespace)
+    if is_compressed(console_log_path):
+        with open_artifact(console_log_path, 'rb') as f:
+            lines = (line.rstrip(b'\r\n').decode('utf-8', errors='replace') for line in f)
+            aggregate, endpoints, errors = _scan_forward(lines, patterns)
+    else:
+        with open(console_log_path, 'rb') as f:
+            aggregate, endpoints, errors = _scan_backward(f, patterns, block_size)
+
+    by_name = {f"{endpoint['method']} {endpoint['name']}": endpoint for endpoint in endpoints}
+    for count, endpoint_name, message in errors:
+        endpoint = by_name.get(endpoint_name)
+        if endpoint is not None:
+            endpoint['errors'][message] = endpoint['errors'].get(message, 0) + count
+
+    return {
+        'aggregate': aggregate,
+        'endpoints': endpoints,
+        'errors': errors
+    }
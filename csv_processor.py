@@ -3,15 +3,147 @@ import re
 import csv
 import yaml
 import json
+import shutil
+from request_stats import RequestLogStats, resolve_columns
+from columnar_log import columnar_path_for, open_fresh_columnar
+from latency_histogram import SUMMARY_PERCENTILES, histogram_path_for, save_histograms
+from resilience_timeline import create_timeline
+from cardinality import make_user_counter
+from console_log_parser import parse_console_log
+from parallel_scan import scan_parallel
+from artifact_io import artifact_exists, artifact_name, is_compressed, open_artifact
+from error_classifier import ErrorClassifier, default_classifier
+
+# Bump when the summary format or metric definitions change, so cached summaries are regenerated
+PROCESSOR_VERSION = "6"
+
+def read_summary_header(summary_csv_path):
+    """Read the '# Label:' metadata rows at the top of a summary CSV.
+
+    Returns (fields, sections): fields maps each label to the remaining cells of its row,
+    sections maps a label to the indented '#   ...' rows that follow it (error types, percentiles).
+    """
+    fields = {}
+    sections = {}
+    section = None
+    with open(summary_csv_path, 'r', encoding='utf-8', newline='') as f:
+        for row in csv.reader(f):
+            if not row or not row[0].startswith('#'):
+                break
+            if row[0].startswith('#   '):
+                if section is not None:
+                    sections[section].append([row[0][1:].strip()] + row[1:])
+                continue
+            label = row[0].lstrip('#').strip().rstrip(':')
+            fields[label] = row[1:]
+            section = label
+            sections[label] = []
+    return fields, {label: items for label, items in sections.items() if items}
+
 
 class CSVProcessor:
     """Processes experiment result CSV files and generates summarized versions with metadata."""
     
-    def __init__(self):
-        pass
+    def __init__(self, append_request_rows=False, timeline_window_seconds=1.0,
+                 user_count_mode='exact', user_count_error=0.01, app_namespace=None,
+                 parallel_scan_threshold_mb=256, scan_workers=None, error_rules=None):
+        # Whether the summary gets a full copy of the request rows (from the CSV, or re-rendered from the
+        # column file if the CSV was removed); the header alone is what the analysis tools read
+        self.append_request_rows = append_request_rows
+        # Width of the resilience timeline windows (None disables the timeline)
+        self.timeline_window_seconds = timeline_window_seconds
+        # Unique user counting: 'exact' (interned IDs) or 'approximate' (HyperLogLog with the given error)
+        self.user_count_mode = user_count_mode
+        self.user_count_error = user_count_error
+        # Application under test, selects the endpoint patterns of the console log parser
+        self.app_namespace = app_namespace
+        # CSV logs of at least this size are parsed on several cores (None disables, scan_workers=1 too)
+        self.parallel_scan_threshold_mb = parallel_scan_threshold_mb
+        self.scan_workers = scan_workers
+        # Ordered error classification rules (see error_classifier.DEFAULT_RULES), shared by console and CSV
+        self.error_classifier = ErrorClassifier(rules=error_rules) if error_rules else default_classifier()
+
+    def create_resilience_timeline(self, csv_path):
+        """Write the per-window resilience timeline of a run next to its CSV log."""
+        if not self.timeline_window_seconds:
+            return None
+        try:
+            timeline_path = create_timeline(csv_path, window_seconds=self.timeline_window_seconds)
+            if timeline_path:
+                print(f"Saved resilience timeline: {timeline_path}")
+            return timeline_path
+        except Exception as e:
+            print(f"Error creating resilience timeline: {e}")
+            return None
+        
+    def request_log_exists(self, csv_path):
+        """True if the request log is available as (possibly compressed) CSV text or as its column file."""
+        return artifact_exists(csv_path) or os.path.exists(columnar_path_for(csv_path))
+
+    def request_log_path(self, result_dir):
+        """Return the primary request log of a result directory (the piggyback CSV in piggyback mode)."""
+        if os.path.basename(os.path.dirname(result_dir)) == "piggyback_mode":
+            piggyback_csv = os.path.join(result_dir, "locust_log_piggyback_timeout.csv")
+            if self.request_log_exists(piggyback_csv):
+                return piggyback_csv
+        return os.path.join(result_dir, "locust_log.csv")
+
+    def _fallback_csv_path(self, result_dir):
+        """Return the CSV file used as a fallback source of error types for a result directory."""
+        csv_path = os.path.join(result_dir, "locust_log.csv")
         
-    def extract_metrics_from_console_log(self, console_log_path):
-        """Extract key metrics from Locust console output logs and also check CSV file for error types."""
+        # if the main CSV file does not exist, try to find any CSV file in the directory
+        if not self.request_log_exists(csv_path):
+            csv_files = [artifact_name(f) for f in os.listdir(result_dir)
+                         if artifact_name(f).endswith('.csv') and not f.endswith('_summary.csv')]
+            if csv_files:
+                csv_path = os.path.join(result_dir, csv_files[0])
+                print(f"Using CSV file: {csv_path}")
+        return csv_path
+
+    def scan_request_log(self, csv_file_path):
+        """Compute all request-level metrics of a Locust CSV log in one streaming pass.
+
+        An up-to-date column file next to the CSV is read instead of the text, if present.
+        CSV files above parallel_scan_threshold_mb are split into ranges parsed on several cores.
+        """
+        stats = RequestLogStats(user_count_mode=self.user_count_mode, user_count_error=self.user_count_error,
+                                classifier=self.error_classifier)
+        try:
+            columnar = open_fresh_columnar(csv_file_path)
+            if columnar is not None:
+                with columnar:
+                    return stats.consume_columnar(columnar)
+
+            # Compressed logs can't be split into byte ranges and are always streamed serially
+            if self.parallel_scan_threshold_mb is not None and self.scan_workers != 1 and \
+                    not is_compressed(csv_file_path) and \
+                    os.path.getsize(csv_file_path) >= self.parallel_scan_threshold_mb * 1024 * 1024:
+                print(f"Scanning large CSV file in parallel: {csv_file_path}")
+                return scan_parallel(csv_file_path, workers=self.scan_workers,
+                                     user_count_mode=self.user_count_mode, user_count_error=self.user_count_error,
+                                     classifier=self.error_classifier)
+
+            with open_artifact(csv_file_path, 'r', encoding='utf-8', newline='') as f:
+                csv_reader = csv.reader(f)
+                headers = next(csv_reader, None)
+                if headers is None:
+                    return stats
+                stats.consume(csv_reader, resolve_columns(headers))
+            return stats
+        except Exception as e:
+            print(f"Error scanning CSV file {csv_file_path}: {e}")
+            import traceback
+            traceback.print_exc()
+            return None
+
+    def extract_metrics_from_console_log(self, console_log_path, request_stats=None):
+        """Extract key metrics from Locust console output logs and also check CSV file for error types.
+
+        If request_stats (a RequestLogStats of the run's CSV) is given, its error types are used
+        instead of re-reading the CSV file. Per-endpoint stats of the final table are returned
+        under 'endpoints'.
+        """
         metrics = {
             'total_requests': 0,
             'failed_requests': 0,
@@ -19,135 +151,87 @@ class CSVProcessor:
             'error_occurrences': 0,
             'error_messages': [],
             'error_counts': {},
-            'error_message': ""
+            'error_message': "",
+            'endpoints': []
         }
         
         try:
-            with open(console_log_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-                
-                # Find all aggregate metrics lines
-                agg_pattern = r'Aggregated\s+(\d+)\s+(\d+)\(\d+\.\d+%\)\s*\|\s*(\d+)'
-                agg_matches = re.findall(agg_pattern, content)
-                
-                # Use the last match (final result)
-                if agg_matches:
-                    last_match = agg_matches[-1]
-                    metrics['total_requests'] = int(last_match[0])
-                    metrics['failed_requests'] = int(last_match[1])
-                    metrics['avg_response_time'] = float(last_match[2])
-                
-                # Find all error types and their occurrence counts
-                error_pattern = r'(\d+)\s+POST /api/imagedetect: (.+)'
-                error_matches = re.findall(error_pattern, content)
+            # Only the final stats block at the end of the log is read, backwards and in bounded memory
+            console_stats = parse_console_log(console_log_path, app_namespace=self.app_namespace)
+            
+            if console_stats['aggregate']:
+                metrics.update(console_stats['aggregate'])
+            metrics['endpoints'] = console_stats['endpoints']
+            
+            # Error classes and their occurrence counts from the final error report, classified
+            # with the same rules as the CSV error column
+            total_error_occurrences = 0
+            for count, _, error_msg in console_stats['errors']:
+                error_type = self.error_classifier.classify(error_msg)
+                metrics['error_counts'][error_type] = metrics['error_counts'].get(error_type, 0) + count
+                total_error_occurrences += count
+            
+            # Add to the list of all errors
+            for error_type, count in metrics['error_counts'].items():
+                metrics['error_messages'].append(f"{count} × {error_type}")
+            
+            if console_stats['errors']:
+                # Set the overall error occurrence count
+                metrics['error_occurrences'] = total_error_occurrences
                 
-                total_error_occurrences = 0
-                if error_matches:
-                    for count_str, error_msg in error_matches:
-                        count = int(count_str)
-                        error_msg = error_msg.strip()
-                        
-                        # Add to the list of all errors
-                        metrics['error_messages'].append(f"{count} × {error_msg}")
-                        
-                        # Add to the counts dictionary
-                        if error_msg in metrics['error_counts']:
-                            metrics['error_counts'][error_msg] += count
-                        else:
-                            metrics['error_counts'][error_msg] = count
-                                
-                        total_error_occurrences += count
-                    
-                    # Set the overall error occurrence count
-                    metrics['error_occurrences'] = total_error_occurrences
-                    
-                    # For backward compatibility, use the first error as the main error message
-                    if error_matches and not metrics['error_message']:
-                        metrics['error_message'] = error_matches[0][1].strip()
+                # For backward compatibility, use the first error as the main error message
+                metrics['error_message'] = console_stats['errors'][0][2]
         
         except Exception as e:
             print(f"Error extracting metrics from console log: {e}")
         
         # if there are failed requests but no error messages, try to extract errors from CSV
         if metrics['failed_requests'] > 0 and not metrics['error_messages']:
-            result_dir = os.path.dirname(console_log_path)
-            csv_path = os.path.join(result_dir, "locust_log.csv")
-            
-            # if the main CSV file does not exist, try to find any CSV file in the directory
-            if not os.path.exists(csv_path):
-                # check for any CSV files in the result directory
-                csv_files = [f for f in os.listdir(result_dir) if f.endswith('.csv') and not f.endswith('_summary.csv')]
-                if csv_files:
-                    csv_path = os.path.join(result_dir, csv_files[0])
-                    print(f"Using CSV file: {csv_path}")
-            
-            # if the CSV file exists, try to extract error information
-            if os.path.exists(csv_path):
-                try:
+            error_types = None
+            if request_stats is not None:
+                # Error types were already collected by the summary's streaming pass
+                error_types = request_stats.error_types
+            else:
+                csv_path = self._fallback_csv_path(os.path.dirname(console_log_path))
+                if self.request_log_exists(csv_path):
                     print(f"Extracting error information from CSV file: {csv_path}")
-                    with open(csv_path, 'r', encoding='utf-8') as f:
-                        csv_reader = csv.reader(f)
-                        headers = next(csv_reader)
-                        
-                        error_idx = None
-                        status_idx = None
-                        
-                        for i, header in enumerate(headers):
-                            if header.lower() in ('error type', 'error'):
-                                error_idx = i
-                            elif header.lower() == 'status':
-                                status_idx = i
-                        
-                        if error_idx is not None and status_idx is not None:
-                            error_types = {}
-                            
-                            for row in csv_reader:
-                                if len(row) > error_idx and len(row) > status_idx:
-                                    status = row[status_idx].strip()
-                                    
-                                    if status.lower() in ('error', 'failure', 'fail'):
-                                        error_text = row[error_idx].strip()
-                                        if error_text:
-                                            if "ReadTimeout" in error_text:
-                                                error_type = "ReadTimeout"
-                                            elif "ConnectionError" in error_text:
-                                                error_type = "ConnectionError"
-                                            else:
-                                                match = re.search(r'([A-Za-z]+)(Error|Timeout|Exception)', error_text)
-                                                if match:
-                                                    error_type = match.group(0)
-                                                else:
-                                                    error_type = error_text[:30] + "..." if len(error_text) > 30 else error_text
-                                            
-                                            if error_type in error_types:
-                                                error_types[error_type] += 1
-                                            else:
-                                                error_types[error_type] = 1
-                            
-                            if error_types:
-                                metrics['error_occurrences'] = sum(error_types.values())
-                                
-                                for error_type, count in error_types.items():
-                                    metrics['error_messages'].append(f"{count} × {error_type}")
-                                    metrics['error_counts'][error_type] = count
-                                
-                                if not metrics['error_message'] and error_types:
-                                    most_common_error = max(error_types.items(), key=lambda x: x[1])[0]
-                                    metrics['error_message'] = most_common_error
-                                
-                                print(f"Found {metrics['error_occurrences']} errors in CSV file")
-                except Exception as e:
-                    print(f"Error processing CSV file: {e}")
-                    import traceback
-                    traceback.print_exc()
+                    stats = self.scan_request_log(csv_path)
+                    if stats is not None:
+                        error_types = stats.error_types
+
+            if error_types:
+                metrics['error_occurrences'] = sum(error_types.values())
+
+                for error_type, count in error_types.items():
+                    metrics['error_messages'].append(f"{count} × {error_type}")
+                    metrics['error_counts'][error_type] = count
+
+                if not metrics['error_message']:
+                    most_common_error = max(error_types.items(), key=lambda x: x[1])[0]
+                    metrics['error_message'] = most_common_error
+
+                print(f"Found {metrics['error_occurrences']} errors in CSV file")
         
         return metrics
 
     def count_unique_users_in_csv(self, csv_file_path):
-        """Count unique user IDs in the CSV log file."""
-        unique_users = set()
+        """Count unique user IDs in the CSV log file (exactly or approximately, see user_count_mode)."""
+        unique_users = make_user_counter(self.user_count_mode, self.user_count_error)
         try:
-            with open(csv_file_path, 'r', encoding='utf-8') as f:
+            columnar = open_fresh_columnar(csv_file_path)
+            if columnar is not None:
+                with columnar:
+                    user_idx = resolve_columns(columnar.columns)['user_id']
+                    if user_idx is None:
+                        print(f"Warning: No 'User ID' column found in {csv_file_path}")
+                        return 0
+                    # Dictionary encoding already holds each distinct user ID once
+                    for user_id in columnar.dictionary(columnar.columns[user_idx]):
+                        if user_id.strip():
+                            unique_users.add(user_id.strip())
+                return unique_users.count()
+            
+            with open_artifact(csv_file_path, 'r', encoding='utf-8') as f:
                 csv_reader = csv.reader(f)
                 headers = next(csv_reader)  # Skip header row
                 
@@ -169,16 +253,20 @@ class CSVProcessor:
                         if user_id:
                             unique_users.add(user_id)
             
-            return len(unique_users)
+            return unique_users.count()
         except Exception as e:
             print(f"Error counting unique users in CSV: {e}")
             return 0
 
-    def extract_experiment_info(self, result_dir, schedule_name=None, master_count=1, worker_count=3):
-        """Extract experiment information from directory structure and YAML file."""
+    def extract_experiment_info(self, result_dir, schedule_name=None, master_count=1, worker_count=3,
+                                unique_user_count=None):
+        """Extract experiment information from directory structure and YAML file.
+
+        unique_user_count, when already known for the run's locust_log.csv, avoids re-counting users.
+        """
         info = {
             'experiment_name': schedule_name or "unknown",
-            'app': "image-detection",
+            'app': self.app_namespace or "image-detection",
             'timeout': 0,
             'master_nodes': master_count,
             'worker_nodes': worker_count,
@@ -207,7 +295,9 @@ class CSVProcessor:
         # If no user count in metadata, try to extract it from CSV
         if info['user_count'] == 0:
             csv_path = os.path.join(result_dir, "locust_log.csv")
-            if os.path.exists(csv_path):
+            if unique_user_count is not None:
+                info['user_count'] = unique_user_count
+            elif self.request_log_exists(csv_path):
                 info['user_count'] = self.count_unique_users_in_csv(csv_path)
         
         if schedule_name and schedule_name.endswith('.sh'):
@@ -264,62 +354,42 @@ class CSVProcessor:
         file_name, file_ext = os.path.splitext(original_csv_path)
         summary_csv_path = f"{file_name}_summary{file_ext}"
         
+        # Single streaming pass over the request log: totals, averages, error types and users
+        stats = self.scan_request_log(original_csv_path) if self.request_log_exists(original_csv_path) else None
+        
+        # Reuse the pass for the lookups that would otherwise re-read a CSV file
+        unique_user_count = None
+        fallback_stats = None
+        if stats is not None:
+            if os.path.abspath(original_csv_path) == os.path.abspath(os.path.join(result_dir, "locust_log.csv")):
+                unique_user_count = stats.unique_user_count
+            console_dir = os.path.dirname(console_log_path)
+            if os.path.isdir(console_dir) and \
+                    os.path.abspath(self._fallback_csv_path(console_dir)) == os.path.abspath(original_csv_path):
+                fallback_stats = stats
+        
         # Extract information
         experiment_info = self.extract_experiment_info(
             result_dir, 
             schedule_name=schedule_name,
             master_count=master_count,
-            worker_count=worker_count
+            worker_count=worker_count,
+            unique_user_count=unique_user_count
         )
-        metrics = self.extract_metrics_from_console_log(console_log_path)
+        metrics = self.extract_metrics_from_console_log(console_log_path, request_stats=fallback_stats)
         
-        # Calculate both overall average response time and successful response time from CSV
-        total_requests = 0
-        total_success = 0
-        sum_all_rt = 0.0
-        sum_success_rt = 0.0
-        
-        try:
-            with open(original_csv_path, 'r', encoding='utf-8') as f:
-                reader = csv.DictReader(f)
-                for row in reader:
-                    # Count all requests and sum their response times
-                    total_requests += 1
-                    rt_field = None
-                    
-                    if 'Response Time (ms)' in row:
-                        rt_field = 'Response Time (ms)'
-                    elif 'Response Time' in row:
-                        rt_field = 'Response Time'
-                    
-                    if rt_field and row[rt_field]:
-                        try:
-                            rt = float(row[rt_field])
-                            sum_all_rt += rt
-                            
-                            status_field = None
-                            if 'Status' in row:
-                                status_field = 'Status'
-                            elif 'status' in row:
-                                status_field = 'status'
-                                
-                            if status_field and row[status_field].strip().lower() == 'success':
-                                total_success += 1
-                                sum_success_rt += rt
-                        except (ValueError, TypeError):
-                            print(f"Warning: Could not convert response time value: {row[rt_field]}")
-            
-            # Calculate averages
-            csv_avg_all_rt = (sum_all_rt / total_requests) if total_requests > 0 else 0.0
-            csv_avg_success_rt = (sum_success_rt / total_success) if total_success > 0 else 0.0
+        if stats is not None:
+            # Calculate both overall average response time and successful response time from CSV
+            csv_avg_all_rt = stats.avg_response_time
+            csv_avg_success_rt = stats.avg_success_response_time
             
             # Use CSV calculated successful average response time
             metrics['avg_success_response_time'] = csv_avg_success_rt
             
             # For debugging: print comparison between console log and CSV calculations
-            print(f"Debug - Total requests comparison: Console={metrics['total_requests']}, CSV={total_requests}")
+            print(f"Debug - Total requests comparison: Console={metrics['total_requests']}, CSV={stats.total_requests}")
             print(f"Debug - Failed requests in Console: {metrics['failed_requests']}")
-            print(f"Debug - Success requests in CSV: {total_success}")
+            print(f"Debug - Success requests in CSV: {stats.total_success}")
             print(f"Debug - Overall average RT: Console={metrics['avg_response_time']}, CSV={csv_avg_all_rt:.2f}")
             print(f"Debug - Success average RT from CSV: {csv_avg_success_rt:.2f}")
             
@@ -330,10 +400,7 @@ class CSVProcessor:
                 metrics['avg_success_response_time'] = csv_avg_success_rt
                 print(f"Notice: {metrics['failed_requests']} failures detected, using CSV calculated average successful response time: {csv_avg_success_rt:.2f} ms")
         
-        except Exception as e:
-            print(f"Error calculating response times from CSV: {e}")
-            import traceback
-            traceback.print_exc()
+        metrics.setdefault('avg_success_response_time', metrics['avg_response_time'])
         
         with open(summary_csv_path, 'w', encoding='utf-8', newline='') as summary_file:
             writer = csv.writer(summary_file)
@@ -368,6 +435,25 @@ class CSVProcessor:
                 "# Average Successful Response Time (ms):",
                 round(metrics['avg_success_response_time'], 2)
             ])
+            
+            # Response time percentiles from the streaming histograms, overall and per status
+            if stats is not None and stats.histogram.count:
+                writer.writerow(["# Response Time Percentiles (ms):"] +
+                                [f"p{percent:g}" for percent in SUMMARY_PERCENTILES] + ["max"])
+                for label, histogram in [("all", stats.histogram)] + sorted(stats.status_histograms.items()):
+                    writer.writerow([f"#   {label}"] +
+                                    [round(histogram.percentile(percent), 2) for percent in SUMMARY_PERCENTILES] +
+                                    [round(histogram.max, 2)])
+            
+            # Per-endpoint stats from the final table of the console log
+            if metrics['endpoints']:
+                writer.writerow(["# Endpoint Stats:", "requests", "failures", "avg", "min", "max", "median"])
+                for endpoint in metrics['endpoints']:
+                    writer.writerow([f"#   {endpoint['method']} {endpoint['name']}", endpoint['requests'],
+                                     endpoint['failures'], endpoint['avg_response_time'],
+                                     endpoint['min_response_time'], endpoint['max_response_time'],
+                                     endpoint['median_response_time']])
+            
             writer.writerow(["# Total Error Occurrences:", metrics['error_occurrences']])
             
             # Write all error types and their occurrences
@@ -377,20 +463,46 @@ class CSVProcessor:
                     writer.writerow(["#   " + error_msg])
             else:
                 writer.writerow(["# Error Types:", "None"])
+            
+            # Per-class counts and first/last occurrence of the errors in the request log
+            if stats is not None and stats.errors.first_seen:
+                writer.writerow(["# Error Occurrence Window:", "count", "first_seen", "last_seen"])
+                for error_type, count in stats.errors.counts.items():
+                    first_seen = stats.errors.first_seen.get(error_type)
+                    last_seen = stats.errors.last_seen.get(error_type)
+                    writer.writerow([f"#   {error_type}", count,
+                                     round(first_seen, 3) if first_seen is not None else "",
+                                     round(last_seen, 3) if last_seen is not None else ""])
                 
             writer.writerow([])  # Add empty line before original content
             
-            # If original CSV exists, append its content
-            if os.path.exists(original_csv_path):
+            # If requested and the original CSV exists, append its raw bytes unchanged (no re-parsing)
+            if self.append_request_rows and artifact_exists(original_csv_path):
                 try:
-                    with open(original_csv_path, 'r', encoding='utf-8') as original:
-                        # Read original CSV content
-                        reader = csv.reader(original)
-                        # Write each row to the summary file
-                        for row in reader:
-                            writer.writerow(row)
+                    summary_file.flush()
+                    with open_artifact(original_csv_path, 'rb') as original:
+                        shutil.copyfileobj(original, summary_file.buffer, 1024 * 1024)
                 except Exception as e:
                     print(f"Error appending original CSV content: {e}")
+            elif self.append_request_rows and os.path.exists(columnar_path_for(original_csv_path)):
+                # Raw CSV was dropped after conversion: re-render the rows from the typed columns
+                try:
+                    columnar = open_fresh_columnar(original_csv_path)
+                    if columnar is not None:
+                        with columnar:
+                            writer.writerow(columnar.columns)
+                            writer.writerows(columnar.iter_rows())
+                except Exception as e:
+                    print(f"Error appending columnar log content: {e}")
+            
+        # Keep the mergeable histograms next to the summary for experiment/campaign level percentiles
+        if stats is not None:
+            try:
+                histogram_path = histogram_path_for(summary_csv_path)
+                save_histograms(histogram_path, stats.histogram, stats.status_histograms)
+                print(f"Saved latency histograms: {histogram_path}")
+            except Exception as e:
+                print(f"Error saving latency histograms: {e}")
             
         print(f"Successfully created summary CSV file: {summary_csv_path}")
         return summary_csv_path
@@ -398,27 +510,20 @@ class CSVProcessor:
     def process_result_directory(self, result_dir, schedule_name=None, master_count=1, worker_count=3):
         """Process a single result directory."""
         rate_dir = os.path.basename(os.path.dirname(result_dir))
-        is_piggyback = (rate_dir == "piggyback_mode")
         
         console_log_path = os.path.join(result_dir, "console_output.log")
         
-        if is_piggyback:
-            piggyback_csv = os.path.join(result_dir, "locust_log_piggyback_timeout.csv")
-            if os.path.exists(piggyback_csv):
-                original_csv_path = piggyback_csv
-                print(f"Found piggyback mode CSV file: {original_csv_path}")
-            else:
-                original_csv_path = os.path.join(result_dir, "locust_log.csv")
-        else:
-            original_csv_path = os.path.join(result_dir, "locust_log.csv")
+        original_csv_path = self.request_log_path(result_dir)
+        if os.path.basename(original_csv_path) == "locust_log_piggyback_timeout.csv":
+            print(f"Found piggyback mode CSV file: {original_csv_path}")
         
-        csv_exists = os.path.exists(original_csv_path)
-        log_exists = os.path.exists(console_log_path)
+        csv_exists = self.request_log_exists(original_csv_path)
+        log_exists = artifact_exists(console_log_path)
         
         if not csv_exists:
             print(f"Warning: Primary CSV file not found at {original_csv_path}")
             all_files = os.listdir(result_dir)
-            csv_files = [f for f in all_files if f.endswith('.csv')]
+            csv_files = [artifact_name(f) for f in all_files if artifact_name(f).endswith('.csv')]
             if csv_files:
                 print(f"Found alternative CSV files: {csv_files}")
                 original_csv_path = os.path.join(result_dir, csv_files[0])
@@ -428,7 +533,7 @@ class CSVProcessor:
         if not log_exists:
             print(f"Warning: Console log not found at {console_log_path}")
             all_files = os.listdir(result_dir)
-            log_files = [f for f in all_files if f.endswith('.log')]
+            log_files = [artifact_name(f) for f in all_files if artifact_name(f).endswith('.log')]
             if log_files:
                 print(f"Found alternative log files: {log_files}")
                 console_log_path = os.path.join(result_dir, log_files[0])
@@ -452,6 +557,7 @@ class CSVProcessor:
                 )
                 if summary_path:
                     print(f"Generated summary CSV file: {summary_path}")
+                    self.create_resilience_timeline(original_csv_path)
                     return summary_path
                 else:
                     print("Warning: Failed to generate summary CSV")
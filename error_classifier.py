@@ -0,0 +1,135 @@
+import re
+import threading
+from collections import OrderedDict
+
+# Ordered rule table: the first rule whose pattern matches (re.search) gives the error class.
+# Without 'class' the class is the named group 'class' of the match, or the whole match.
+DEFAULT_RULES = (
+    {'class': 'ReadTimeout', 'pattern': r'ReadTimeout'},
+    {'class': 'ConnectionError', 'pattern': r'ConnectionError'},
+    {'pattern': r'[A-Za-z]+(?:Error|Timeout|Exception)'}
+)
+
+# Variable parts of error messages, replaced before classification so that messages that only
+# differ in hosts, ports or ids share one class (and one cache entry)
+NORMALISERS = (
+    (re.compile(r'\b[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}\b'), '<uuid>'),
+    (re.compile(r'\b\d{1,3}(?:\.\d{1,3}){3}(?::\d+)?\b'), '<ip>'),
+    (re.compile(r'\b0x[0-9a-fA-F]+\b'), '<hex>'),
+    (re.compile(r'\b(?=[0-9a-fA-F]*\d)(?=[0-9a-fA-F]*[a-fA-F])[0-9a-fA-F]{12,}\b'), '<hex>'),
+    # Status codes (up to 3 digits) are kept, longer numbers are ports, ids or counters
+    (re.compile(r'\b\d{4,}\b'), '<n>')
+)
+
+FALLBACK_LENGTH = 30
+DEFAULT_CACHE_SIZE = 4096
+
+
+def normalise_error(message):
+    """Replace the variable parts (UUIDs, IPs, hex ids, long numbers) of an error message."""
+    for pattern, placeholder in NORMALISERS:
+        message = pattern.sub(placeholder, message)
+    return message
+
+
+class ErrorClassifier:
+    """Maps raw error messages to error classes with a precompiled, ordered rule table.
+
+    Messages are normalised before the rules are applied; results are memoised in an LRU cache
+    keyed by the raw message, since the same texts repeat for most failed requests. Messages
+    that match no rule are classified by their (truncated) normalised text. Thread-safe (the
+    artifact pipeline summarises runs in several threads).
+    """
+
+    def __init__(self, rules=None, cache_size=DEFAULT_CACHE_SIZE):
+        self.rules = [dict(rule) for rule in (rules or DEFAULT_RULES)]
+        self.cache_size = cache_size
+        self._compile()
+
+    def _compile(self):
+        self._compiled = [(re.compile(rule['pattern']), rule.get('class')) for rule in self.rules]
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __getstate__(self):
+        # Sent to worker processes without the compiled patterns and the cache
+        return {'rules': self.rules, 'cache_size': self.cache_size}
+
+    def __setstate__(self, state):
+        self.rules = state['rules']
+        self.cache_size = state['cache_size']
+        self._compile()
+
+    def classify(self, message):
+        with self._lock:
+            error_class = self._cache.get(message)
+            if error_class is not None:
+                self.hits += 1
+                self._cache.move_to_end(message)
+                return error_class
+            self.misses += 1
+
+        error_class = self._classify(normalise_error(message))
+        with self._lock:
+            self._cache[message] = error_class
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return error_class
+
+    def _classify(self, text):
+        for pattern, error_class in self._compiled:
+            match = pattern.search(text)
+            if match:
+                if error_class:
+                    return error_class
+                if 'class' in pattern.groupindex:
+                    return match.group('class')
+                return match.group(0)
+        return text[:FALLBACK_LENGTH] + "..." if len(text) > FALLBACK_LENGTH else text
+
+
+_default_classifier = None
+_default_classifier_lock = threading.Lock()
+
+
+def default_classifier():
+    """Return the process-wide classifier with the default rules."""
+    global _default_classifier
+    with _default_classifier_lock:
+        if _default_classifier is None:
+            _default_classifier = ErrorClassifier()
+        return _default_classifier
+
+
+class ErrorTable:
+    """Per-class error counts with first and last occurrence timestamps (mergeable)."""
+
+    def __init__(self):
+        # Classes keep the order in which they first occurred
+        self.counts = {}
+        self.first_seen = {}
+        self.last_seen = {}
+
+    def add(self, error_class, count=1, timestamp=None):
+        self.counts[error_class] = self.counts.get(error_class, 0) + count
+        if timestamp is not None and timestamp == timestamp:
+            first = self.first_seen.get(error_class)
+            if first is None or timestamp < first:
+                self.first_seen[error_class] = timestamp
+            last = self.last_seen.get(error_class)
+            if last is None or timestamp > last:
+                self.last_seen[error_class] = timestamp
+
+    def merge(self, other):
+        for error_class, count in other.counts.items():
+            self.add(error_class, count)
+        for error_class, timestamp in other.first_seen.items():
+            self.add(error_class, 0, timestamp)
+        for error_class, timestamp in other.last_seen.items():
+            self.add(error_class, 0, timestamp)
+        return self
+
+    def total(self):
+        return sum(self.counts.values())
@@ -0,0 +1,189 @@
+import os
+import csv
+import fnmatch
+from array import array
+from itertools import islice
+from csv_processor import CSVProcessor
+from columnar_log import column_kind, open_fresh_columnar, parse_number, parse_timestamp
+from result_tree import iter_result_dirs, parse_result_dir
+from artifact_io import open_artifact
+
+DEFAULT_BATCH_SIZE = 65536
+
+# Run attributes that filters can use without opening any file of the run
+LAYOUT_FILTERS = ('experiment_name', 'user_count', 'mode', 'request_rate', 'timeout', 'timestamp')
+
+
+def _matches(value, wanted):
+    if callable(wanted):
+        return wanted(value)
+    if isinstance(wanted, (list, tuple, set, frozenset)):
+        return any(_matches(value, item) for item in wanted)
+    if isinstance(wanted, str) and isinstance(value, str):
+        return fnmatch.fnmatch(value, wanted)
+    return value == wanted
+
+
+class ExperimentRun:
+    """One result directory of the results tree; files are only read when their data is requested."""
+
+    def __init__(self, layout, processor=None, schedule_name=None, master_count=1, worker_count=3):
+        self.layout = layout
+        self.result_dir = layout['result_dir']
+        self.processor = processor or CSVProcessor()
+        self.schedule_name = schedule_name
+        self.master_count = master_count
+        self.worker_count = worker_count
+        self._info = None
+
+    def __getattr__(self, name):
+        if name in LAYOUT_FILTERS:
+            return self.layout[name]
+        raise AttributeError(name)
+
+    def __repr__(self):
+        return f"ExperimentRun({self.result_dir!r})"
+
+    @property
+    def info(self):
+        """Experiment information as written to the summary (reads metadata.json and chaos_config.yaml)."""
+        if self._info is None:
+            self._info = self.processor.extract_experiment_info(
+                self.result_dir,
+                schedule_name=self.schedule_name,
+                master_count=self.master_count,
+                worker_count=self.worker_count
+            )
+        return self._info
+
+    @property
+    def request_log_path(self):
+        return self.processor.request_log_path(self.result_dir)
+
+    def has_request_log(self):
+        return self.processor.request_log_exists(self.request_log_path)
+
+    @property
+    def columns(self):
+        """Column names of the run's request log (only the header is read)."""
+        csv_path = self.request_log_path
+        columnar = open_fresh_columnar(csv_path)
+        if columnar is not None:
+            with columnar:
+                return list(columnar.columns)
+        with open_artifact(csv_path, 'r', encoding='utf-8', newline='') as f:
+            return next(csv.reader(f), None) or []
+
+    def stats(self):
+        """Request-level metrics of the run in one streaming pass (see CSVProcessor.scan_request_log)."""
+        return self.processor.scan_request_log(self.request_log_path)
+
+    def iter_batches(self, columns=None, batch_size=DEFAULT_BATCH_SIZE):
+        """Yield the request log as dicts of column name -> chunk of at most batch_size values.
+
+        Timestamp and response time chunks are float arrays (NaN for missing values), other
+        columns are lists of strings. The up-to-date column file is sliced if there is one,
+        otherwise the CSV is streamed; either way only one chunk is held in memory.
+        """
+        csv_path = self.request_log_path
+        columnar = open_fresh_columnar(csv_path)
+        if columnar is not None:
+            with columnar:
+                yield from self._columnar_batches(columnar, columns, batch_size)
+            return
+        yield from self._csv_batches(csv_path, columns, batch_size)
+
+    def _columnar_batches(self, columnar, columns, batch_size):
+        names = [name for name in (columns or columnar.columns) if name in columnar.columns]
+        dictionaries = {name: columnar.dictionary(name) for name in names}
+        values = {name: columnar.column(name) for name in names}
+        for start in range(0, columnar.rows, batch_size):
+            batch = {}
+            for name in names:
+                chunk = values[name][start:start + batch_size]
+                dictionary = dictionaries[name]
+                # Copy out of the mapping so that batches outlive the open file
+                batch[name] = list(map(dictionary.__getitem__, chunk)) if dictionary is not None \
+                    else array('d', chunk)
+            yield batch
+
+    def _csv_batches(self, csv_path, columns, batch_size):
+        with open_artifact(csv_path, 'r', encoding='utf-8', newline='') as f:
+            reader = csv.reader(f)
+            headers = next(reader, None) or []
+            selected = [(idx, name) for idx, name in enumerate(headers) if columns is None or name in columns]
+            parsers = {}
+            for _, name in selected:
+                kind = column_kind(name)
+                parsers[name] = parse_timestamp if kind == 'timestamp' else parse_number if kind == 'number' else None
+            rows = (row for row in reader if row)
+            while True:
+                chunk = list(islice(rows, batch_size))
+                if not chunk:
+                    break
+                batch = {}
+                for idx, name in selected:
+                    raw = [row[idx] if idx < len(row) else "" for row in chunk]
+                    parser = parsers[name]
+                    batch[name] = array('d', map(parser, raw)) if parser else raw
+                yield batch
+
+
+class ExperimentDataset:
+    """Lazy view over all runs of a results tree.
+
+    Runs are discovered by walking the directory layout, and filters on the layout attributes
+    (experiment_name, user_count, mode, request_rate, timeout, timestamp) are applied to the
+    path before any file of a run is opened. A filter value may be a literal, a glob pattern for
+    strings, a collection of alternatives or a callable; predicates receive the ExperimentRun and
+    may look at run.info, which is read on demand.
+    """
+
+    def __init__(self, result_base, processor_options=None, node_counts=None, _filters=None, _predicates=None):
+        self.result_base = result_base
+        self.processor_options = processor_options or {}
+        # Experiment label -> (master_count, worker_count), see result_tree.experiment_node_counts
+        self.node_counts = node_counts or {}
+        self._filters = dict(_filters or {})
+        self._predicates = list(_predicates or [])
+        self._processor = None
+
+    def filter(self, predicate=None, **criteria):
+        """Return a new dataset restricted to matching runs."""
+        for name in criteria:
+            if name not in LAYOUT_FILTERS:
+                raise ValueError(f"Unknown run filter: {name}")
+        predicates = self._predicates + ([predicate] if predicate else [])
+        return ExperimentDataset(self.result_base, self.processor_options, self.node_counts,
+                                 _filters={**self._filters, **criteria}, _predicates=predicates)
+
+    @property
+    def processor(self):
+        if self._processor is None:
+            self._processor = CSVProcessor(**self.processor_options)
+        return self._processor
+
+    def __iter__(self):
+        return self.runs()
+
+    def runs(self):
+        """Yield the matching runs in a stable order."""
+        for result_dir in iter_result_dirs(self.result_base):
+            layout = parse_result_dir(result_dir)
+            if layout is None:
+                continue
+            if not all(_matches(layout[name], wanted) for name, wanted in self._filters.items()):
+                continue
+            master_count, worker_count = self.node_counts.get(layout['experiment_name'], (1, 3))
+            run = ExperimentRun(layout, processor=self.processor, schedule_name=layout['experiment_name'],
+                                master_count=master_count, worker_count=worker_count)
+            if all(predicate(run) for predicate in self._predicates):
+                yield run
+
+    def iter_batches(self, columns=None, batch_size=DEFAULT_BATCH_SIZE):
+        """Yield (run, batch) for every chunk of every matching run's request log."""
+        for run in self.runs():
+            if not run.has_request_log():
+                continue
+            for batch in run.iter_batches(columns=columns, batch_size=batch_size):
+                yield run, batch
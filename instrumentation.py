@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+import os
+import sys
+import json
+import time
+import asyncio
+import argparse
+import threading
+import functools
+import contextvars
+from contextlib import contextmanager
+
+# Tags (experiment, user_count, timeout, ...) attached to every span of the current context;
+# asyncio tasks and asyncio.to_thread inherit them, plain threads get them via bind_context
+_tags = contextvars.ContextVar('instrumentation_tags', default={})
+# Record of the innermost open span, see annotate()
+_current_span = contextvars.ContextVar('instrumentation_span', default=None)
+_tracer = None
+
+
+def set_tags(**values):
+    """Set tags for the rest of the current context (None removes a tag)."""
+    tags = dict(_tags.get())
+    for name, value in values.items():
+        if value is None:
+            tags.pop(name, None)
+        else:
+            tags[name] = value
+    _tags.set(tags)
+
+
+@contextmanager
+def tags(**values):
+    """Tag the spans inside the with block."""
+    token = _tags.set({**_tags.get(), **values})
+    try:
+        yield
+    finally:
+        _tags.reset(token)
+
+
+def current_tags():
+    return dict(_tags.get())
+
+
+def bind_context(function):
+    """Wrap function to run in a copy of the caller's context (for threads and thread pools)."""
+    context = contextvars.copy_context()
+    return lambda *args, **kwargs: context.run(function, *args, **kwargs)
+
+
+class Tracer:
+    """Appends one JSON object per finished span to a campaign trace file (thread-safe)."""
+
+    def __init__(self, path):
+        self.path = path
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._file = open(path, 'a', encoding='utf-8')
+        self._lock = threading.Lock()
+        self.started = time.time()
+        self.spans = 0
+
+    def record(self, record):
+        line = json.dumps(record, default=str)
+        with self._lock:
+            self._file.write(line + "\n")
+            self._file.flush()
+            self.spans += 1
+
+    def close(self):
+        with self._lock:
+            self._file.close()
+
+
+def start_trace(path):
+    """Start writing spans to path (JSONL); returns the tracer."""
+    global _tracer
+    if _tracer is not None:
+        stop_trace()
+    _tracer = Tracer(path)
+    print(f"Writing operation trace to {path}")
+    return _tracer
+
+
+def stop_trace(print_summary=True):
+    """Stop tracing; prints the summary table and writes it next to the trace (<trace>.summary.txt)."""
+    global _tracer
+    tracer, _tracer = _tracer, None
+    if tracer is None:
+        return None
+    tracer.close()
+    table = format_summary(summarize(load_trace(tracer.path)), wall_seconds=time.time() - tracer.started)
+    summary_path = os.path.splitext(tracer.path)[0] + ".summary.txt"
+    with open(summary_path, 'w', encoding='utf-8') as f:
+        f.write(table + "\n")
+    if print_summary:
+        print(table)
+    print(f"Operation trace: {tracer.path} ({tracer.spans} spans), summary: {summary_path}")
+    return summary_path
+
+
+@contextmanager
+def span(component, operation, **fields):
+    """Time an operation and record it in the active trace.
+
+    Yields the span's record; the caller may set 'bytes', 'retries', 'outcome' or other fields
+    on it. An exception sets outcome 'error' (with the message) and is re-raised. Without an
+    active trace only the timing is done.
+    """
+    record = {'component': component, 'operation': operation, **fields}
+    start = time.time()
+    token = _current_span.set(record)
+    try:
+        yield record
+        record.setdefault('outcome', 'ok')
+    except BaseException as e:
+        record['outcome'] = 'cancelled' if isinstance(e, asyncio.CancelledError) else 'error'
+        record.setdefault('error', str(e)[:500])
+        raise
+    finally:
+        _current_span.reset(token)
+        record['seconds'] = time.time() - start
+        tracer = _tracer
+        if tracer is not None:
+            tracer.record({'start': start, **_tags.get(), **record})
+
+
+def annotate(**fields):
+    """Set fields (bytes, retries, outcome, host, ...) on the innermost open span, if any."""
+    record = _current_span.get()
+    if record is not None:
+        record.update(fields)
+
+
+def traced(component, operation, **fields):
+    """Decorator that runs every call of a function or coroutine function inside a span."""
+    def decorator(function):
+        if asyncio.iscoroutinefunction(function):
+            @functools.wraps(function)
+            async def async_wrapper(*args, **kwargs):
+                with span(component, operation, **fields):
+                    return await function(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            with span(component, operation, **fields):
+                return function(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def load_trace(path):
+    records = []
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                records.append(json.loads(line))
+    return records
+
+
+def summarize(records, by=None):
+    """Aggregate span records per (component, operation[, by tag]) into count, time, bytes, retries, errors."""
+    groups = {}
+    for record in records:
+        key = (record.get('component'), record.get('operation')) + ((record.get(by),) if by else ())
+        group = groups.setdefault(key, {'count': 0, 'seconds': 0.0, 'max_seconds': 0.0, 'bytes': 0,
+                                        'retries': 0, 'errors': 0})
+        group['count'] += 1
+        group['seconds'] += record.get('seconds', 0.0)
+        group['max_seconds'] = max(group['max_seconds'], record.get('seconds', 0.0))
+        group['bytes'] += record.get('bytes') or 0
+        group['retries'] += record.get('retries') or 0
+        if record.get('outcome') not in ('ok', None):
+            group['errors'] += 1
+    return sorted(groups.items(), key=lambda item: -item[1]['seconds'])
+
+
+def format_summary(groups, wall_seconds=None, by=None):
+    """Render the summary as a text table; spans nest (e.g. locust.run contains its ssh.command),
+    so the shares of nested operations overlap."""
+    header = ["component", "operation"] + ([by] if by else []) + \
+        ["count", "total_s", "mean_s", "max_s", "share", "MB", "retries", "errors"]
+    rows = []
+    for key, group in groups:
+        share = f"{100 * group['seconds'] / wall_seconds:.1f}%" if wall_seconds else "-"
+        rows.append([str(part) for part in key] + [
+            str(group['count']),
+            f"{group['seconds']:.1f}",
+            f"{group['seconds'] / group['count']:.3f}",
+            f"{group['max_seconds']:.1f}",
+            share,
+            f"{group['bytes'] / (1024 * 1024):.1f}",
+            str(group['retries']),
+            str(group['errors'])
+        ])
+    widths = [max(len(row[idx]) for row in [header] + rows) for idx in range(len(header))]
+    lines = ["=== WHERE THE TIME WENT" + (f" (campaign wall time {wall_seconds:.1f}s)" if wall_seconds else "")
+             + " ==="]
+    for row in [header] + rows:
+        lines.append("  ".join(cell.ljust(width) for cell, width in zip(row, widths)))
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Summarize a campaign operation trace (JSONL)')
+    parser.add_argument('trace', help='Trace file written during a campaign')
+    parser.add_argument('--by', type=str, help='Also group by this tag (e.g. experiment, user_count, timeout)')
+    args = parser.parse_args()
+
+    if not os.path.isfile(args.trace):
+        print(f"Error: Trace file not found at {args.trace}")
+        sys.exit(1)
+    records = load_trace(args.trace)
+    if not records:
+        print("Trace is empty")
+        return
+    wall_seconds = max(r['start'] + r.get('seconds', 0.0) for r in records) - min(r['start'] for r in records)
+    print(format_summary(summarize(records, by=args.by), wall_seconds=wall_seconds, by=args.by))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,5 @@
 import os
+from instrumentation import annotate, traced
 
 class K8sController:
     """Handles Kubernetes operations (applying chaos experiments on master)."""
@@ -8,6 +9,7 @@ class K8sController:
         # Define remote path for uploading the chaos experiment YAML on the master node
         self.remote_yaml_path = "/tmp/chaos_config.yaml"
 
+    @traced('kubectl', 'apply_chaos')
     def apply_chaos_experiment(self, local_yaml_path):
         """
         Upload the chaos YAML if it exists locally; otherwise assume it's already
@@ -16,6 +18,7 @@ class K8sController:
         """
         # Check if it's a shell script
         is_shell_script = local_yaml_path and local_yaml_path.endswith('.sh')
+        annotate(path=local_yaml_path)
 
         # Determine whether to upload or use the path directly
         if os.path.isfile(local_yaml_path):
@@ -64,7 +67,9 @@ class K8sController:
             
         print(f"Chaos {'script started in background' if is_shell_script else 'experiment applied successfully'}")
 
+    @traced('kubectl', 'delete_schedule')
     def delete_chaos_experiment(self, schedule_name):
+        annotate(schedule=schedule_name)
         cmd = f"kubectl delete schedule {schedule_name} -n chaos-mesh"
         print(f"Deleting chaos schedule '{schedule_name}' via kubectl with command: {cmd}")
         exit_status, out, err = self.ssh.run_command(cmd)
@@ -0,0 +1,143 @@
+import json
+import math
+
+# Sub-buckets per power of two: values are kept with a relative error below 1/SUB_BUCKETS
+SUB_BUCKETS = 128
+SUMMARY_PERCENTILES = (50, 90, 95, 99, 99.9)
+
+
+class LatencyHistogram:
+    """Log-bucketed (HDR-style) response time histogram with bounded memory.
+
+    Each power-of-two range is split into SUB_BUCKETS linear buckets, so a histogram of
+    millisecond latencies never holds more than a few thousand buckets regardless of the
+    number of recorded values. Histograms can be merged exactly and serialised to JSON.
+    """
+
+    def __init__(self, sub_buckets=SUB_BUCKETS):
+        self.sub_buckets = sub_buckets
+        self.buckets = {}
+        self.count = 0
+        self.zero_count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+
+    def _bucket(self, value):
+        mantissa, exponent = math.frexp(value)
+        return exponent * self.sub_buckets + int((mantissa - 0.5) * 2 * self.sub_buckets)
+
+    def _bucket_value(self, key):
+        exponent, sub = divmod(key, self.sub_buckets)
+        # Midpoint of the bucket's value range
+        return math.ldexp(0.5 + (sub + 0.5) / (2 * self.sub_buckets), exponent)
+
+    def record(self, value, count=1):
+        if value != value:
+            return
+        if value <= 0:
+            self.zero_count += count
+        else:
+            key = self._bucket(value)
+            self.buckets[key] = self.buckets.get(key, 0) + count
+        self.count += count
+        self.total += value * count
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+
+    def merge(self, other):
+        """Add the counts of another histogram (with the same resolution) to this one."""
+        if other.sub_buckets != self.sub_buckets:
+            raise ValueError("Cannot merge histograms with different resolutions")
+        for key, count in other.buckets.items():
+            self.buckets[key] = self.buckets.get(key, 0) + count
+        self.count += other.count
+        self.zero_count += other.zero_count
+        self.total += other.total
+        if other.min is not None and (self.min is None or other.min < self.min):
+            self.min = other.min
+        if other.max is not None and (self.max is None or other.max > self.max):
+            self.max = other.max
+        return self
+
+    @property
+    def mean(self):
+        return self.total / self.count if self.count else 0.0
+
+    def percentile(self, percent):
+        """Return the value at the given percentile (0-100), or 0.0 for an empty histogram."""
+        if not self.count:
+            return 0.0
+        rank = max(1, math.ceil(self.count * percent / 100.0))
+        seen = self.zero_count
+        if seen >= rank:
+            return min(self.min, 0.0)
+        for key in sorted(self.buckets):
+            seen += self.buckets[key]
+            if seen >= rank:
+                return min(max(self._bucket_value(key), self.min), self.max)
+        return self.max
+
+    def percentiles(self, percents=SUMMARY_PERCENTILES):
+        return {percent: self.percentile(percent) for percent in percents}
+
+    def to_dict(self):
+        return {
+            'sub_buckets': self.sub_buckets,
+            'count': self.count,
+            'zero_count': self.zero_count,
+            'sum': self.total,
+            'min': self.min,
+            'max': self.max,
+            'buckets': {str(key): count for key, count in sorted(self.buckets.items())}
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        histogram = cls(sub_buckets=data.get('sub_buckets', SUB_BUCKETS))
+        histogram.count = data.get('count', 0)
+        histogram.zero_count = data.get('zero_count', 0)
+        histogram.total = data.get('sum', 0.0)
+        histogram.min = data.get('min')
+        histogram.max = data.get('max')
+        histogram.buckets = {int(key): count for key, count in data.get('buckets', {}).items()}
+        return histogram
+
+
+def histogram_path_for(summary_csv_path):
+    """Return the histogram file stored next to a summary CSV."""
+    if summary_csv_path.endswith("_summary.csv"):
+        return summary_csv_path[:-len("_summary.csv")] + "_histograms.json"
+    return summary_csv_path + ".histograms.json"
+
+
+def save_histograms(path, overall, by_status):
+    data = {
+        'overall': overall.to_dict(),
+        'by_status': {status: histogram.to_dict() for status, histogram in by_status.items()}
+    }
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f)
+
+
+def load_histograms(path):
+    """Load a histogram file, returning (overall, {status: histogram})."""
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    overall = LatencyHistogram.from_dict(data.get('overall', {}))
+    by_status = {status: LatencyHistogram.from_dict(hist) for status, hist in data.get('by_status', {}).items()}
+    return overall, by_status
+
+
+def merge_histogram_files(paths):
+    """Merge histogram files of several runs into experiment or campaign level histograms."""
+    overall = LatencyHistogram()
+    by_status = {}
+    for path in paths:
+        run_overall, run_by_status = load_histograms(path)
+        overall.merge(run_overall)
+        for status, histogram in run_by_status.items():
+            by_status.setdefault(status, LatencyHistogram(histogram.sub_buckets)).merge(histogram)
+    return overall, by_status
@@ -1,4 +1,5 @@
 import os
+from instrumentation import annotate, traced
 
 class LoadRunner:
     """
@@ -25,13 +26,14 @@ class LoadRunner:
         # Define the absolute path to the Locust executable on the client node.
         self.locust_executable = "/home/ubuntu/.local/bin/locust"
 
+    @traced('locust', 'run')
     def run_test(self, timeout_value, user_count=1, test_duration_minutes=10, rate_interval=1.0):
         """
         Run the Locust test with the given timeout_value and user_count.
         """
         # Clean up previous run's log files ONLY (console log and CSV):
         cleanup_cmd = f"rm -f {self.console_log_path} {self.csv_path}"
-        self.ssh.run_command(cleanup_cmd)
+        self.ssh.run_command(cleanup_cmd, idempotent=True)
 
         # We set an extra buffer (e.g., +1 minute) so that if Locust fails to exit
         # after its run-time, 'timeout' will forcibly kill it.
@@ -82,14 +84,15 @@ class LoadRunner:
         print(f"Running Locust test with timeout={timeout_value}s, users={user_count}, {mode_str}, duration={test_duration_minutes}min...")
         print(f"Final command: {locust_cmd}")
 
-        # Execute command remotely
-        exit_status, _, _ = self.ssh.run_command(locust_cmd)
+        # Execute command remotely; the deadline only matters if even the remote 'timeout' fails
+        exit_status, _, _ = self.ssh.run_command(locust_cmd, timeout=kill_after_seconds + 120)
         print(f"Locust test command exited with status: {exit_status}")
+        annotate(exit_status=exit_status, duration_minutes=test_duration_minutes)
 
         # obtain the console output from the remote log file
         tail_cmd = f"tail -n 300 {self.console_log_path}"
         try:
-            _, log_content, _ = self.ssh.run_command(tail_cmd)
+            _, log_content, _ = self.ssh.run_command(tail_cmd, idempotent=True)
             print("Locust console log summary:\n" + log_content)
         except Exception as e:
             print(f"Warning: Could not read log tail: {e}")
@@ -125,7 +128,7 @@ class LoadRunner:
                 # if the test failed, gather an example error
                 error_cmd = f"grep -E 'Error|Exception|CRITICAL|WARNING' {self.console_log_path} | tail -n 10"
                 try:
-                    _, error_output, _ = self.ssh.run_command(error_cmd)
+                    _, error_output, _ = self.ssh.run_command(error_cmd, idempotent=True)
                     error_lines = error_output.strip().split('\n') if error_output.strip() else []
                 except Exception:
                     error_lines = []
@@ -148,12 +151,12 @@ class LoadRunner:
             
             # check if the CSV file exists
             check_csv = f"[ -f {csv_path} ] && echo 'CSV exists' || echo 'CSV missing'"
-            _, csv_status, _ = self.ssh.run_command(check_csv)
+            _, csv_status, _ = self.ssh.run_command(check_csv, idempotent=True)
             
             if "CSV exists" in csv_status:
                 # check the CSV file size
                 wc_cmd = f"wc -l {csv_path}"
-                _, wc_output, _ = self.ssh.run_command(wc_cmd)
+                _, wc_output, _ = self.ssh.run_command(wc_cmd, idempotent=True)
                 print(f"CSV file stats: {wc_output}")
 
         print(f"Locust test with timeout={timeout_value}s, users={user_count}, {mode_str} completed.")
\ No newline at end of file
@@ -0,0 +1,131 @@
+import os
+import json
+import shutil
+import threading
+import time
+from instrumentation import bind_context
+
+DEFAULT_INTERVAL_SECONDS = 30
+# Upper bound of one poll's transfer, so that a backlog does not hold the SFTP session for long
+MAX_BYTES_PER_POLL = 64 * 1024 * 1024
+# Bytes at the start of a log compared on every poll to notice that it was recreated
+HEAD_BYTES = 4096
+
+
+class LogShipper:
+    """Pulls the newly appended bytes of remote logs into local .part files while a test runs.
+
+    Every poll reads each remote file from the offset shipped so far (offset tailing) and appends
+    the data to <local_dir>/<name>.part. The offset is recorded in the same sidecar file
+    (<name>.part.json, marked as growing) that SSHManager.download_file_resumable uses, so the
+    post-run download only fetches the remaining delta and verifies the whole file. If the client
+    node or the connection dies mid-run, the shipped prefix stays on disk. A remote log that shrank
+    or whose first bytes changed (recreated by a new run) is shipped again from the start.
+    """
+
+    def __init__(self, ssh_manager, remote_paths, local_dir, interval_seconds=DEFAULT_INTERVAL_SECONDS,
+                 max_bytes_per_poll=MAX_BYTES_PER_POLL):
+        self.ssh = ssh_manager
+        # Local artifact name -> remote path, e.g. {'locust_log.csv': '/home/ubuntu/locust_log.csv'}
+        self.remote_paths = dict(remote_paths)
+        self.local_dir = local_dir
+        self.interval_seconds = interval_seconds
+        self.max_bytes_per_poll = max_bytes_per_poll
+        self.offsets = {name: 0 for name in self.remote_paths}
+        # First bytes (up to HEAD_BYTES) of what was shipped per log
+        self.heads = {name: b'' for name in self.remote_paths}
+        self.shipped_bytes = 0
+        self.polls = 0
+        self._stop = threading.Event()
+        # Serialises polls with reset()
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def _part_paths(self, name):
+        part_path = os.path.join(self.local_dir, name + ".part")
+        return part_path, part_path + ".json"
+
+    def start(self):
+        os.makedirs(self.local_dir, exist_ok=True)
+        # The remote logs are recreated by every run, so shipping always starts from scratch
+        self.reset()
+        self._stop.clear()
+        self._thread = threading.Thread(target=bind_context(self._run), name="log-shipper", daemon=True)
+        self._thread.start()
+        print(f"Log shipper started for {', '.join(self.remote_paths)} (every {self.interval_seconds}s)")
+
+    def _run(self):
+        while not self._stop.wait(self.interval_seconds):
+            try:
+                self.poll()
+            except Exception as e:
+                # The next poll retries; the main thread handles a lost connection
+                print(f"Log shipper poll failed: {e}")
+
+    def reset(self):
+        """Discard everything shipped so far, e.g. before a retried run recreates the remote logs."""
+        with self._lock:
+            for name in self.remote_paths:
+                self.offsets[name] = 0
+                self.heads[name] = b''
+                for path in self._part_paths(name):
+                    if os.path.exists(path):
+                        os.remove(path)
+
+    def poll(self):
+        """Ship the bytes appended to every remote log since the last poll."""
+        self.polls += 1
+        for name, remote_path in self.remote_paths.items():
+            if self._stop.is_set():
+                return
+            with self._lock:
+                self._ship(name, remote_path)
+
+    def _ship(self, name, remote_path):
+        part_path, state_path = self._part_paths(name)
+        offset = self.offsets[name]
+        head = self.heads[name]
+        size, remote_head, data = self.ssh.read_appended(remote_path, offset, max_bytes=self.max_bytes_per_poll,
+                                                         head_bytes=len(head))
+        if size is None:
+            return
+        if size < offset or remote_head != head:
+            # Truncated or recreated (e.g. by the cleanup of a retried run), possibly already grown
+            # past the old offset: start over
+            print(f"Remote log {remote_path} was recreated ({offset} bytes shipped, now {size} bytes), "
+                  f"shipping it again")
+            offset = 0
+            size, _, data = self.ssh.read_appended(remote_path, 0, max_bytes=self.max_bytes_per_poll)
+            if size is None:
+                return
+        if not data and offset == self.offsets[name]:
+            return
+        with open(part_path, 'r+b' if os.path.exists(part_path) else 'wb') as f:
+            f.seek(offset)
+            f.truncate()
+            f.write(data)
+        if offset < HEAD_BYTES:
+            self.heads[name] = (self.heads[name][:offset] + data)[:HEAD_BYTES]
+        offset += len(data)
+        self.offsets[name] = offset
+        self.shipped_bytes += len(data)
+        with open(state_path, 'w', encoding='utf-8') as f:
+            json.dump({'remote_path': remote_path, 'size': size, 'mtime': None, 'offset': offset,
+                       'growing': True}, f)
+
+    def stop(self):
+        """Stop polling; the data shipped so far stays in the .part files."""
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+        shipped = ", ".join(f"{name} {offset} bytes" for name, offset in self.offsets.items())
+        print(f"Log shipper stopped after {self.polls} poll(s): {shipped}")
+
+    def handoff(self, result_dir):
+        """Move the .part files (and their sidecars) into result_dir for the post-run download."""
+        for name in self.remote_paths:
+            for path in self._part_paths(name):
+                if os.path.exists(path):
+                    shutil.move(path, os.path.join(result_dir, os.path.basename(path)))
@@ -2,11 +2,15 @@ import yaml
 import os
 import time
 import sys
+import asyncio
 from ssh_manager import SSHManager
 from k8s_controller import K8sController
 from load_runner import LoadRunner
 from result_manager import ResultManager
 from cluster_checker import ClusterChecker
+from artifact_pipeline import ArtifactPipeline
+from log_shipper import LogShipper
+from instrumentation import start_trace, stop_trace, set_tags, span
 
 def recover_worker_nodes(ssh_manager):
     try:
@@ -22,7 +26,62 @@ def recover_worker_nodes(ssh_manager):
         print(f"Warning: Worker nodes recovery operation failed: {e}")
         return False
 
-def main():
+def process_run_artifacts(result_manager, ssh_manager, remote_csv_path, remote_console_path, result_dir,
+                          timeout, locust_script, metadata, schedule_name, master_count, worker_count):
+    """Download the run's logs, write the report and the summary CSV; True if all logs are complete.
+
+    A remote path of None (the log was missing when the run was snapshotted) is skipped.
+    """
+    # 2) download CSV log
+    try:
+        if remote_csv_path:
+            result_manager.download_csv_log(ssh_manager, remote_csv_path, result_dir)
+        else:
+            print("[Warning] CSV log was not found on the client node")
+    except Exception as e:
+        print(f"[Warning] download CSV fail: {e}")
+
+    # 3) download console log
+    try:
+        if remote_console_path:
+            result_manager.download_console_log(ssh_manager, remote_console_path, result_dir)
+        else:
+            print("[Warning] console log was not found on the client node")
+    except Exception as e:
+        print(f"[Warning] download console log fail: {e}")
+
+    # 4) generate report
+    result_manager.generate_report(timeout, locust_script, result_dir, metadata=metadata)
+
+    # 5) create summary CSV
+    try:
+        result_manager.create_summary_csv(
+            result_dir,
+            schedule_name=schedule_name,
+            master_count=master_count,
+            worker_count=worker_count
+        )
+    except Exception as e:
+        print(f"[Warning] create summary CSV fail: {e}")
+
+    artifacts = result_manager.load_artifacts(result_dir)
+    return bool(artifacts) and all(record.get('complete') for record in artifacts.values())
+
+async def watch_connection(ssh_manager, interval_seconds=30):
+    """Probe a connection periodically, reconnecting it if it died, until the task is cancelled."""
+    while True:
+        await asyncio.sleep(interval_seconds)
+        try:
+            await asyncio.to_thread(ssh_manager.ensure_connected, True)
+        except Exception as e:
+            print(f"Warning: connection probe to {ssh_manager.host} failed: {e}")
+
+async def recovery_sleep(seconds, reason):
+    """Wait for the cluster to recover; the wait shows up in the trace as campaign.<reason>."""
+    with span('campaign', reason, planned_seconds=seconds):
+        await asyncio.sleep(seconds)
+
+async def main():
     # Load configuration from config.yaml
     config_path = os.path.join(os.path.dirname(__file__), "config.yaml")
     with open(config_path, 'r') as f:
@@ -53,16 +112,46 @@ def main():
     
     experiments = config.get('experiments', [])
 
+    # Get result storage options from config
+    storage_options = config.get('storage', {}) or {}
+    columnar_logs = storage_options.get('columnar_logs', False)
+    keep_raw_csv = storage_options.get('keep_raw_csv', True)
+    compression = storage_options.get('compression')
+    compression_level = storage_options.get('compression_level', 6)
+    compressed_transfer = storage_options.get('compressed_transfer', False)
+    transfer_compression_level = storage_options.get('transfer_compression_level', 6)
+    # Get summary processing options from config (passed to CSVProcessor)
+    processor_options = dict(config.get('summary', {}) or {})
+    # Background processing of finished runs (download, compression, summary) during the next run
+    pipeline_options = config.get('artifact_pipeline', {}) or {}
+    # Incremental download of the remote logs while Locust runs
+    shipping_options = config.get('log_shipping', {}) or {}
+    # Per-operation trace of the campaign (JSONL) and the where-the-time-went summary
+    instrumentation_options = config.get('instrumentation', {}) or {}
+    catalog_path = None
+    if storage_options.get('catalog', False):
+        catalog_path = os.path.join(results_base, "campaign_catalog.sqlite")
+
     # Get application namespace from config or default to "image-detection"
     app_namespace = config.get('app_namespace', 'image-detection')
+    # The console log parser selects its endpoint patterns by application
+    processor_options.setdefault('app_namespace', app_namespace)
+
+    if instrumentation_options.get('enabled', True):
+        trace_dir = instrumentation_options.get('trace_dir') or os.path.join(results_base, "traces")
+        start_trace(os.path.join(trace_dir, f"campaign_{time.strftime('%Y%m%dT%H%M%S')}.jsonl"))
 
     # Initialize SSH connections
-    ssh_master = SSHManager(master_cfg.get('host'), master_cfg.get('user'), master_cfg.get('key_path'))
-    ssh_client = SSHManager(client_cfg.get('host'), client_cfg.get('user'), client_cfg.get('key_path'))
+    # Reconnect behaviour of both connections (reconnect_attempts, backoff_base, backoff_cap)
+    reconnect_options = config.get('ssh', {}) or {}
+    ssh_master = SSHManager(master_cfg.get('host'), master_cfg.get('user'), master_cfg.get('key_path'),
+                            **reconnect_options)
+    ssh_client = SSHManager(client_cfg.get('host'), client_cfg.get('user'), client_cfg.get('key_path'),
+                            **reconnect_options)
     try:
-        ssh_master.connect()
+        # Both nodes are independent, connect to them concurrently
+        await asyncio.gather(asyncio.to_thread(ssh_master.connect), asyncio.to_thread(ssh_client.connect))
         print("SSH connection established to master node.")
-        ssh_client.connect()
         print("SSH connection established to client node.")
     except Exception as e:
         print(f"Error: SSH connection failed - {e}")
@@ -71,12 +160,12 @@ def main():
     # Initialize cluster checker and perform health checks
     if not skip_checks:
         checker = ClusterChecker(ssh_master)
-        checks_passed = checker.perform_all_checks(app_namespace=app_namespace)
+        checks_passed = await checker.perform_all_checks_async(app_namespace=app_namespace)
         
         if not checks_passed:
             if wait_for_ready:
                 print("Cluster health checks failed. Waiting for cluster to become ready...")
-                checks_passed = checker.wait_for_healthy_cluster(
+                checks_passed = await checker.wait_for_healthy_cluster_async(
                     app_namespace=app_namespace,
                     max_wait_attempts=max_wait_attempts,
                     retry_interval=retry_interval
@@ -99,6 +188,14 @@ def main():
 
     k8s_ctrl = K8sController(ssh_master)
 
+    pipeline = None
+    if pipeline_options.get('enabled', False):
+        pipeline = ArtifactPipeline(
+            ssh_client,
+            workers=pipeline_options.get('workers', 2),
+            queue_size=pipeline_options.get('queue_size', 4)
+        )
+
     # Iterate experiments
     for idx, experiment in enumerate(experiments, start=1):
         chaos_yaml_path   = experiment.get('chaos_yaml')
@@ -122,25 +219,29 @@ def main():
         else:
             exp_label = schedule_name or f"experiment_{idx}"
             
+        set_tags(experiment=exp_label, user_count=None, timeout=None)
         exp_base = os.path.join(results_base, exp_label)
         os.makedirs(exp_base, exist_ok=True)
-        result_manager = ResultManager(exp_base)
+        result_manager = ResultManager(
+            exp_base, columnar_logs=columnar_logs, keep_raw_csv=keep_raw_csv, catalog_path=catalog_path,
+            processor_options=processor_options, compression=compression, compression_level=compression_level,
+            compressed_transfer=compressed_transfer, transfer_compression_level=transfer_compression_level)
 
         load_runner = LoadRunner(ssh_client, locust_script, locust_csv_path)
 
         if not skip_checks:
             print(f"\n=== RESTARTING DEPLOYMENTS BEFORE EXPERIMENT '{exp_label}' ===")
-            checker.restart_deployments(app_namespace=app_namespace)
+            await asyncio.to_thread(checker.restart_deployments, app_namespace=app_namespace)
 
         # Run health checks before each experiment schedule if configured to do so
         if check_options.get('check_before_each_experiment', False) and not skip_checks:
             print(f"\n=== HEALTH CHECK BEFORE EXPERIMENT '{exp_label}' ===")
-            checks_passed = checker.perform_all_checks(app_namespace=app_namespace)
+            checks_passed = await checker.perform_all_checks_async(app_namespace=app_namespace)
             
             if not checks_passed:
                 if wait_for_ready:
                     print(f"Health checks before experiment '{exp_label}' failed. Waiting for cluster to become ready...")
-                    checks_passed = checker.wait_for_healthy_cluster(
+                    checks_passed = await checker.wait_for_healthy_cluster_async(
                         app_namespace=app_namespace,
                         max_wait_attempts=max_wait_attempts,
                         retry_interval=retry_interval
@@ -160,12 +261,13 @@ def main():
         # apply chaos
         try:
             print(f"Applying chaos experiment: {chaos_yaml_path}")
-            k8s_ctrl.apply_chaos_experiment(chaos_yaml_path)
+            await asyncio.to_thread(k8s_ctrl.apply_chaos_experiment, chaos_yaml_path)
         except Exception as e:
             print(f"Error applying chaos experiment for '{exp_label}': {e}")
             continue
 
         for user_count in user_counts:
+            set_tags(user_count=user_count, timeout=None)
             user_exp_base = os.path.join(exp_base, f"users_{user_count}")
             os.makedirs(user_exp_base, exist_ok=True)
 
@@ -177,14 +279,29 @@ def main():
                 rate_exp_base = os.path.join(user_exp_base, f"rate_{request_rate}s")
                 
             os.makedirs(rate_exp_base, exist_ok=True)
-            user_result_manager = ResultManager(rate_exp_base)
+            user_result_manager = ResultManager(
+                rate_exp_base, columnar_logs=columnar_logs, keep_raw_csv=keep_raw_csv, catalog_path=catalog_path,
+                processor_options=processor_options, compression=compression,
+                compression_level=compression_level, compressed_transfer=compressed_transfer,
+                transfer_compression_level=transfer_compression_level)
 
             print(f"\n=== RUNNING TESTS WITH {user_count} CONCURRENT USERS ===")
 
             for timeout_idx, timeout in enumerate(timeouts):
+                set_tags(timeout=timeout)
                 try:
                     print(f"=== Running '{exp_label}' with {user_count} users and timeout {timeout}s ===")
                     
+                    shipper = None
+                    if shipping_options.get('enabled', False):
+                        shipper = LogShipper(
+                            ssh_client,
+                            {"locust_log.csv": locust_csv_path, "console_output.log": load_runner.console_log_path},
+                            os.path.join(rate_exp_base, ".inflight"),
+                            interval_seconds=shipping_options.get('interval_seconds', 30)
+                        )
+                        shipper.start()
+
                     # Try to run the Locust test with retries
                     success = False
                     locust_error = None
@@ -192,13 +309,23 @@ def main():
                         try:
                             if retry_num > 1:
                                 print(f"Retrying Locust test (attempt {retry_num}/{locust_retry_count})...")
+                                if shipper:
+                                    # The retried run recreates the remote logs
+                                    await asyncio.to_thread(shipper.reset)
                             
-                            load_runner.run_test(
-                                timeout_value=timeout, 
-                                user_count=user_count, 
-                                test_duration_minutes=test_duration_minutes,
-                                rate_interval=request_rate
-                            )
+                            # In a worker thread, so the event loop stays free while Locust runs; meanwhile
+                            # the master connection is probed so the recovery steps find it working
+                            watcher = asyncio.create_task(watch_connection(ssh_master))
+                            try:
+                                await asyncio.to_thread(
+                                    load_runner.run_test,
+                                    timeout_value=timeout, 
+                                    user_count=user_count, 
+                                    test_duration_minutes=test_duration_minutes,
+                                    rate_interval=request_rate
+                                )
+                            finally:
+                                watcher.cancel()
                             success = True
                             break
                         except Exception as e:
@@ -208,16 +335,34 @@ def main():
                             # Wait a bit before retrying
                             if retry_num < locust_retry_count:
                                 print(f"Waiting 5 seconds before retry...")
-                                time.sleep(5)
+                                await recovery_sleep(5, 'locust_retry_wait')
                     
+                    if shipper:
+                        # Waits for a poll that may be in the middle of a transfer
+                        await asyncio.to_thread(shipper.stop)
+
                     # If all retries failed, raise the last error
                     if not success:
+                        if shipper and shipper.shipped_bytes:
+                            # Keep what was shipped before the run broke off
+                            failed_dir = os.path.join(rate_exp_base, f"timeout_{timeout}s_{time.strftime('%Y%m%dT%H%M%S')}")
+                            os.makedirs(failed_dir, exist_ok=True)
+                            shipper.handoff(failed_dir)
+                            for name in shipper.remote_paths:
+                                user_result_manager.record_artifact(failed_dir, name, {
+                                    'complete': False,
+                                    'bytes': user_result_manager.partial_bytes(os.path.join(failed_dir, name)),
+                                    'error': 'test run failed'
+                                })
+                            print(f"Kept the logs shipped before the failure in {failed_dir}")
                         raise Exception(f"All {locust_retry_count} Locust test attempts failed. Last error: {locust_error}")
                     
                     timestamp  = time.strftime("%Y%m%dT%H%M%S")
                     result_dir = os.path.join(rate_exp_base, f"timeout_{timeout}s_{timestamp}")
                     os.makedirs(result_dir, exist_ok=True)
                     print(f"Created result directory: {result_dir}")
+                    if shipper:
+                        shipper.handoff(result_dir)
 
                     # 1) copy chaos yaml/script (local)
                     try:
@@ -225,20 +370,10 @@ def main():
                     except Exception as e:
                         print(f"[Warning] copy chaos_config fail: {e}")
 
-                    # 2) download CSV log
-                    try:
-                        user_result_manager.download_csv_log(ssh_client, locust_csv_path, result_dir)
-                    except Exception as e:
-                        print(f"[Warning] download CSV fail: {e}")
-
-                    # 3) download console log
-                    try:
-                        user_result_manager.download_console_log(ssh_client, load_runner.console_log_path, result_dir)
-                    except Exception as e:
-                        print(f"[Warning] download console log fail: {e}")
-
-                    # 4) generate report
+                    summary_schedule_name = schedule_name if not is_shell_script else os.path.basename(chaos_yaml_path)
                     metadata = {
+                        # Reprocessing summarises the run with the same value (result_tree.run_schedule_name)
+                        "schedule_name": summary_schedule_name,
                         "user_count": user_count,
                         "timeout": timeout,
                         "test_duration_minutes": test_duration_minutes
@@ -250,19 +385,44 @@ def main():
                         metadata["request_mode"] = "piggyback" 
                     else:
                         metadata["request_rate"] = request_rate
-                        
-                    user_result_manager.generate_report(timeout, locust_script, result_dir, metadata=metadata)
 
-                    # 5) create summary CSV
-                    try:
-                        user_result_manager.create_summary_csv(
-                            result_dir, 
-                            schedule_name=schedule_name if not is_shell_script else os.path.basename(chaos_yaml_path),
-                            master_count=master_count,
-                            worker_count=worker_count
+                    # 2-5) download logs, generate report and summary CSV
+                    run_args = dict(
+                        result_manager=user_result_manager,
+                        ssh_manager=ssh_client,
+                        result_dir=result_dir,
+                        timeout=timeout,
+                        locust_script=locust_script,
+                        metadata=metadata,
+                        schedule_name=summary_schedule_name,
+                        master_count=master_count,
+                        worker_count=worker_count
+                    )
+                    queued = False
+                    if pipeline:
+                        run_id = os.path.relpath(result_dir, results_base).replace(os.sep, "_")
+                        try:
+                            # The remote snapshot (mv) and a full queue block, so submit off the event loop
+                            await asyncio.to_thread(
+                                pipeline.submit,
+                                run_id,
+                                {"locust_log.csv": locust_csv_path, "console_output.log": load_runner.console_log_path},
+                                lambda snapshots, run_args=run_args: process_run_artifacts(
+                                    remote_csv_path=snapshots.get("locust_log.csv"),
+                                    remote_console_path=snapshots.get("console_output.log"),
+                                    **run_args
+                                )
+                            )
+                            queued = True
+                        except Exception as e:
+                            print(f"[Warning] background processing unavailable, processing in place: {e}")
+                    if not queued:
+                        await asyncio.to_thread(
+                            process_run_artifacts,
+                            remote_csv_path=locust_csv_path,
+                            remote_console_path=load_runner.console_log_path,
+                            **run_args
                         )
-                    except Exception as e:
-                        print(f"[Warning] create summary CSV fail: {e}")
 
                     print(f"Results for {user_count} users and timeout {timeout}s saved in {result_dir}")
                     
@@ -270,10 +430,10 @@ def main():
                         # Delete current chaos schedule
                         if is_shell_script:
                             print(f"Shell script experiment: {exp_label}, performing node recovery between timeout tests...")
-                            recover_worker_nodes(ssh_master)
+                            await asyncio.to_thread(recover_worker_nodes, ssh_master)
                         elif schedule_name:
                             try:
-                                k8s_ctrl.delete_chaos_experiment(schedule_name)
+                                await asyncio.to_thread(k8s_ctrl.delete_chaos_experiment, schedule_name)
                                 print(f"Deleted chaos schedule '{schedule_name}' to reset chaos.")
                             except Exception as e_del:
                                 print(f"Error deleting schedule '{schedule_name}': {e_del}")
@@ -282,21 +442,21 @@ def main():
                         
                         print(f"\n=== WAITING BETWEEN TIMEOUT TESTS WITHOUT DEPLOYMENT RESTART ===")
                         print(f"Waiting {timeout_recovery}s for recovery between timeout tests...")
-                        time.sleep(timeout_recovery)
+                        await recovery_sleep(timeout_recovery, 'timeout_recovery_wait')
                         
                         if check_between_timeouts and not skip_checks:
                             print(f"\n=== HEALTH CHECK BETWEEN TIMEOUT TESTS ({timeout}s -> {timeouts[timeout_idx + 1]}s) ===")
-                            timeout_checks_passed = checker.perform_all_checks(app_namespace=app_namespace)
+                            timeout_checks_passed = await checker.perform_all_checks_async(app_namespace=app_namespace)
                             if not timeout_checks_passed and wait_for_ready:
                                 print(f"Health checks between timeout tests failed. Waiting for cluster to become ready...")
-                                checker.wait_for_healthy_cluster(
+                                await checker.wait_for_healthy_cluster_async(
                                     app_namespace=app_namespace,
                                     max_wait_attempts=max_wait_attempts,
                                     retry_interval=retry_interval
                                 )
                         # Re-apply chaos experiment for next timeout test
                         try:
-                            k8s_ctrl.apply_chaos_experiment(chaos_yaml_path)
+                            await asyncio.to_thread(k8s_ctrl.apply_chaos_experiment, chaos_yaml_path)
                             print("Chaos experiment reapplied for next timeout test.")
                         except Exception as e_app:
                             print(f"Error reapplying chaos experiment for next timeout: {e_app}")
@@ -309,10 +469,10 @@ def main():
                     if timeout_idx < len(timeouts) - 1:
                         if is_shell_script:
                             print(f"Shell script experiment: {exp_label}, performing node recovery after failed test...")
-                            recover_worker_nodes(ssh_master)
+                            await asyncio.to_thread(recover_worker_nodes, ssh_master)
                         elif schedule_name:
                             try:
-                                k8s_ctrl.delete_chaos_experiment(schedule_name)
+                                await asyncio.to_thread(k8s_ctrl.delete_chaos_experiment, schedule_name)
                                 print(f"Deleted chaos schedule '{schedule_name}' after failed timeout.")
                             except Exception as e_del:
                                 print(f"Error deleting schedule '{schedule_name}' after failure: {e_del}")
@@ -320,13 +480,13 @@ def main():
                             print("No schedule name provided, skipping chaos deletion after failure.")
                         
                         print(f"Waiting {timeout_recovery}s for recovery after failed timeout test...")
-                        time.sleep(timeout_recovery)
+                        await recovery_sleep(timeout_recovery, 'timeout_recovery_wait')
                         
                         if check_between_timeouts and not skip_checks:
                             print(f"\n=== HEALTH CHECK AFTER FAILED TIMEOUT TEST ===")
-                            checker.perform_all_checks(app_namespace=app_namespace)
+                            await checker.perform_all_checks_async(app_namespace=app_namespace)
                         try:
-                            k8s_ctrl.apply_chaos_experiment(chaos_yaml_path)
+                            await asyncio.to_thread(k8s_ctrl.apply_chaos_experiment, chaos_yaml_path)
                             print("Chaos experiment reapplied for next timeout test after failure.")
                         except Exception as e_app:
                             print(f"Error reapplying chaos experiment after failed timeout: {e_app}")
@@ -335,10 +495,10 @@ def main():
 
             if is_shell_script:
                 print(f"Shell script experiment: {exp_label}, performing node recovery after user count tests...")
-                recover_worker_nodes(ssh_master)
+                await asyncio.to_thread(recover_worker_nodes, ssh_master)
             elif schedule_name:
                 try:
-                    k8s_ctrl.delete_chaos_experiment(schedule_name)
+                    await asyncio.to_thread(k8s_ctrl.delete_chaos_experiment, schedule_name)
                     print(f"Deleted chaos schedule '{schedule_name}' after user count {user_count} tests.")
                 except Exception as e:
                     print(f"Error deleting schedule '{schedule_name}': {e}")
@@ -346,18 +506,18 @@ def main():
             if user_count != user_counts[-1]:
                 if not skip_checks:
                     print(f"\n=== RESTARTING DEPLOYMENTS BEFORE NEXT USER COUNT {user_counts[user_counts.index(user_count) + 1]} ===")
-                    checker.restart_deployments(app_namespace=app_namespace)
+                    await asyncio.to_thread(checker.restart_deployments, app_namespace=app_namespace)
 
                 print(f"Waiting {recovery_wait}s for system recovery between user count tests...")
-                time.sleep(recovery_wait)
+                await recovery_sleep(recovery_wait, 'user_count_recovery_wait')
                 
                 # Run health check after recovery
                 if not skip_checks:
                     print(f"\n=== HEALTH CHECK BEFORE NEXT USER COUNT ===")
-                    checks_passed = checker.perform_all_checks(app_namespace=app_namespace)
+                    checks_passed = await checker.perform_all_checks_async(app_namespace=app_namespace)
                     if not checks_passed and wait_for_ready:
                         print(f"Health checks before next user count failed. Waiting for cluster to recover...")
-                        checker.wait_for_healthy_cluster(
+                        await checker.wait_for_healthy_cluster_async(
                             app_namespace=app_namespace,
                             max_wait_attempts=max_wait_attempts,
                             retry_interval=retry_interval
@@ -365,7 +525,7 @@ def main():
             
             if user_count != user_counts[-1]:
                 try:
-                    k8s_ctrl.apply_chaos_experiment(chaos_yaml_path)
+                    await asyncio.to_thread(k8s_ctrl.apply_chaos_experiment, chaos_yaml_path)
                     print(f"Reapplied chaos experiment for next user count {user_counts[user_counts.index(user_count) + 1]}.")
                 except Exception as e:
                     print(f"Error reapplying chaos experiment for next user count: {e}")
@@ -374,46 +534,56 @@ def main():
         # cleanup schedule at the end of all user counts
         if is_shell_script:
             print(f"Shell script experiment: {exp_label}, performing node recovery at the end of experiment...")
-            recover_worker_nodes(ssh_master)
+            await asyncio.to_thread(recover_worker_nodes, ssh_master)
         elif schedule_name:
             try:
-                k8s_ctrl.delete_chaos_experiment(schedule_name)
+                await asyncio.to_thread(k8s_ctrl.delete_chaos_experiment, schedule_name)
             except Exception as e:
                 print(f"Error deleting schedule '{schedule_name}': {e}")
 
         if not skip_checks:
             print(f"\n=== RESTARTING DEPLOYMENTS AFTER EXPERIMENT '{exp_label}' ===")
-            checker.restart_deployments(app_namespace=app_namespace)
+            await asyncio.to_thread(checker.restart_deployments, app_namespace=app_namespace)
             
         # wait for recovery between experiments
         if isinstance(recovery_wait, (int, float)) and recovery_wait > 0:
             print(f"Waiting {recovery_wait}s for system recovery between experiments...")
-            time.sleep(recovery_wait)
+            await recovery_sleep(recovery_wait, 'experiment_recovery_wait')
 
             # Run health check after recovery if configured to do so
             if check_options.get('check_after_recovery', True) and not skip_checks:
                 print(f"\n=== HEALTH CHECK AFTER EXPERIMENT '{exp_label}' ===")
-                checks_passed = checker.perform_all_checks(app_namespace=app_namespace)
+                checks_passed = await checker.perform_all_checks_async(app_namespace=app_namespace)
                 
                 # If not healthy and wait_for_ready is enabled, wait for recovery
                 if not checks_passed and wait_for_ready:
                     print(f"Post-experiment health checks for '{exp_label}' failed. Waiting for cluster to recover...")
-                    checker.wait_for_healthy_cluster(
+                    await checker.wait_for_healthy_cluster_async(
                         app_namespace=app_namespace,
                         max_wait_attempts=max_wait_attempts,
                         retry_interval=retry_interval
                     )
 
-    # Clean up client files to free disk space
-    try:
-        print("\nCleaning up logs on client node to prevent disk space issues...")
-        cleanup_cmd = "rm -f /home/ubuntu/*.csv /home/ubuntu/*.log /home/ubuntu/console_output.log"
-        ssh_client.run_command(cleanup_cmd)
-    except Exception as e:
-        print(f"Warning: Failed to clean up client logs: {e}")
+    async def cleanup_client():
+        # Finish the queued runs before the client logs are removed
+        if pipeline:
+            await asyncio.to_thread(pipeline.close)
+
+        # Clean up client files to free disk space
+        try:
+            print("\nCleaning up logs on client node to prevent disk space issues...")
+            cleanup_cmd = "rm -f /home/ubuntu/*.csv /home/ubuntu/*.log /home/ubuntu/console_output.log"
+            await ssh_client.run_command_async(cleanup_cmd, idempotent=True)
+        except Exception as e:
+            print(f"Warning: Failed to clean up client logs: {e}")
+
+    async def final_recovery():
+        print("\n=== FINAL SYSTEM RECOVERY ===")
+        await asyncio.to_thread(recover_worker_nodes, ssh_master)
 
-    print("\n=== FINAL SYSTEM RECOVERY ===")
-    recover_worker_nodes(ssh_master)
+    # The client and master nodes are cleaned up concurrently
+    set_tags(experiment=None, user_count=None, timeout=None)
+    await asyncio.gather(cleanup_client(), final_recovery())
 
     # close SSH
     ssh_master.close()
@@ -421,4 +591,8 @@ def main():
     print("All experiments completed.")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    try:
+        asyncio.run(main())
+    finally:
+        # Also after an early return, sys.exit or an error, so that failed campaigns get their summary
+        stop_trace()
\ No newline at end of file
@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+import io
+import os
+import sys
+import time
+import argparse
+import fnmatch
+import contextlib
+import traceback
+import yaml
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from csv_processor import CSVProcessor
+from columnar_log import columnar_path_for
+from artifact_io import resolve_artifact
+from result_tree import iter_result_dirs, parse_result_dir, experiment_node_counts, experiment_schedule_names, \
+    run_schedule_name
+from campaign_catalog import CampaignCatalog, CATALOG_NAME
+from summary_manifest import SummaryManifest, summary_params
+
+
+def _input_bytes(result_dir):
+    """Size of the raw inputs a summary is built from, used for throughput reporting."""
+    total = 0
+    for name in ("locust_log.csv", columnar_path_for("locust_log.csv"), "console_output.log"):
+        path = resolve_artifact(os.path.join(result_dir, name))
+        if os.path.exists(path):
+            total += os.path.getsize(path)
+    return total
+
+
+def process_one(result_dir, schedule_name, master_count, worker_count, quiet=True, use_hashes=False,
+                processor_options=None):
+    """Summarise one result directory exactly like the serial path in main.py and record its manifest.
+
+    Returns (result_dir, summary_path, input_bytes, elapsed_seconds, captured_output).
+    """
+    start = time.time()
+    output = io.StringIO()
+    summary_path = None
+    redirect = contextlib.redirect_stdout(output) if quiet else contextlib.nullcontext()
+    with redirect:
+        try:
+            summary_path = CSVProcessor(**(processor_options or {})).process_result_directory(
+                result_dir,
+                schedule_name=schedule_name,
+                master_count=master_count,
+                worker_count=worker_count
+            )
+            if summary_path:
+                SummaryManifest(result_dir, use_hashes=use_hashes).save(
+                    summary_path, summary_params(schedule_name, master_count, worker_count, processor_options))
+        except Exception:
+            traceback.print_exc(file=output if quiet else sys.stdout)
+    return result_dir, summary_path, _input_bytes(result_dir), time.time() - start, output.getvalue()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Re-generate summary CSVs for every run under a results tree')
+    parser.add_argument('result_base', type=str, nargs='?',
+                        help='Results base directory (default: result_base from the config file)')
+    parser.add_argument('--config', type=str, default='config.yaml',
+                        help='Configuration file used for node counts and result_base (default: config.yaml)')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                        help='Number of worker processes (default: CPU count, 1 = serial)')
+    parser.add_argument('--experiment', type=str, default='*',
+                        help='Only process experiments whose folder name matches this glob pattern')
+    parser.add_argument('--master-count', type=int, default=1,
+                        help='Master node count for experiments not found in the config (default: 1)')
+    parser.add_argument('--worker-count', type=int, default=3,
+                        help='Worker node count for experiments not found in the config (default: 3)')
+    parser.add_argument('--force', action='store_true',
+                        help='Re-process directories even if their summary manifest is up to date')
+    parser.add_argument('--hash', action='store_true',
+                        help='Compare inputs by content hash instead of only size and mtime')
+    parser.add_argument('--verbose', action='store_true',
+                        help='Print the full processor output of every directory')
+    args = parser.parse_args()
+
+    config = {}
+    config_path = args.config
+    if not os.path.isfile(config_path):
+        config_path = os.path.join(os.path.dirname(__file__), args.config)
+    if os.path.isfile(config_path):
+        with open(config_path, 'r') as f:
+            config = yaml.safe_load(f) or {}
+
+    result_base = args.result_base or (config.get('result_base') or 'results').strip()
+    result_base = os.path.normpath(result_base)
+    if not os.path.isdir(result_base):
+        print(f"Error: Results directory not found at {result_base}")
+        sys.exit(1)
+
+    node_counts = experiment_node_counts(config)
+    schedule_names = experiment_schedule_names(config)
+    processor_options = dict(config.get('summary', {}) or {})
+    processor_options.setdefault('app_namespace', config.get('app_namespace', 'image-detection'))
+    if args.workers > 1:
+        # Directories are already processed in parallel, don't split single files across cores as well
+        processor_options['scan_workers'] = 1
+    # Runs summarised here are re-indexed in the campaign catalog just like runs of a campaign
+    catalog_path = None
+    if (config.get('storage', {}) or {}).get('catalog', False):
+        catalog_path = os.path.join(result_base, CATALOG_NAME)
+
+    jobs = []
+    skipped = 0
+    for result_dir in iter_result_dirs(result_base):
+        info = parse_result_dir(result_dir)
+        if not info or not fnmatch.fnmatch(info['experiment_name'], args.experiment):
+            continue
+        # Same schedule name as the campaign used, so headers and manifest fingerprints match
+        schedule_name = run_schedule_name(result_dir, info['experiment_name'], schedule_names)
+        master_count, worker_count = node_counts.get(info['experiment_name'], (args.master_count, args.worker_count))
+        manifest = SummaryManifest(result_dir, use_hashes=args.hash)
+        if not args.force and manifest.is_current(
+                summary_params(schedule_name, master_count, worker_count, processor_options)):
+            skipped += 1
+            continue
+        jobs.append((result_dir, schedule_name, master_count, worker_count))
+
+    total = len(jobs)
+    print(f"Found {total + skipped} result directories under {result_base} ({skipped} up to date), "
+          f"processing {total} with {args.workers} worker(s)...")
+    if not total:
+        return
+
+    start = time.time()
+    done = 0
+    failed = []
+    processed_bytes = 0
+    catalog = CampaignCatalog(catalog_path) if catalog_path else None
+
+    def report(result):
+        nonlocal done, processed_bytes
+        result_dir, summary_path, input_bytes, elapsed, output = result
+        done += 1
+        processed_bytes += input_bytes
+        if not summary_path:
+            failed.append(result_dir)
+            if output and not args.verbose:
+                print(output)
+        elif catalog:
+            try:
+                catalog.upsert_run(result_dir, summary_path=summary_path)
+            except Exception as e:
+                print(f"Failed to update the campaign catalog for {result_dir}: {e}")
+        wall = max(time.time() - start, 1e-9)
+        status = "OK" if summary_path else "FAILED"
+        print(f"[{done}/{total}] {status} {result_dir} ({elapsed:.2f}s) | "
+              f"{done / wall:.2f} dirs/s, {processed_bytes / wall / 1e6:.2f} MB/s")
+
+    try:
+        if args.workers <= 1:
+            for job in jobs:
+                report(process_one(*job, quiet=not args.verbose, use_hashes=args.hash,
+                                   processor_options=processor_options))
+        else:
+            with ProcessPoolExecutor(max_workers=args.workers) as executor:
+                futures = [executor.submit(process_one, *job, quiet=not args.verbose, use_hashes=args.hash,
+                                           processor_options=processor_options) for job in jobs]
+                for future in as_completed(futures):
+                    report(future.result())
+    finally:
+        if catalog:
+            catalog.close()
+
+    wall = time.time() - start
+    print(f"\nProcessed {done} directories ({processed_bytes / 1e6:.1f} MB) in {wall:.1f}s: "
+          f"{done / max(wall, 1e-9):.2f} dirs/s, {processed_bytes / max(wall, 1e-9) / 1e6:.2f} MB/s")
+    if failed:
+        print(f"{len(failed)} directories failed:")
+        for result_dir in failed:
+            print(f"  - {result_dir}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,218 @@
+from collections import Counter
+from itertools import compress
+from latency_histogram import LatencyHistogram
+from cardinality import make_user_counter
+from columnar_log import TIMESTAMP_HEADERS, parse_timestamp
+from error_classifier import ErrorTable, default_classifier
+
+
+def resolve_columns(headers):
+    """Map the metric fields used by the summary to their column index in a Locust CSV header."""
+    columns = {
+        'response_time': None,
+        'status': None,
+        'error': None,
+        'error_status': None,
+        'user_id': None,
+        'timestamp': None
+    }
+
+    # Exact header names, same precedence as the DictReader based lookups used before
+    if 'Response Time (ms)' in headers:
+        columns['response_time'] = headers.index('Response Time (ms)')
+    elif 'Response Time' in headers:
+        columns['response_time'] = headers.index('Response Time')
+
+    if 'Status' in headers:
+        columns['status'] = headers.index('Status')
+    elif 'status' in headers:
+        columns['status'] = headers.index('status')
+
+    # Case-insensitive lookups used by the error and user scans
+    for idx, header in enumerate(headers):
+        name = header.lower()
+        if name in ('error type', 'error'):
+            columns['error'] = idx
+        elif name == 'status':
+            columns['error_status'] = idx
+        if columns['user_id'] is None and name in ('user id', 'user_id', 'userid'):
+            columns['user_id'] = idx
+        if columns['timestamp'] is None and name.strip() in TIMESTAMP_HEADERS:
+            columns['timestamp'] = idx
+
+    return columns
+
+
+class RequestLogStats:
+    """Accumulates every request-level summary metric from a Locust CSV in a single pass."""
+
+    def __init__(self, user_count_mode='exact', user_count_error=0.01, classifier=None):
+        self.total_requests = 0
+        self.total_success = 0
+        self.sum_all_rt = 0.0
+        self.sum_success_rt = 0.0
+        # Error classes with their counts and first/last occurrence timestamps
+        self.errors = ErrorTable()
+        self.classifier = classifier or default_classifier()
+        self.user_counter = make_user_counter(user_count_mode, user_count_error)
+        self.has_user_column = False
+        self.histogram = LatencyHistogram()
+        self.status_histograms = {}
+
+    def record_latency(self, rt, status):
+        """Add a response time to the overall and the per-status histogram."""
+        self.histogram.record(rt)
+        status = status or 'unknown'
+        histogram = self.status_histograms.get(status)
+        if histogram is None:
+            histogram = self.status_histograms[status] = LatencyHistogram()
+        histogram.record(rt)
+
+    def consume(self, rows, columns):
+        """Update the counters from an iterable of parsed CSV rows (header already removed)."""
+        rt_idx = columns['response_time']
+        status_idx = columns['status']
+        error_idx = columns['error']
+        error_status_idx = columns['error_status']
+        user_idx = columns['user_id']
+        ts_idx = columns['timestamp']
+        classify_errors = error_idx is not None and error_status_idx is not None
+        self.has_user_column = self.has_user_column or user_idx is not None
+
+        add_error = self.errors.add
+        classify = self.classifier.classify
+        add_user = self.user_counter.add
+
+        for row in rows:
+            if not row:
+                # Blank lines are not records (csv.DictReader skips them as well)
+                continue
+            row_len = len(row)
+            self.total_requests += 1
+
+            if rt_idx is not None and row_len > rt_idx and row[rt_idx]:
+                try:
+                    rt = float(row[rt_idx])
+                    self.sum_all_rt += rt
+                    status = row[status_idx].strip().lower() if status_idx is not None and row_len > status_idx else ''
+                    if status == 'success':
+                        self.total_success += 1
+                        self.sum_success_rt += rt
+                    self.record_latency(rt, status)
+                except (ValueError, TypeError):
+                    print(f"Warning: Could not convert response time value: {row[rt_idx]}")
+
+            if classify_errors and row_len > error_idx and row_len > error_status_idx:
+                if row[error_status_idx].strip().lower() in ('error', 'failure', 'fail'):
+                    error_text = row[error_idx].strip()
+                    if error_text:
+                        timestamp = parse_timestamp(row[ts_idx]) if ts_idx is not None and row_len > ts_idx else None
+                        add_error(classify(error_text), 1, timestamp)
+
+            if user_idx is not None and row_len > user_idx:
+                user_id = row[user_idx].strip()
+                if user_id:
+                    add_user(user_id)
+
+        return self
+
+    def consume_columnar(self, log):
+        """Update the counters from a ColumnarLog without parsing any text."""
+        headers = log.columns
+        columns = resolve_columns(headers)
+        rt_idx = columns['response_time']
+        status_idx = columns['status']
+        error_idx = columns['error']
+        error_status_idx = columns['error_status']
+        user_idx = columns['user_id']
+        self.has_user_column = self.has_user_column or user_idx is not None
+        self.total_requests += log.rows
+
+        if rt_idx is not None:
+            rt_values = log.column(headers[rt_idx])
+            # NaN marks a missing or unparseable response time
+            self.sum_all_rt += sum(rt for rt in rt_values if rt == rt)
+            if status_idx is not None:
+                statuses = [value.strip().lower() for value in log.dictionary(headers[status_idx])]
+                status_codes = log.column(headers[status_idx])
+                success = [status == 'success' for status in statuses]
+                success_rts = [rt for rt in compress(rt_values, map(success.__getitem__, status_codes)) if rt == rt]
+                self.total_success += len(success_rts)
+                self.sum_success_rt += sum(success_rts)
+                for rt, code in zip(rt_values, status_codes):
+                    if rt == rt:
+                        self.record_latency(rt, statuses[code])
+            else:
+                for rt in rt_values:
+                    if rt == rt:
+                        self.record_latency(rt, '')
+
+        if error_idx is not None and error_status_idx is not None:
+            failing = [value.strip().lower() in ('error', 'failure', 'fail')
+                       for value in log.dictionary(headers[error_status_idx])]
+            failed_rows = list(map(failing.__getitem__, log.column(headers[error_status_idx])))
+            error_codes = log.column(headers[error_idx])
+            error_counts = Counter(compress(error_codes, failed_rows))
+            error_texts = log.dictionary(headers[error_idx])
+            classes = {code: self.classifier.classify(error_texts[code].strip())
+                       for code in error_counts if error_texts[code].strip()}
+            for code, count in error_counts.items():
+                if code in classes:
+                    self.errors.add(classes[code], count)
+            ts_idx = columns['timestamp']
+            if ts_idx is not None:
+                # First/last occurrence per class from the timestamps of the failed rows
+                for code, timestamp in zip(compress(error_codes, failed_rows),
+                                           compress(log.column(headers[ts_idx]), failed_rows)):
+                    error_class = classes.get(code)
+                    if error_class is not None:
+                        self.errors.add(error_class, 0, timestamp)
+
+        if user_idx is not None:
+            for user_id in log.dictionary(headers[user_idx]):
+                user_id = user_id.strip()
+                if user_id:
+                    self.user_counter.add(user_id)
+
+        return self
+
+    def merge(self, other):
+        """Add the counters of another RequestLogStats (e.g. of a later part of the same log).
+
+        Error types keep their order of first occurrence if parts are merged in file order.
+        """
+        self.total_requests += other.total_requests
+        self.total_success += other.total_success
+        self.sum_all_rt += other.sum_all_rt
+        self.sum_success_rt += other.sum_success_rt
+        self.errors.merge(other.errors)
+        self.user_counter.merge(other.user_counter)
+        self.has_user_column = self.has_user_column or other.has_user_column
+        self.histogram.merge(other.histogram)
+        for status, other_histogram in other.status_histograms.items():
+            histogram = self.status_histograms.get(status)
+            if histogram is None:
+                histogram = self.status_histograms[status] = LatencyHistogram()
+            histogram.merge(other_histogram)
+        return self
+
+    @property
+    def error_types(self):
+        """Error class -> count, in order of first occurrence."""
+        return self.errors.counts
+
+    @property
+    def avg_response_time(self):
+        return (self.sum_all_rt / self.total_requests) if self.total_requests > 0 else 0.0
+
+    @property
+    def avg_success_response_time(self):
+        return (self.sum_success_rt / self.total_success) if self.total_success > 0 else 0.0
+
+    @property
+    def unique_user_count(self):
+        return self.user_counter.count()
+
+    @property
+    def error_occurrences(self):
+        return self.errors.total()
@@ -0,0 +1,210 @@
+import os
+import csv
+import json
+import math
+from array import array
+from collections import Counter
+from itertools import compress
+from operator import itemgetter, and_
+from columnar_log import TIMESTAMP_HEADERS, open_fresh_columnar, parse_timestamp
+from request_stats import resolve_columns
+from artifact_io import open_artifact
+
+TIMELINE_PERCENTILES = (50, 95, 99)
+# Upper bound on the number of windows of one timeline (11.5 days at the default 1s window); a stray
+# timestamp (e.g. epoch 0 or milliseconds) would otherwise make the window loop run for ages
+MAX_TIMELINE_WINDOWS = 1000000
+
+
+def timeline_path_for(csv_path):
+    """Return the timeline file stored next to a CSV log."""
+    file_name, _ = os.path.splitext(csv_path)
+    return file_name + "_timeline.json"
+
+
+def _timestamp_index(headers):
+    for idx, header in enumerate(headers):
+        if header.strip().lower() in TIMESTAMP_HEADERS:
+            return idx
+    return None
+
+
+def load_request_arrays(csv_path):
+    """Load (timestamps, response_times, failed) columns of a request log.
+
+    timestamps and response_times are float arrays with NaN for missing values, failed is a
+    bytes object with 1 for every request whose status is not 'success'. The column file is
+    used when it is up to date, so no text needs to be parsed.
+    """
+    columnar = open_fresh_columnar(csv_path)
+    if columnar is not None:
+        with columnar:
+            headers = columnar.columns
+            ts_idx = _timestamp_index(headers)
+            if ts_idx is None:
+                return None
+            columns = resolve_columns(headers)
+            timestamps = array('d', columnar.column(headers[ts_idx]))
+            if columns['response_time'] is not None:
+                response_times = array('d', columnar.column(headers[columns['response_time']]))
+            else:
+                response_times = array('d', [math.nan]) * columnar.rows
+            if columns['status'] is not None:
+                status_name = headers[columns['status']]
+                failing = bytes(value.strip().lower() != 'success' for value in columnar.dictionary(status_name))
+                failed = bytes(map(failing.__getitem__, columnar.column(status_name)))
+            else:
+                failed = bytes(columnar.rows)
+            return timestamps, response_times, failed
+
+    with open_artifact(csv_path, 'r', encoding='utf-8', newline='') as f:
+        reader = csv.reader(f)
+        headers = next(reader, None) or []
+        ts_idx = _timestamp_index(headers)
+        if ts_idx is None:
+            return None
+        columns = resolve_columns(headers)
+        rt_idx = columns['response_time']
+        status_idx = columns['status']
+        timestamps = array('d')
+        response_times = array('d')
+        failed = bytearray()
+        for row in reader:
+            if not row:
+                continue
+            row_len = len(row)
+            timestamps.append(parse_timestamp(row[ts_idx]) if row_len > ts_idx else math.nan)
+            rt = math.nan
+            if rt_idx is not None and row_len > rt_idx and row[rt_idx]:
+                try:
+                    rt = float(row[rt_idx])
+                except ValueError:
+                    pass
+            response_times.append(rt)
+            status = row[status_idx].strip().lower() if status_idx is not None and row_len > status_idx else ''
+            failed.append(status != 'success')
+    return timestamps, response_times, bytes(failed)
+
+
+def _percentile_of_sorted(values, start, count, percent):
+    return values[start + max(1, math.ceil(count * percent / 100.0)) - 1]
+
+
+def build_timeline(timestamps, response_times, failed, window_seconds=1.0, outage_error_rate=0.5):
+    """Aggregate per-request arrays into fixed-width windows and derive resilience metrics.
+
+    All per-request work is done with C-level bulk operations (map/compress/Counter/sort) over
+    the arrays; Python code only iterates over windows. A window is counted as an outage if its
+    error rate is at least outage_error_rate or it contains no requests at all. If the requests
+    span more than MAX_TIMELINE_WINDOWS windows, those too far from the median timestamp are
+    dropped with a warning.
+    """
+    valid = bytes(map(float.__eq__, timestamps, timestamps))
+    ts = array('d', compress(timestamps, valid))
+    if not ts:
+        return None
+    if (max(ts) - min(ts)) / window_seconds >= MAX_TIMELINE_WINDOWS:
+        median = sorted(ts)[len(ts) // 2]
+        half_span = MAX_TIMELINE_WINDOWS * window_seconds / 2
+        # NaN fails both comparisons, so this also keeps excluding missing timestamps
+        valid = bytes(map(and_, map((median - half_span).__le__, timestamps),
+                          map((median + half_span).__gt__, timestamps)))
+        ts = array('d', compress(timestamps, valid))
+        print(f"Warning: Ignoring {sum(map(float.__eq__, timestamps, timestamps)) - len(ts)} request(s) "
+              f"with timestamps more than {half_span:.0f}s away from the rest of the run")
+    rts = array('d', compress(response_times, valid))
+    fails = bytes(compress(failed, valid))
+
+    start = min(ts)
+    end = max(ts)
+    window_ids = array('l', map(int, map((1.0 / window_seconds).__mul__, map(start.__rsub__, ts))))
+    window_count = max(window_ids) + 1
+
+    requests = Counter(window_ids)
+    failures = Counter(compress(window_ids, fails))
+
+    # Exact per-window latency percentiles: sort (window, rt) pairs once, then slice by window
+    rt_valid = bytes(map(float.__eq__, rts, rts))
+    latency_pairs = sorted(zip(compress(window_ids, rt_valid), compress(rts, rt_valid)))
+    latency_counts = Counter(compress(window_ids, rt_valid))
+    sorted_rts = array('d', map(itemgetter(1), latency_pairs))
+    del latency_pairs
+
+    windows = {
+        'start': [],
+        'requests': [],
+        'failures': [],
+        'error_rate': [],
+        'throughput': [],
+        'success_throughput': []
+    }
+    for percent in TIMELINE_PERCENTILES:
+        windows[f"p{percent}"] = []
+
+    offset = 0
+    for window in range(window_count):
+        total = requests.get(window, 0)
+        failed_count = failures.get(window, 0)
+        windows['start'].append(round(window * window_seconds, 6))
+        windows['requests'].append(total)
+        windows['failures'].append(failed_count)
+        windows['error_rate'].append(round(failed_count / total, 4) if total else None)
+        windows['throughput'].append(round(total / window_seconds, 3))
+        windows['success_throughput'].append(round((total - failed_count) / window_seconds, 3))
+        latency_count = latency_counts.get(window, 0)
+        for percent in TIMELINE_PERCENTILES:
+            value = _percentile_of_sorted(sorted_rts, offset, latency_count, percent) if latency_count else None
+            windows[f"p{percent}"].append(round(value, 2) if value is not None else None)
+        offset += latency_count
+
+    outage = [rate is None or rate >= outage_error_rate for rate in windows['error_rate']]
+    episodes = []
+    run_length = 0
+    for is_down in outage + [False]:
+        if is_down:
+            run_length += 1
+        elif run_length:
+            episodes.append(run_length * window_seconds)
+            run_length = 0
+    # An outage that lasts until the end of the run never recovered
+    recovered = episodes[:-1] if outage and outage[-1] else episodes
+
+    first_failure = min(compress(ts, fails), default=None)
+    total_requests = len(ts)
+    total_failures = sum(failures.values())
+    metrics = {
+        'duration_seconds': round(end - start, 3),
+        'total_requests': total_requests,
+        'total_failures': total_failures,
+        'availability': round(1 - total_failures / total_requests, 4),
+        'time_to_first_failure_seconds': round(first_failure - start, 3) if first_failure is not None else None,
+        'outage_windows': sum(outage),
+        'outage_count': len(episodes),
+        'longest_outage_seconds': max(episodes, default=0.0),
+        'mean_recovery_time_seconds': round(sum(recovered) / len(recovered), 3) if recovered else None,
+        'unrecovered_at_end': bool(outage and outage[-1])
+    }
+
+    return {
+        'window_seconds': window_seconds,
+        'outage_error_rate': outage_error_rate,
+        'start_timestamp': start,
+        'metrics': metrics,
+        'windows': windows
+    }
+
+
+def create_timeline(csv_path, window_seconds=1.0, outage_error_rate=0.5, output_path=None):
+    """Build the resilience timeline of a run's request log and save it next to the CSV."""
+    arrays = load_request_arrays(csv_path)
+    if arrays is None:
+        print(f"Warning: No timestamp column in {csv_path}, skipping resilience timeline")
+        return None
+    timeline = build_timeline(*arrays, window_seconds=window_seconds, outage_error_rate=outage_error_rate)
+    if timeline is None:
+        print(f"Warning: No valid timestamps in {csv_path}, skipping resilience timeline")
+        return None
+    output_path = output_path or timeline_path_for(csv_path)
+    with open(output_path, 'w', encoding='utf-8') as f:
+        json.dump(timeline, f, separators=(',', ':'))
+    return output_path
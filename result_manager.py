@@ -3,13 +3,86 @@ import shutil
 import time
 import json
 from csv_processor import CSVProcessor
+from columnar_log import convert_csv, columnar_path_for, restores_csv
+from summary_manifest import SummaryManifest, summary_params
+from campaign_catalog import CampaignCatalog
+from artifact_io import artifact_exists, compress_artifact
+from instrumentation import annotate, traced
 
 class ResultManager:
     """Organizes results into folders and generates reports."""
-    def __init__(self, base_results_path):
+    def __init__(self, base_results_path, columnar_logs=False, keep_raw_csv=True, catalog_path=None,
+                 processor_options=None, compression=None, compression_level=6, compressed_transfer=False,
+                 transfer_compression_level=6):
         self.base_results_path = base_results_path
         os.makedirs(self.base_results_path, exist_ok=True)
-        self.csv_processor = CSVProcessor()
+        # Convert downloaded CSV logs into compact column files (optionally dropping the text copy)
+        self.columnar_logs = columnar_logs
+        self.keep_raw_csv = keep_raw_csv
+        # SQLite campaign catalog updated whenever a run is summarised (None disables it)
+        self.catalog_path = catalog_path
+        # Keyword options for CSVProcessor (e.g. user_count_mode, timeline_window_seconds)
+        self.processor_options = processor_options or {}
+        self.csv_processor = CSVProcessor(**self.processor_options)
+        # Compression of downloaded raw logs ('gzip', 'zstd' or None); readers decompress transparently
+        self.compression = compression
+        self.compression_level = compression_level
+        # Pull CSV logs as a gzip stream over an exec channel (checksum verified) instead of plain SFTP
+        self.compressed_transfer = compressed_transfer
+        self.transfer_compression_level = transfer_compression_level
+
+    def update_catalog(self, result_dir, summary_path=None):
+        """Upsert the run's row into the campaign catalog."""
+        if not self.catalog_path:
+            return
+        try:
+            catalog = CampaignCatalog(self.catalog_path)
+            try:
+                catalog.upsert_run(result_dir, summary_path=summary_path)
+            finally:
+                catalog.close()
+            print(f"Updated campaign catalog: {self.catalog_path}")
+        except Exception as e:
+            print(f"Failed to update campaign catalog: {e}")
+
+    def convert_csv_to_columnar(self, local_csv):
+        """Convert a downloaded CSV log into its column file; remove the CSV unless keep_raw_csv is set."""
+        if not os.path.exists(local_csv):
+            return None
+        try:
+            csv_size = os.path.getsize(local_csv)
+            cols_path = convert_csv(local_csv)
+            cols_size = os.path.getsize(cols_path)
+            print(f"Converted CSV log to columnar format: {cols_path} ({csv_size} -> {cols_size} bytes)")
+            if not self.keep_raw_csv:
+                if restores_csv(cols_path, local_csv):
+                    os.remove(local_csv)
+                    print(f"Removed raw CSV log: {local_csv}")
+                else:
+                    print(f"Keeping raw CSV log {local_csv}: the column file does not restore it exactly")
+            return cols_path
+        except Exception as e:
+            print(f"Failed to convert CSV log to columnar format: {e}")
+            cols_path = columnar_path_for(local_csv)
+            if os.path.exists(cols_path):
+                os.remove(cols_path)
+            return None
+
+    @traced('artifacts', 'compress')
+    def compress_raw_log(self, local_path):
+        """Compress a downloaded raw log in place if compression is enabled."""
+        if not self.compression or not os.path.exists(local_path):
+            return local_path
+        try:
+            raw_size = os.path.getsize(local_path)
+            compressed_path = compress_artifact(local_path, method=self.compression, level=self.compression_level)
+            annotate(method=self.compression, bytes=raw_size)
+            print(f"Compressed {local_path} -> {compressed_path} "
+                  f"({raw_size} -> {os.path.getsize(compressed_path)} bytes)")
+            return compressed_path
+        except Exception as e:
+            print(f"Failed to compress {local_path}: {e}")
+            return local_path
 
     def create_result_dir(self, experiment_dir, timeout_value, request_rate=None):
         """Create a subdirectory inside the given experiment_dir named after the timeout (e.g., "timeout_5s_20250420T123456")."""
@@ -29,110 +102,101 @@ class ResultManager:
         except Exception as e:
             print(f"Failed to copy chaos config: {e}")
 
+    def record_artifact(self, result_dir, name, record):
+        """Store the transfer record of an artifact under 'artifacts' in the run's metadata.json."""
+        meta_path = os.path.join(result_dir, "metadata.json")
+        try:
+            metadata = {}
+            if os.path.exists(meta_path):
+                with open(meta_path, 'r', encoding='utf-8') as f:
+                    metadata = json.load(f)
+            metadata.setdefault('artifacts', {})[name] = record
+            with open(meta_path, 'w', encoding='utf-8') as f:
+                json.dump(metadata, f, indent=2)
+        except Exception as e:
+            print(f"Failed to record artifact state in {meta_path}: {e}")
+
+    def download_artifact(self, ssh_manager, remote_path, local_path, compressed_transfer=False):
+        """Download one raw log completely and return its artifact record.
+
+        The checksum-verified gzip stream is tried first if compressed_transfer is set, then the
+        resumable chunked SFTP download. The record tells whether the local copy is complete.
+        """
+        # Data shipped during the run (log_shipper.py) only needs its delta, which the resumable download fetches
+        if compressed_transfer and not os.path.exists(local_path + ".part"):
+            try:
+                stats = ssh_manager.download_file_compressed(remote_path, local_path,
+                                                             level=self.transfer_compression_level)
+                return {
+                    'method': 'gzip-stream',
+                    'complete': True,
+                    'bytes': stats['raw_bytes'],
+                    'expected_bytes': stats['raw_bytes'],
+                    'wire_bytes': stats['wire_bytes'],
+                    'sha256': stats['sha256'],
+                    'seconds': stats['seconds']
+                }
+            except Exception as e:
+                print(f"Compressed transfer failed, falling back to chunked SFTP: {e}")
+        return ssh_manager.download_file_resumable(remote_path, local_path)
+
+    def partial_bytes(self, local_path):
+        """Size of the partial copy (.part) of an artifact, e.g. shipped before the client node failed."""
+        part_path = local_path + ".part"
+        return os.path.getsize(part_path) if os.path.exists(part_path) else 0
+
+    @traced('artifacts', 'download_csv_log')
     def download_csv_log(self, ssh_manager, remote_csv_path, result_dir):
         """Download the CSV log file from the remote host to the result directory."""
         local_csv = os.path.join(result_dir, "locust_log.csv")
         print(f"Attempting to download CSV from remote '{remote_csv_path}' to local '{local_csv}'...")
-        
-        check_cmd = f"[ -f {remote_csv_path} ] && stat -c %s {remote_csv_path} || echo 'Not Found'"
         try:
-            _, size_output, _ = ssh_manager.run_command(check_cmd)
-            if 'Not Found' in size_output:
-                print(f"Warning: Remote CSV file '{remote_csv_path}' does not exist")
-                return
-                
-            try:
-                # ssh_manager.download_file(remote_csv_path, local_csv, timeout=300)
-                ssh_manager.download_file(remote_csv_path, local_csv)
-                if os.path.exists(local_csv):
-                    file_size = os.path.getsize(local_csv)
-                    print(f"CSV log downloaded successfully: {local_csv} ({file_size} bytes)")
-                else:
-                    print("Warning: CSV log does not exist after download.")
-            except Exception as e:
-                print(f"Error downloading CSV log: {e}")
-                
-                print("Attempting alternative CSV download method...")
-                try:
-                    tmp_path = f"/tmp/csv_partial_{int(time.time())}.csv"
-                    head_cmd = f"head -n 1 {remote_csv_path} > {tmp_path} && tail -n 5000 {remote_csv_path} >> {tmp_path}"
-                    ssh_manager.run_command(head_cmd)
-                    ssh_manager.download_file(tmp_path, local_csv)
-                    ssh_manager.run_command(f"rm -f {tmp_path}")
-                    
-                    if os.path.exists(local_csv):
-                        print(f"Partial CSV log downloaded using alternative method: {local_csv}")
-                    else:
-                        print("Warning: Alternative CSV download method failed.")
-                except Exception as alt_e:
-                    print(f"Alternative CSV download method failed: {alt_e}")
+            record = self.download_artifact(ssh_manager, remote_csv_path, local_csv,
+                                            compressed_transfer=self.compressed_transfer)
         except Exception as e:
-            print(f"Error checking remote CSV file: {e}")
+            print(f"Error downloading CSV log: {e}")
+            record = {'complete': False, 'bytes': self.partial_bytes(local_csv), 'error': str(e)}
+        self.record_artifact(result_dir, "locust_log.csv", record)
+        annotate(method=record.get('method'), bytes=record.get('bytes'))
+        if not record['complete']:
+            annotate(outcome='incomplete')
+            print(f"Warning: CSV log is incomplete ({record['bytes']} of {record.get('expected_bytes', '?')} bytes)")
+            return
+        print(f"CSV log downloaded successfully: {local_csv} ({record['bytes']} bytes)")
+        if self.columnar_logs:
+            self.convert_csv_to_columnar(local_csv)
+        self.compress_raw_log(local_csv)
 
+    @traced('artifacts', 'download_console_log')
     def download_console_log(self, ssh_manager, remote_log_path, result_dir):
         """Download the console output log from the remote host to the result directory."""
         local_log = os.path.join(result_dir, "console_output.log")
         print(f"Attempting to download console log from remote '{remote_log_path}' to local '{local_log}'...")
-        
         try:
-            size_cmd = f"[ -f {remote_log_path} ] && stat -c %s {remote_log_path} || echo 'Not Found'"
-            _, size_output, _ = ssh_manager.run_command(size_cmd)
-            
-            if 'Not Found' in size_output:
-                print(f"Warning: Remote log file '{remote_log_path}' does not exist")
-                return
-                
-            file_size = 0
-            try:
-                file_size = int(size_output.strip())
-            except (ValueError, TypeError):
-                print(f"Could not determine file size from: {size_output}")
-                
-            if file_size > 1000000:
-                print(f"Console log is large ({file_size} bytes), downloading only head and tail portions...")
-                
-                tmp_path = f"/tmp/log_partial_{int(time.time())}.log"
-                head_tail_cmd = (
-                    f"echo '=== LOG HEAD (FIRST 50 LINES) ===\n' > {tmp_path} && "
-                    f"head -n 50 {remote_log_path} >> {tmp_path} && "
-                    f"echo '\n\n=== LOG MIDDLE OMITTED ===\n\n' >> {tmp_path} && "
-                    f"echo '=== LOG TAIL (LAST 300 LINES) ===\n' >> {tmp_path} && "
-                    f"tail -n 300 {remote_log_path} >> {tmp_path}"
-                )
-                ssh_manager.run_command(head_tail_cmd)
-                
-                ssh_manager.download_file(tmp_path, local_log)
-                ssh_manager.run_command(f"rm -f {tmp_path}")
-                
-                if os.path.exists(local_log):
-                    print(f"Partial console log downloaded: {local_log}")
-                else:
-                    print("Warning: Partial console log download failed.")
-            else:
-                ssh_manager.download_file(remote_log_path, local_log)
-                if os.path.exists(local_log):
-                    print(f"Console log downloaded successfully: {local_log}")
-                else:
-                    print("Warning: Console log does not exist after download.")
+            record = self.download_artifact(ssh_manager, remote_log_path, local_log)
         except Exception as e:
             print(f"Error downloading console log: {e}")
-            
-            print("Attempting to download only critical parts of the log...")
-            try:
-                tmp_path = f"/tmp/log_critical_{int(time.time())}.log"
-                critical_cmd = (
-                    f"echo '=== CRITICAL LOG PARTS ===\n' > {tmp_path} && "
-                    f"grep -E 'Error|Exception|WARNING|CRITICAL|run-time limit|Shutting down|Aggregated|percentiles|occurrences' "
-                    f"{remote_log_path} | tail -n 300 >> {tmp_path}"
-                )
-                ssh_manager.run_command(critical_cmd)
-                ssh_manager.download_file(tmp_path, local_log)
-                ssh_manager.run_command(f"rm -f {tmp_path}")
-                
-                if os.path.exists(local_log):
-                    print(f"Critical parts of console log downloaded: {local_log}")
-            except Exception as alt_e:
-                print(f"Alternative console log download method failed: {alt_e}")
+            record = {'complete': False, 'bytes': self.partial_bytes(local_log), 'error': str(e)}
+        self.record_artifact(result_dir, "console_output.log", record)
+        annotate(method=record.get('method'), bytes=record.get('bytes'))
+        if not record['complete']:
+            annotate(outcome='incomplete')
+            print(f"Warning: Console log is incomplete ({record['bytes']} of {record.get('expected_bytes', '?')} bytes)")
+            return
+        print(f"Console log downloaded successfully: {local_log} ({record['bytes']} bytes)")
+        self.compress_raw_log(local_log)
+
+    def load_artifacts(self, result_dir):
+        """Return the artifact records of a run's metadata.json ({} if there are none)."""
+        meta_path = os.path.join(result_dir, "metadata.json")
+        if not os.path.exists(meta_path):
+            return {}
+        try:
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                return json.load(f).get('artifacts', {})
+        except Exception as e:
+            print(f"Failed to read artifact state from {meta_path}: {e}")
+            return {}
 
     def generate_report(self, timeout_value, locust_script_path, result_dir, metadata=None):
         """Create a Markdown report file summarizing the run with additional metadata."""
@@ -154,9 +218,20 @@ class ResultManager:
             f.write(f"- **Locust Log CSV**: locust_log.csv\n")
             f.write(f"- **Console Log**: console_output.log\n")
             
+            artifacts = self.load_artifacts(result_dir)
+            if artifacts:
+                f.write("\n## Artifacts\n")
+                for name, record in artifacts.items():
+                    state = "complete" if record.get('complete') else \
+                        f"INCOMPLETE ({record.get('bytes', 0)} of {record.get('expected_bytes', '?')} bytes)"
+                    f.write(f"- **{name}**: {state}\n")
+
             if metadata:
                 meta_path = os.path.join(result_dir, "metadata.json")
                 try:
+                    # Keep the artifact records written by the downloads
+                    if artifacts:
+                        metadata = {**metadata, 'artifacts': artifacts}
                     with open(meta_path, 'w', encoding='utf-8') as meta_file:
                         json.dump(metadata, meta_file, indent=2)
                     f.write(f"\n*all saved in [metadata.json]({os.path.basename(meta_path)})*\n")
@@ -165,13 +240,25 @@ class ResultManager:
                     
         print(f"Report generated at: {report_path}")
 
-    def create_summary_csv(self, result_dir, schedule_name=None, master_count=1, worker_count=3):
-        """Create a summary CSV file with experiment metadata and performance metrics."""
+    @traced('analysis', 'summary')
+    def create_summary_csv(self, result_dir, schedule_name=None, master_count=1, worker_count=3, force=False):
+        """Create a summary CSV file with experiment metadata and performance metrics.
+
+        The summary is skipped if the directory's manifest shows that neither its inputs, the
+        parameters nor the processor code changed since it was generated (unless force is set).
+        """
+        manifest = SummaryManifest(result_dir)
+        params = summary_params(schedule_name, master_count, worker_count, self.processor_options)
+        if not force and manifest.is_current(params):
+            summary_path = manifest.summary_path()
+            print(f"Summary CSV is up to date, skipping: {summary_path}")
+            return summary_path
+        
         original_csv_path = os.path.join(result_dir, "locust_log.csv")
         console_log_path = os.path.join(result_dir, "console_output.log")
         
-        csv_exists = os.path.exists(original_csv_path)
-        log_exists = os.path.exists(console_log_path)
+        csv_exists = self.csv_processor.request_log_exists(original_csv_path)
+        log_exists = artifact_exists(console_log_path)
         
         if not csv_exists:
             print(f"Warning: CSV file not found at {original_csv_path}")
@@ -189,6 +276,8 @@ class ResultManager:
                 )
                 if summary_path:
                     print(f"Generated summary CSV file: {summary_path}")
+                    manifest.save(summary_path, params)
+                    self.update_catalog(result_dir, summary_path)
                     return summary_path
                 else:
                     print("Warning: Failed to generate summary CSV")
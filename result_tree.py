@@ -0,0 +1,108 @@
+import os
+import re
+import json
+
+MODE_DIR_PATTERN = re.compile(r'^(rate_\d+(\.\d+)?s|concurrent_mode|piggyback_mode)$')
+TIMEOUT_DIR_PATTERN = re.compile(r'^timeout_(\d+\.?\d*)s_(\d{8}T\d{6})$')
+USERS_DIR_PATTERN = re.compile(r'^users_(\d+)$')
+
+
+def parse_result_dir(result_dir):
+    """Split a <exp>/users_N/<mode>/timeout_* result directory path into its components.
+
+    Returns None if the path does not follow the layout created by main.py.
+    """
+    result_dir = os.path.normpath(result_dir)
+    timeout_name = os.path.basename(result_dir)
+    mode_dir = os.path.dirname(result_dir)
+    users_dir = os.path.dirname(mode_dir)
+    exp_dir = os.path.dirname(users_dir)
+
+    timeout_match = TIMEOUT_DIR_PATTERN.match(timeout_name)
+    users_match = USERS_DIR_PATTERN.match(os.path.basename(users_dir))
+    mode_name = os.path.basename(mode_dir)
+    if not timeout_match or not users_match or not MODE_DIR_PATTERN.match(mode_name):
+        return None
+
+    if mode_name == "concurrent_mode":
+        request_rate = -1
+    elif mode_name == "piggyback_mode":
+        request_rate = -2
+    else:
+        request_rate = float(mode_name[len("rate_"):-1])
+
+    return {
+        'result_dir': result_dir,
+        'experiment_name': os.path.basename(exp_dir),
+        'user_count': int(users_match.group(1)),
+        'mode': mode_name,
+        'request_rate': request_rate,
+        'timeout': float(timeout_match.group(1)),
+        'timestamp': timeout_match.group(2)
+    }
+
+
+def iter_result_dirs(result_base):
+    """Yield every timeout_* result directory under result_base in a stable (sorted) order."""
+    try:
+        experiments = sorted(os.listdir(result_base))
+    except FileNotFoundError:
+        return
+    for exp_name in experiments:
+        exp_dir = os.path.join(result_base, exp_name)
+        if not os.path.isdir(exp_dir):
+            continue
+        for users_name in sorted(os.listdir(exp_dir)):
+            users_dir = os.path.join(exp_dir, users_name)
+            if not USERS_DIR_PATTERN.match(users_name) or not os.path.isdir(users_dir):
+                continue
+            for mode_name in sorted(os.listdir(users_dir)):
+                mode_dir = os.path.join(users_dir, mode_name)
+                if not MODE_DIR_PATTERN.match(mode_name) or not os.path.isdir(mode_dir):
+                    continue
+                for timeout_name in sorted(os.listdir(mode_dir)):
+                    result_dir = os.path.join(mode_dir, timeout_name)
+                    if TIMEOUT_DIR_PATTERN.match(timeout_name) and os.path.isdir(result_dir):
+                        yield result_dir
+
+
+def _experiment_labels(config):
+    """Yield (experiment label as used for the result folder, schedule name main.py summarises with, experiment)."""
+    for idx, experiment in enumerate(config.get('experiments', []) or [], start=1):
+        chaos_yaml_path = experiment.get('chaos_yaml')
+        schedule_name = experiment.get('delete_schedule')
+        if chaos_yaml_path and chaos_yaml_path.endswith('.sh'):
+            exp_label = os.path.basename(chaos_yaml_path)
+            schedule_name = exp_label
+        else:
+            exp_label = schedule_name or f"experiment_{idx}"
+        yield exp_label, schedule_name, experiment
+
+
+def experiment_node_counts(config):
+    """Map each experiment label (as used for the result folder) to its (master_count, worker_count)."""
+    return {exp_label: (experiment.get('master_count', 1), experiment.get('worker_count', 3))
+            for exp_label, _, experiment in _experiment_labels(config)}
+
+
+def experiment_schedule_names(config):
+    """Map each experiment label to the schedule_name main.py passes when it summarises a run
+    (None for experiments without delete_schedule, the script name for shell script experiments)."""
+    return {exp_label: schedule_name for exp_label, schedule_name, _ in _experiment_labels(config)}
+
+
+def run_schedule_name(result_dir, experiment_name, schedule_names=None):
+    """Return the schedule_name a run was summarised with by the campaign.
+
+    Taken from the run's metadata.json if the campaign recorded it there, else from
+    schedule_names (see experiment_schedule_names), else the experiment folder name.
+    """
+    try:
+        with open(os.path.join(result_dir, "metadata.json"), 'r', encoding='utf-8') as f:
+            metadata = json.load(f)
+        if 'schedule_name' in metadata:
+            return metadata['schedule_name']
+    except (OSError, ValueError):
+        pass
+    schedule_names = schedule_names or {}
+    return schedule_names[experiment_name] if experiment_name in schedule_names else experiment_name
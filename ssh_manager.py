@@ -1,19 +1,176 @@
 import paramiko
 import os
+import asyncio
+import time
+import zlib
+import random
+import json
+import codecs
+import select
+import shlex
+import hashlib
 import posixpath
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from instrumentation import annotate, bind_context, span, traced
+
+# Read size for streamed command output
+STREAM_CHUNK_SIZE = 256 * 1024
+# Resumable downloads: bytes per offset-addressed chunk and chunks requested at once
+RESUMABLE_CHUNK_SIZE = 1024 * 1024
+RESUMABLE_MAX_IN_FLIGHT = 8
+RESUMABLE_MAX_RECONNECTS = 3
+# Command output kept per stream by stream_command (older lines are dropped beyond this)
+MAX_OUTPUT_BYTES = 16 * 1024 * 1024
+# A line without newline is passed on once it grows this long
+MAX_LINE_BYTES = 1024 * 1024
+# Wait for new channel data (seconds)
+POLL_INTERVAL = 0.05
+# Exec channels run_commands keeps open at once (sshd allows 10 sessions per connection by default)
+MAX_CONCURRENT_COMMANDS = 8
+# Reconnects after a dead transport: attempts, and the capped exponential backoff (seconds)
+RECONNECT_ATTEMPTS = 5
+RECONNECT_BACKOFF_BASE = 1.0
+RECONNECT_BACKOFF_CAP = 60.0
+
+
+def _file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(STREAM_CHUNK_SIZE), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class CommandStream:
+    """Iterator over the output lines of a running remote command, as (stream, line) pairs.
+
+    stream is 'stdout' or 'stderr'; lines keep their line ending. Both streams are drained as
+    data arrives, so neither can fill the channel window and stall the command. exit_status and
+    seconds are set once the iteration has finished; exceeding the deadline closes the channel
+    and raises.
+    """
+
+    def __init__(self, channel, command, timeout=None):
+        self.channel = channel
+        self.command = command
+        self.timeout = timeout
+        self.exit_status = None
+        self.seconds = None
+        self._lines = self._iter_lines()
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        return next(self._lines)
+
+    def close(self):
+        self.channel.close()
+
+    def _iter_lines(self):
+        start = time.monotonic()
+        deadline = start + self.timeout if self.timeout else None
+        channel = self.channel
+        streams = {
+            'stdout': (channel.recv_ready, channel.recv, codecs.getincrementaldecoder('utf-8')(errors='ignore')),
+            'stderr': (channel.recv_stderr_ready, channel.recv_stderr,
+                       codecs.getincrementaldecoder('utf-8')(errors='ignore'))
+        }
+        partial = {'stdout': "", 'stderr': ""}
+        try:
+            while True:
+                # Checked on every pass, also while output keeps arriving (e.g. periodic stats)
+                if deadline is not None and time.monotonic() > deadline:
+                    channel.close()
+                    raise Exception(f"Command timed out after {self.timeout}s")
+                received = False
+                for name, (ready, recv, decoder) in streams.items():
+                    if not ready():
+                        continue
+                    data = recv(STREAM_CHUNK_SIZE)
+                    if not data:
+                        continue
+                    received = True
+                    text = partial[name] + decoder.decode(data)
+                    lines = text.split('\n')
+                    partial[name] = lines.pop()
+                    for line in lines:
+                        yield name, line + '\n'
+                    if len(partial[name]) > MAX_LINE_BYTES:
+                        yield name, partial[name]
+                        partial[name] = ""
+                if received:
+                    continue
+                if channel.exit_status_ready() and not channel.recv_ready() and not channel.recv_stderr_ready():
+                    break
+                # Stdout data wakes the select early; stderr is picked up on the next poll
+                select.select([channel], [], [], POLL_INTERVAL)
+            for name, (_, _, decoder) in streams.items():
+                rest = partial[name] + decoder.decode(b"", final=True)
+                if rest:
+                    yield name, rest
+            self.exit_status = channel.recv_exit_status()
+            transport = channel.get_transport()
+            if self.exit_status == -1 and (transport is None or not transport.is_active()):
+                # Paramiko closes the channel without an exit status when the transport dies
+                raise Exception("SSH connection was lost while the command was running")
+        finally:
+            self.seconds = time.monotonic() - start
+            channel.close()
+
 
 class SSHManager:
     """Manages an SSH connection to a remote host using Paramiko."""
-    def __init__(self, host, user, key_path):
+    def __init__(self, host, user, key_path, reconnect_attempts=RECONNECT_ATTEMPTS,
+                 backoff_base=RECONNECT_BACKOFF_BASE, backoff_cap=RECONNECT_BACKOFF_CAP):
         self.host = host
         self.user = user
         self.key_path = key_path
         self.client = None
+        # Dead transports are replaced by ensure_connected(), see there. Lock order: _connect_lock
+        # before _sftp_lock; code holding _sftp_lock must not (re)connect
+        self.reconnect_attempts = reconnect_attempts
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self._connect_lock = threading.RLock()
+        self.health = {
+            'dead_transports': 0,
+            'reconnects': 0,
+            'failed_reconnect_attempts': 0,
+            'reconnect_seconds': 0.0,
+            'replayed_commands': 0,
+            'last_reconnect': None
+        }
+        # One SFTP session per connection, opened on first use and shared by all transfers. paramiko
+        # multiplexes concurrent requests on it, _sftp_lock only guards opening/replacing it
+        self._sftp = None
+        self._sftp_lock = threading.RLock()
+        self.sftp_stats = {
+            'sessions_opened': 0,
+            'sessions_reused': 0,
+            'sessions_reopened': 0,
+            'open_seconds': 0.0,
+            'transfers': 0,
+            'transfer_seconds': 0.0
+        }
 
+    @traced('ssh', 'connect')
     def connect(self):
         """Establish an SSH connection."""
         print(f"Connecting to {self.host} as {self.user}...")
+        annotate(host=self.host)
         try:
+            # Without _sftp_lock (see the lock order in __init__): a transfer using the old session
+            # fails and _sftp_call retries it on a new one
+            self._drop_sftp()
+            if self.client:
+                # Replacing a dead connection: release its socket and transport thread
+                try:
+                    self.client.close()
+                except Exception:
+                    pass
             self.client = paramiko.SSHClient()
             self.client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
             transport_options = {
@@ -37,18 +194,166 @@ class SSHManager:
             print(error_msg)
             raise Exception(error_msg)
 
-    def run_command(self, command):
+    def is_alive(self, probe=False):
+        """Whether the transport is up; probe also sends an SSH ignore message to detect a dead link."""
+        transport = self.client.get_transport() if self.client else None
+        if transport is None or not transport.is_active():
+            return False
+        if probe:
+            try:
+                transport.send_ignore()
+            except Exception:
+                return False
+        return True
+
+    def ensure_connected(self, probe=False):
+        """Reconnect if the transport died, with capped exponential backoff and full jitter.
+
+        Raises if the manager was never connected or has been closed, and if all reconnect
+        attempts fail.
         """
-        Execute a command on the remote host and return (exit_status, stdout, stderr).
+        if not self.client:
+            raise Exception("SSH client is not connected.")
+        if self.is_alive(probe=probe):
+            return
+        with self._connect_lock:
+            # Another thread may have reconnected in the meantime
+            if self.is_alive():
+                return
+            self._reconnect()
+
+    @traced('ssh', 'reconnect')
+    def _reconnect(self):
+        annotate(host=self.host)
+        self.health['dead_transports'] += 1
+        print(f"SSH transport to {self.host} is dead, reconnecting...")
+        start = time.time()
+        for attempt in range(1, self.reconnect_attempts + 1):
+            annotate(retries=attempt - 1)
+            try:
+                self.connect()
+                self.health['reconnects'] += 1
+                self.health['last_reconnect'] = time.strftime("%Y-%m-%dT%H:%M:%S")
+                self.health['reconnect_seconds'] += time.time() - start
+                print(f"Reconnected to {self.host} after {attempt} attempt(s) in {time.time() - start:.1f}s")
+                return
+            except Exception as e:
+                self.health['failed_reconnect_attempts'] += 1
+                if attempt == self.reconnect_attempts:
+                    self.health['reconnect_seconds'] += time.time() - start
+                    raise Exception(f"Could not reconnect to {self.host} after {attempt} attempts: {e}")
+                delay = random.uniform(0, min(self.backoff_cap, self.backoff_base * 2 ** (attempt - 1)))
+                print(f"Reconnect attempt {attempt}/{self.reconnect_attempts} to {self.host} failed, "
+                      f"retrying in {delay:.1f}s")
+                time.sleep(delay)
+
+    def connection_health_summary(self):
+        health = self.health
+        return (f"SSH {self.host}: {health['dead_transports']} dead transport(s), {health['reconnects']} reconnect(s) "
+                f"in {health['reconnect_seconds']:.1f}s ({health['failed_reconnect_attempts']} failed attempt(s)), "
+                f"{health['replayed_commands']} replayed command(s)")
+
+    def _sftp_usable(self, sftp):
+        """Cheap local health check of an SFTP session (no round trip)."""
+        channel = sftp.get_channel()
+        transport = self.client.get_transport() if self.client else None
+        return channel is not None and not channel.closed and transport is not None and transport.is_active()
+
+    def _drop_sftp(self):
+        sftp, self._sftp = self._sftp, None
+        if sftp is not None:
+            try:
+                sftp.close()
+            except Exception:
+                pass
+
+    def _close_sftp(self):
+        with self._sftp_lock:
+            self._drop_sftp()
+
+    def _get_sftp(self):
+        """Return the connection's SFTP session, opening it lazily or reopening it if its channel died.
+
+        The caller has called ensure_connected() before, this must not reconnect (see __init__).
         """
-        print(f"Executing command on {self.host}: {command}")
-        try:
+        with self._sftp_lock:
+            if self._sftp is not None:
+                if self._sftp_usable(self._sftp):
+                    self.sftp_stats['sessions_reused'] += 1
+                    return self._sftp
+                print(f"SFTP session to {self.host} is no longer usable, reopening")
+                self._drop_sftp()
+                self.sftp_stats['sessions_reopened'] += 1
             if not self.client:
                 raise Exception("SSH client is not connected.")
-            stdin, stdout, stderr = self.client.exec_command(command)
-            exit_status = stdout.channel.recv_exit_status()
-            out = stdout.read().decode('utf-8', errors='ignore')
-            err = stderr.read().decode('utf-8', errors='ignore')
+            start = time.time()
+            self._sftp = self.client.open_sftp()
+            self.sftp_stats['open_seconds'] += time.time() - start
+            self.sftp_stats['sessions_opened'] += 1
+            return self._sftp
+
+    def _sftp_call(self, operation):
+        """Run operation(sftp) on the shared session; retried once on a fresh session if the channel broke.
+
+        The operation runs without _sftp_lock, so concurrent transfers share the session instead of
+        queueing behind each other.
+        """
+        for attempt in (1, 2):
+            # Reconnecting takes _connect_lock, so it happens before _sftp_lock (see __init__)
+            self.ensure_connected()
+            sftp = self._get_sftp()
+            start = time.time()
+            try:
+                return operation(sftp)
+            except Exception:
+                if attempt == 2 or self._sftp_usable(sftp):
+                    # Errors on a healthy session (e.g. missing file) are not retried
+                    raise
+                print(f"SFTP channel to {self.host} failed, retrying on a new session")
+                with self._sftp_lock:
+                    # Another thread may already have replaced the broken session
+                    if self._sftp is sftp:
+                        self._drop_sftp()
+                        self.sftp_stats['sessions_reopened'] += 1
+            finally:
+                with self._sftp_lock:
+                    self.sftp_stats['transfers'] += 1
+                    self.sftp_stats['transfer_seconds'] += time.time() - start
+
+    def sftp_timing_summary(self):
+        stats = self.sftp_stats
+        return (f"SFTP {self.host}: {stats['sessions_opened']} session(s) opened in {stats['open_seconds']:.2f}s, "
+                f"{stats['sessions_reused']} reuse(s), {stats['sessions_reopened']} reopen(s), "
+                f"{stats['transfers']} operation(s) in {stats['transfer_seconds']:.2f}s")
+
+    def iter_command(self, command, timeout=None, verbose=True):
+        """Start a command and return a CommandStream over its (stream, line) output pairs."""
+        if verbose:
+            print(f"Executing command on {self.host}: {command}")
+        self.ensure_connected()
+        channel = self.client.get_transport().open_session()
+        channel.exec_command(command)
+        return CommandStream(channel, command, timeout=timeout)
+
+    @traced('ssh', 'command')
+    def stream_command(self, command, on_stdout=None, on_stderr=None, timeout=None,
+                       max_output_bytes=MAX_OUTPUT_BYTES, idempotent=False):
+        """
+        Execute a command, passing each output line (without line ending) to on_stdout / on_stderr
+        as it arrives, and return (exit_status, stdout, stderr).
+
+        The returned output keeps at most the last max_output_bytes characters of each stream.
+        Raises if the command does not finish within timeout seconds. If the connection dies
+        while the command runs, it is reconnected and, only if idempotent is set, the command is
+        run once more (callbacks then see the replayed output again).
+        """
+        annotate(host=self.host, command=command)
+        try:
+            exit_status, out, err = self._run_with_replay(
+                command, idempotent,
+                lambda: self._collect(self.iter_command(command, timeout=timeout),
+                                      on_stdout, on_stderr, max_output_bytes))
+            annotate(exit_status=exit_status)
             print(f"Command executed with exit status {exit_status}")
             return exit_status, out, err
         except Exception as e:
@@ -56,10 +361,415 @@ class SSHManager:
             print(error_msg)
             raise Exception(error_msg)
 
+    def _run_with_replay(self, command, idempotent, run):
+        try:
+            return run()
+        except Exception:
+            if self.is_alive():
+                raise
+            # Reconnect in any case so that the next operation finds a working connection
+            self.ensure_connected()
+            if not idempotent:
+                raise
+            print(f"Connection to {self.host} was lost during '{command}', running it again")
+            self.health['replayed_commands'] += 1
+            annotate(retries=1)
+            return run()
+
+    def _collect(self, stream, on_stdout=None, on_stderr=None, max_output_bytes=MAX_OUTPUT_BYTES):
+        callbacks = {'stdout': on_stdout, 'stderr': on_stderr}
+        kept = {'stdout': deque(), 'stderr': deque()}
+        kept_size = {'stdout': 0, 'stderr': 0}
+        dropped = {'stdout': 0, 'stderr': 0}
+        for name, line in stream:
+            if callbacks[name]:
+                callbacks[name](line.rstrip('\n'))
+            kept[name].append(line)
+            kept_size[name] += len(line)
+            while kept_size[name] > max_output_bytes and len(kept[name]) > 1:
+                kept_size[name] -= len(kept[name].popleft())
+                dropped[name] += 1
+        for name, count in dropped.items():
+            if count:
+                print(f"Warning: dropped the first {count} {name} lines of '{stream.command}' (output limit)")
+        return stream.exit_status, "".join(kept['stdout']), "".join(kept['stderr'])
+
+    def run_command(self, command, timeout=None, idempotent=False):
+        """
+        Execute a command on the remote host and return (exit_status, stdout, stderr).
+
+        Set idempotent for commands that are safe to run twice (queries, rm -f, ...) so that they
+        are replayed after a reconnect.
+        """
+        return self.stream_command(command, timeout=timeout, idempotent=idempotent)
+
+    def run_commands(self, commands, timeout=None, max_concurrency=MAX_CONCURRENT_COMMANDS, idempotent=False):
+        """
+        Execute independent commands at once, each on its own exec channel of the one transport.
+
+        Returns a list of (exit_status, stdout, stderr, seconds) in the order of commands. A
+        command that could not run (or hit its timeout) gets exit_status None and the error
+        message as stderr; the other results are unaffected.
+        """
+        commands = list(commands)
+        if not commands:
+            return []
+        print(f"Executing {len(commands)} commands concurrently on {self.host}:")
+        for command in commands:
+            print(f"  {command}")
+
+        def run(command):
+            start = time.monotonic()
+            with span('ssh', 'command', host=self.host, command=command, batch=len(commands)) as trace:
+                try:
+                    exit_status, out, err = self._run_with_replay(
+                        command, idempotent,
+                        lambda: self._collect(self.iter_command(command, timeout=timeout, verbose=False)))
+                except Exception as e:
+                    exit_status, out, err = None, "", f"Failed to run command '{command}' on {self.host}: {e}"
+                    trace['outcome'] = 'error'
+                trace['exit_status'] = exit_status
+            return exit_status, out, err, time.monotonic() - start
+
+        start = time.monotonic()
+        with ThreadPoolExecutor(max_workers=max(1, min(max_concurrency, len(commands)))) as executor:
+            # Each command runs in a copy of the caller's context, so its span keeps the caller's tags
+            futures = [executor.submit(bind_context(run), command) for command in commands]
+            results = [future.result() for future in futures]
+        for command, (exit_status, _, _, seconds) in zip(commands, results):
+            print(f"  exit status {exit_status} in {seconds:.2f}s: {command}")
+        print(f"Executed {len(commands)} commands in {time.monotonic() - start:.2f}s")
+        return results
+
+    @traced('ssh', 'command')
+    async def run_command_async(self, command, timeout=None, idempotent=False):
+        """
+        Coroutine version of run_command; the command runs in a worker thread.
+
+        Cancelling the awaiting task closes the command's channel, which ends the remote
+        command and frees the thread.
+        """
+        annotate(host=self.host, command=command)
+        streams = []
+
+        def run():
+            stream = self.iter_command(command, timeout=timeout)
+            streams.append(stream)
+            return self._collect(stream)
+
+        try:
+            exit_status, out, err = await asyncio.to_thread(self._run_with_replay, command, idempotent, run)
+        except asyncio.CancelledError:
+            for stream in streams:
+                stream.close()
+            print(f"Cancelled command on {self.host}: {command}")
+            raise
+        except Exception as e:
+            error_msg = f"Failed to run command '{command}' on {self.host}: {e}"
+            print(error_msg)
+            raise Exception(error_msg)
+        annotate(exit_status=exit_status)
+        print(f"Command executed with exit status {exit_status}")
+        return exit_status, out, err
+
+    async def run_commands_async(self, commands, timeout=None, idempotent=False):
+        """Run independent commands concurrently; results in order, like run_commands."""
+        async def run(command):
+            start = time.monotonic()
+            try:
+                exit_status, out, err = await self.run_command_async(command, timeout=timeout, idempotent=idempotent)
+            except Exception as e:
+                exit_status, out, err = None, "", str(e)
+            return exit_status, out, err, time.monotonic() - start
+        return list(await asyncio.gather(*(run(command) for command in commands)))
+
+    async def download_file_async(self, remote_path, local_path):
+        """Coroutine version of download_file (runs in a worker thread).
+
+        A cancelled download keeps running in its thread until the transfer ends; the shared
+        SFTP session lock serialises it with later transfers.
+        """
+        await asyncio.to_thread(self.download_file, remote_path, local_path)
+
+    @traced('ssh', 'gzip_download')
+    def download_file_compressed(self, remote_path, local_path, level=6, verify=True):
+        """Download a file gzip-compressed on the remote host and decompressed locally on the fly.
+
+        The remote 'gzip -c' output is streamed over an exec channel into a temporary file, which
+        replaces local_path only after the SHA-256 of the decompressed data matched the remote
+        'sha256sum' (if verify is set). Returns the transfer statistics (sizes, seconds, throughput).
+        """
+        print(f"Downloading file (gzip) from {self.host}:{remote_path} to {local_path}")
+        tmp_path = local_path + ".download"
+        try:
+            self.ensure_connected()
+            quoted = shlex.quote(remote_path)
+            command = f"gzip -c -{level} {quoted}"
+            if verify:
+                # The checksum goes to stderr so that stdout carries nothing but the gzip stream
+                command += f" && sha256sum {quoted} >&2"
+            start = time.time()
+            channel = self.client.get_transport().open_session()
+            channel.exec_command(command)
+            decompressor = zlib.decompressobj(wbits=31)
+            digest = hashlib.sha256()
+            wire_bytes = 0
+            raw_bytes = 0
+            stderr_chunks = []
+            with open(tmp_path, 'wb') as f:
+                while True:
+                    chunk = channel.recv(STREAM_CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    wire_bytes += len(chunk)
+                    data = decompressor.decompress(chunk)
+                    while decompressor.unused_data:
+                        # gzip output may consist of several members
+                        data += decompressor.flush()
+                        rest = decompressor.unused_data
+                        decompressor = zlib.decompressobj(wbits=31)
+                        data += decompressor.decompress(rest)
+                    if data:
+                        digest.update(data)
+                        f.write(data)
+                        raw_bytes += len(data)
+                    while channel.recv_stderr_ready():
+                        stderr_chunks.append(channel.recv_stderr(STREAM_CHUNK_SIZE))
+                data = decompressor.flush()
+                if data:
+                    digest.update(data)
+                    f.write(data)
+                    raw_bytes += len(data)
+            exit_status = channel.recv_exit_status()
+            while True:
+                chunk = channel.recv_stderr(STREAM_CHUNK_SIZE)
+                if not chunk:
+                    break
+                stderr_chunks.append(chunk)
+            channel.close()
+            err = b"".join(stderr_chunks).decode('utf-8', errors='ignore')
+            if exit_status != 0:
+                raise Exception(f"remote command exited with status {exit_status}: {err.strip()}")
+            if not decompressor.eof:
+                raise Exception("gzip stream is truncated")
+            local_digest = digest.hexdigest()
+            if verify:
+                remote_digest = err.split()[0] if err.split() else ""
+                if remote_digest != local_digest:
+                    raise Exception(f"checksum mismatch (remote {remote_digest or 'missing'}, local {local_digest})")
+            os.replace(tmp_path, local_path)
+            annotate(host=self.host, path=remote_path, bytes=wire_bytes, raw_bytes=raw_bytes)
+            seconds = max(time.time() - start, 1e-6)
+            stats = {
+                'raw_bytes': raw_bytes,
+                'wire_bytes': wire_bytes,
+                'seconds': seconds,
+                'ratio': raw_bytes / wire_bytes if wire_bytes else 0.0,
+                'throughput_mb_s': raw_bytes / seconds / (1024 * 1024),
+                'sha256': local_digest,
+                'verified': verify
+            }
+            print(f"File downloaded: {remote_path} -> {local_path} ({raw_bytes} bytes, {wire_bytes} on the wire, "
+                  f"{stats['ratio']:.1f}x, {seconds:.2f}s, {stats['throughput_mb_s']:.2f} MB/s effective"
+                  f"{', sha256 verified' if verify else ''})")
+            return stats
+        except Exception as e:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            error_msg = f"Failed to download file {remote_path} to {local_path} with compression: {e}"
+            print(error_msg)
+            raise Exception(error_msg)
+
+    def remote_file_info(self, remote_path):
+        """Return (size, mtime, sha256) of a remote file, or None if it does not exist."""
+        quoted = shlex.quote(remote_path)
+        exit_status, out, _ = self.run_command(f"[ -f {quoted} ] && stat -c '%s %Y' {quoted} && sha256sum {quoted}",
+                                               idempotent=True)
+        lines = out.split('\n')
+        if exit_status != 0 or len(lines) < 2:
+            return None
+        size, mtime = lines[0].split()
+        return int(size), int(mtime), lines[1].split()[0]
+
+    @traced('sftp', 'chunked_download')
+    def download_file_resumable(self, remote_path, local_path, chunk_size=RESUMABLE_CHUNK_SIZE,
+                                max_in_flight=RESUMABLE_MAX_IN_FLIGHT, max_reconnects=RESUMABLE_MAX_RECONNECTS):
+        """Download a file over SFTP in offset-addressed chunks with several read requests in flight.
+
+        Data goes to local_path + '.part'; the offset up to which it has been written is kept in a
+        sidecar file, so an interrupted download (also one of an earlier call) resumes from there
+        after a reconnect as long as the remote file is unchanged. The finished file must match the
+        remote size and SHA-256 before it replaces local_path; if it does not (e.g. a resumed prefix
+        of an older file), the download starts over once from offset 0. Returns the artifact record:
+        complete, bytes, expected_bytes, sha256, resumed_from, reconnects, seconds (and error if
+        incomplete).
+        Raises if the remote file does not exist.
+        """
+        print(f"Downloading file (chunked) from {self.host}:{remote_path} to {local_path}")
+        annotate(host=self.host, path=remote_path)
+        part_path = local_path + ".part"
+        state_path = part_path + ".json"
+        start = time.time()
+        record = {'method': 'sftp-chunked', 'complete': False, 'reconnects': 0}
+        restarted = False
+        while True:
+            remote = self.remote_file_info(remote_path)
+            if remote is None:
+                error_msg = f"Remote file {remote_path} does not exist."
+                print(f"ERROR: {error_msg}")
+                raise Exception(error_msg)
+            size, mtime, remote_digest = remote
+            state = {'remote_path': remote_path, 'size': size, 'mtime': mtime, 'offset': 0}
+            state['offset'] = self._resume_offset(part_path, state_path, state)
+            record.update({'bytes': state['offset'], 'expected_bytes': size})
+            record.setdefault('resumed_from', state['offset'])
+            if state['offset']:
+                print(f"Resuming download of {remote_path} at byte {state['offset']} of {size}")
+
+            if not self._fetch_ranges(remote_path, part_path, state_path, state, record, chunk_size,
+                                      max_in_flight, max_reconnects):
+                record['seconds'] = time.time() - start
+                annotate(outcome='incomplete', bytes=state['offset'] - record['resumed_from'],
+                         retries=record['reconnects'], error=record['error'])
+                print(f"Giving up download of {remote_path} at byte {state['offset']} of {size}: "
+                      f"{record['error']} (kept {part_path} for a later resume)")
+                return record
+
+            record['bytes'] = os.path.getsize(part_path)
+            record['seconds'] = time.time() - start
+            local_digest = _file_sha256(part_path)
+            if record['bytes'] == size and local_digest == remote_digest:
+                break
+            # A corrupt copy (e.g. a resumed prefix of an older file) cannot be resumed
+            record['error'] = f"verification failed ({record['bytes']} of {size} bytes, sha256 {local_digest})"
+            print(f"Download of {remote_path} {record['error']}")
+            for path in (part_path, state_path):
+                if os.path.exists(path):
+                    os.remove(path)
+            if restarted:
+                annotate(outcome='incomplete', bytes=size, retries=record['reconnects'], error=record['error'])
+                return record
+            print(f"Downloading {remote_path} again from the start")
+            restarted = True
+            record['resumed_from'] = 0
+            del record['error']
+        os.replace(part_path, local_path)
+        if os.path.exists(state_path):
+            os.remove(state_path)
+        record['complete'] = True
+        record['sha256'] = local_digest
+        transferred = size - record['resumed_from']
+        annotate(bytes=transferred, retries=record['reconnects'])
+        print(f"File downloaded: {remote_path} -> {local_path} ({size} bytes, {transferred} transferred, "
+              f"{record['seconds']:.2f}s, sha256 verified)")
+        return record
+
+    def _fetch_ranges(self, remote_path, part_path, state_path, state, record, chunk_size, max_in_flight,
+                      max_reconnects):
+        """Append remote_path[state['offset']:state['size']] to part_path, reconnecting on failures.
+
+        Returns False (with record['error'] set) once max_reconnects is exhausted.
+        """
+        size = state['size']
+
+        def fetch(sftp):
+            # Reads the remaining ranges; progress survives failures through state['offset']
+            with sftp.open(remote_path, 'rb') as remote_file, open(part_path, 'r+b') as f:
+                f.seek(state['offset'])
+                f.truncate()
+                while state['offset'] < size:
+                    ranges = []
+                    position = state['offset']
+                    while position < size and len(ranges) < max_in_flight:
+                        length = min(chunk_size, size - position)
+                        ranges.append((position, length))
+                        position += length
+                    for (_, length), data in zip(ranges, remote_file.readv(ranges)):
+                        if len(data) != length:
+                            raise Exception("remote file shrank during the download")
+                        f.write(data)
+                    f.flush()
+                    state['offset'] = position
+                    with open(state_path, 'w', encoding='utf-8') as state_file:
+                        json.dump(state, state_file)
+
+        if not os.path.exists(part_path):
+            open(part_path, 'wb').close()
+        while state['offset'] < size:
+            try:
+                self._sftp_call(fetch)
+            except Exception as e:
+                if record['reconnects'] >= max_reconnects:
+                    record['bytes'] = state['offset']
+                    record['error'] = str(e)
+                    return False
+                record['reconnects'] += 1
+                delay = min(30, 2 ** record['reconnects'])
+                print(f"Download of {remote_path} interrupted at byte {state['offset']}: {e}; "
+                      f"retrying in {delay}s")
+                time.sleep(delay)
+                try:
+                    self.ensure_connected()
+                except Exception as reconnect_error:
+                    print(f"Reconnect failed: {reconnect_error}")
+        return True
+
+    @traced('sftp', 'read_appended')
+    def read_appended(self, remote_path, offset, max_bytes=None, head_bytes=0, chunk_size=RESUMABLE_CHUNK_SIZE,
+                      max_in_flight=RESUMABLE_MAX_IN_FLIGHT):
+        """Return (remote size, first head_bytes, bytes from offset on) of a growing remote file.
+
+        At most max_bytes are read from offset; the head lets the caller notice that the file was
+        recreated and grew past its offset in the meantime. Returns (None, b'', b'') if the file
+        does not exist.
+        """
+        def read(sftp):
+            try:
+                size = sftp.stat(remote_path).st_size
+            except IOError:
+                return None, b'', b''
+            end = size if max_bytes is None else min(size, offset + max_bytes)
+            ranges = [(position, min(chunk_size, end - position)) for position in range(offset, end, chunk_size)]
+            head_range = [(0, min(head_bytes, size))] if head_bytes and size else []
+            if not ranges and not head_range:
+                return size, b'', b''
+            blocks = []
+            with sftp.open(remote_path, 'rb') as remote_file:
+                # The head rides along with the first batch of reads, so it costs no extra round trip
+                ranges = head_range + ranges
+                for start in range(0, len(ranges), max_in_flight):
+                    blocks.extend(remote_file.readv(ranges[start:start + max_in_flight]))
+            head = blocks.pop(0) if head_range else b''
+            return size, head, b"".join(blocks)
+        size, head, data = self._sftp_call(read)
+        annotate(host=self.host, path=remote_path, bytes=len(data))
+        return size, head, data
+
+    def _resume_offset(self, part_path, state_path, state):
+        """Return the offset at which a previous partial download can continue (0 to start over)."""
+        try:
+            with open(state_path, 'r', encoding='utf-8') as f:
+                saved = json.load(f)
+            if saved.get('growing'):
+                # Shipped while the file was being written (see log_shipper.py), possibly under a
+                # path the file was moved from since; the final hash check catches a wrong prefix
+                unchanged = state['size'] >= saved['offset']
+            else:
+                unchanged = all(saved.get(key) == state[key] for key in ('remote_path', 'size', 'mtime'))
+            if unchanged and os.path.getsize(part_path) >= saved['offset']:
+                return saved['offset']
+        except (OSError, ValueError, KeyError):
+            pass
+        for path in (part_path, state_path):
+            if os.path.exists(path):
+                os.remove(path)
+        return 0
+
+    @traced('sftp', 'upload')
     def upload_file(self, local_path, remote_path):
         """Upload a file to the remote host."""
         print(f"Uploading file from {local_path} to {self.host}:{remote_path}")
-        sftp = None
+        annotate(host=self.host, path=remote_path)
         try:
             if not self.client:
                 raise Exception("SSH client is not connected.")
@@ -67,52 +777,47 @@ class SSHManager:
                 warning_msg = f"Local file {local_path} does not exist."
                 print(f"WARNING: {warning_msg}")
                 raise Exception(warning_msg)
-            sftp = self.client.open_sftp()
-            sftp.put(local_path, remote_path)
+            self._sftp_call(lambda sftp: sftp.put(local_path, remote_path))
+            annotate(bytes=os.path.getsize(local_path))
             print(f"File uploaded: {local_path} -> {remote_path}")
         except Exception as e:
             error_msg = f"Failed to upload file {local_path} to {remote_path}: {e}"
             print(error_msg)
             raise Exception(error_msg)
-        finally:
-            if sftp:
-                sftp.close()
 
+    @traced('sftp', 'download')
     def download_file(self, remote_path, local_path):
         """Download a file from the remote host."""
         print(f"Downloading file from {self.host}:{remote_path} to {local_path}")
-        sftp = None
+        annotate(host=self.host, path=remote_path)
         try:
             if not self.client:
                 raise Exception("SSH client is not connected.")
-            sftp = self.client.open_sftp()
             try:
-                sftp.stat(remote_path)
+                self._sftp_call(lambda sftp: sftp.stat(remote_path))
             except Exception:
                 error_msg = f"Remote file {remote_path} does not exist."
                 print(f"ERROR: {error_msg}")
                 raise Exception(error_msg)
-            sftp.get(remote_path, local_path)
+            self._sftp_call(lambda sftp: sftp.get(remote_path, local_path))
+            annotate(bytes=os.path.getsize(local_path))
             print(f"File downloaded: {remote_path} -> {local_path}")
         except Exception as e:
             error_msg = f"Failed to download file {remote_path} to {local_path}: {e}"
             print(error_msg)
             raise Exception(error_msg)
-        finally:
-            if sftp:
-                sftp.close()
 
+    @traced('sftp', 'upload_dir')
     def upload_dir(self, local_dir, remote_dir):
         """
         Recursively upload all files from local_dir to remote_dir on the remote host.
         Creates any missing subdirectories under remote_dir.
         """
         print(f"Uploading directory {local_dir} to {self.host}:{remote_dir}")
-        sftp = None
+        annotate(host=self.host, path=remote_dir)
         try:
             if not self.client:
                 raise Exception("SSH client is not connected.")
-            sftp = self.client.open_sftp()
             # Check local directory existence
             if not os.path.isdir(local_dir):
                 error_msg = f"Local directory {local_dir} does not exist or is not a directory."
@@ -120,10 +825,10 @@ class SSHManager:
                 raise Exception(error_msg)
             # Ensure base remote_dir exists
             try:
-                sftp.stat(remote_dir)
+                self._sftp_call(lambda sftp: sftp.stat(remote_dir))
             except Exception:
                 try:
-                    sftp.mkdir(remote_dir)
+                    self._sftp_call(lambda sftp: sftp.mkdir(remote_dir))
                     print(f"Created directory: {remote_dir}")
                 except Exception as e_mkdir:
                     error_msg = f"Failed to create remote directory {remote_dir}: {e_mkdir}"
@@ -135,10 +840,10 @@ class SSHManager:
                 remote_root = remote_dir if relative_path == '.' else posixpath.join(remote_dir, relative_path)
                 # Ensure current remote directory exists
                 try:
-                    sftp.stat(remote_root)
+                    self._sftp_call(lambda sftp: sftp.stat(remote_root))
                 except Exception:
                     try:
-                        sftp.mkdir(remote_root)
+                        self._sftp_call(lambda sftp: sftp.mkdir(remote_root))
                         print(f"Created directory: {remote_root}")
                     except Exception as e_mkdir2:
                         error_msg = f"Failed to create remote directory {remote_root}: {e_mkdir2}"
@@ -149,7 +854,7 @@ class SSHManager:
                     local_path = os.path.join(root, filename)
                     remote_path = posixpath.join(remote_root, filename)
                     try:
-                        sftp.put(local_path, remote_path)
+                        self._sftp_call(lambda sftp: sftp.put(local_path, remote_path))
                         print(f"Uploaded file: {local_path} -> {remote_path}")
                     except Exception as e_put:
                         error_msg = f"Failed to upload file {local_path} to {remote_path}: {e_put}"
@@ -160,9 +865,6 @@ class SSHManager:
             error_msg = f"Failed to upload directory {local_dir} to {remote_dir}: {e}"
             print(error_msg)
             raise Exception(error_msg)
-        finally:
-            if sftp:
-                sftp.close()
 
     def close(self):
         """Close the SSH connection."""
@@ -170,7 +872,10 @@ class SSHManager:
             print("No SSH connection to close.")
             return
         print("Closing SSH connection.")
+        print(self.sftp_timing_summary())
+        print(self.connection_health_summary())
         try:
+            self._close_sftp()
             self.client.close()
             self.client = None
             print("SSH connection closed.")
@@ -178,19 +883,3 @@ class SSHManager:
             error_msg = f"Failed to close SSH connection to {self.host}: {e}"
             print(error_msg)
             raise Exception(error_msg)
-
-    def connect(self):
-        """Establish an SSH connection."""
-        print(f"Connecting to {self.host} as {self.user}...")
-        try:
-            self.client = paramiko.SSHClient()
-            self.client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
-            # Connect using the provided host, username, and private key file
-            self.client.connect(hostname=self.host, username=self.user, key_filename=self.key_path)
-            transport = self.client.get_transport()
-            transport.set_keepalive(30)
-            print(f"Connected to {self.host} with keepalive enabled")
-        except Exception as e:
-            error_msg = f"Failed to connect to {self.host} as {self.user}: {e}"
-            print(error_msg)
-            raise Exception(error_msg)
\ No newline at end of file
@@ -0,0 +1,165 @@
+import os
+import json
+import hashlib
+
+MANIFEST_NAME = "summary_manifest.json"
+
+# Files a summary is derived from; missing files are recorded too so that new inputs invalidate it
+INPUT_FILES = (
+    "locust_log.csv",
+    "locust_log.csv.gz",
+    "locust_log.csv.zst",
+    "locust_log.cols",
+    "locust_log_piggyback_timeout.csv",
+    "locust_log_piggyback_timeout.csv.gz",
+    "locust_log_piggyback_timeout.csv.zst",
+    "console_output.log",
+    "console_output.log.gz",
+    "console_output.log.zst",
+    "metadata.json",
+    "chaos_config.yaml"
+)
+
+# Modules whose code determines the summary content
+PROCESSOR_MODULES = (
+    "csv_processor.py",
+    "request_stats.py",
+    "columnar_log.py",
+    "latency_histogram.py",
+    "resilience_timeline.py",
+    "cardinality.py",
+    "console_log_parser.py",
+    "parallel_scan.py",
+    "artifact_io.py",
+    "error_classifier.py"
+)
+
+# Processor options that only change how a summary is computed, not its content
+EXECUTION_OPTIONS = ("parallel_scan_threshold_mb", "scan_workers")
+
+_processor_fingerprint = None
+
+
+def processor_fingerprint():
+    """Return PROCESSOR_VERSION combined with a hash of the processing code (computed once per process)."""
+    global _processor_fingerprint
+    if _processor_fingerprint is None:
+        from csv_processor import PROCESSOR_VERSION
+        digest = hashlib.sha256()
+        base_dir = os.path.dirname(os.path.abspath(__file__))
+        for module in PROCESSOR_MODULES:
+            path = os.path.join(base_dir, module)
+            if os.path.exists(path):
+                with open(path, 'rb') as f:
+                    digest.update(f.read())
+        _processor_fingerprint = f"{PROCESSOR_VERSION}-{digest.hexdigest()[:16]}"
+    return _processor_fingerprint
+
+
+def _file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class SummaryManifest:
+    """Records which inputs and processor version a result directory's summary was built from.
+
+    By default inputs are compared by size and mtime, which needs only a few stat calls per
+    directory. With use_hashes=True a content hash is stored as well, so files that were only
+    touched (same size, new mtime) still count as unchanged.
+    """
+
+    def __init__(self, result_dir, use_hashes=False):
+        self.result_dir = result_dir
+        self.path = os.path.join(result_dir, MANIFEST_NAME)
+        self.use_hashes = use_hashes
+
+    def _fingerprint_inputs(self, previous=None):
+        inputs = {}
+        for name in INPUT_FILES:
+            path = os.path.join(self.result_dir, name)
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                inputs[name] = None
+                continue
+            entry = {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+            if self.use_hashes:
+                old = (previous or {}).get(name)
+                if old and old.get('sha256') and old.get('size') == entry['size'] \
+                        and old.get('mtime_ns') == entry['mtime_ns']:
+                    entry['sha256'] = old['sha256']
+                else:
+                    entry['sha256'] = _file_sha256(path)
+            inputs[name] = entry
+        return inputs
+
+    def load(self):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return None
+
+    def is_current(self, params):
+        """True if the recorded summary still matches the inputs, parameters and processor code."""
+        manifest = self.load()
+        if not manifest:
+            return False
+        if manifest.get('processor') != processor_fingerprint() or manifest.get('params') != params:
+            return False
+        summary_path = manifest.get('summary')
+        if not summary_path or not os.path.exists(os.path.join(self.result_dir, summary_path)):
+            return False
+
+        recorded = manifest.get('inputs', {})
+        for name in INPUT_FILES:
+            old = recorded.get(name)
+            path = os.path.join(self.result_dir, name)
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                if old is not None:
+                    return False
+                continue
+            if old is None or old.get('size') != stat.st_size:
+                return False
+            if old.get('mtime_ns') != stat.st_mtime_ns:
+                if not (self.use_hashes and old.get('sha256') and old['sha256'] == _file_sha256(path)):
+                    return False
+        return True
+
+    def summary_path(self):
+        manifest = self.load()
+        if manifest and manifest.get('summary'):
+            return os.path.join(self.result_dir, manifest['summary'])
+        return None
+
+    def save(self, summary_path, params):
+        """Record a freshly generated summary."""
+        manifest = {
+            'processor': processor_fingerprint(),
+            'params': params,
+            'summary': os.path.relpath(summary_path, self.result_dir),
+            'inputs': self._fingerprint_inputs(previous=(self.load() or {}).get('inputs'))
+        }
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(tmp_path, self.path)
+
+    def invalidate(self):
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+
+def summary_params(schedule_name, master_count, worker_count, processor_options=None):
+    """Parameters that influence the summary content besides the input files."""
+    params = {'schedule_name': schedule_name, 'master_count': master_count, 'worker_count': worker_count}
+    options = {name: value for name, value in (processor_options or {}).items() if name not in EXECUTION_OPTIONS}
+    if options:
+        params['processor_options'] = dict(sorted(options.items()))
+    return params
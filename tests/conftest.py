@@ -0,0 +1,44 @@
+import os
+import sys
+import csv
+import random
+
+import pytest
+
+# The modules live flat in the repository root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+HEADERS = ["Timestamp", "User ID", "Status", "Response Time (ms)", "Error Type"]
+ERRORS = (
+    "ReadTimeout(HTTPConnectionPool(host='10.0.0.7', port=30080): Read timed out.)",
+    'ConnectionError(MaxRetryError("refused"))',
+    "HTTPError 500 Server Error",
+    "weird failure,\nspanning \"two\" lines"
+)
+
+
+def write_locust_log(path, rows=2000, seed=1):
+    """Write a Locust request log with failures, quoted multi-line errors and odd response times."""
+    rng = random.Random(seed)
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(HEADERS)
+        for i in range(rows):
+            timestamp = f"{1700000000 + i * 0.05:.3f}"
+            user_id = f"user_{rng.randint(1, 50)}"
+            response_time = f"{rng.expovariate(1 / 150.0):.2f}"
+            if i % 97 == 0:
+                response_time = ""
+            elif i % 211 == 0:
+                response_time = "n/a"
+            if rng.random() < 0.15:
+                writer.writerow([timestamp, user_id, rng.choice(["failure", "error"]), response_time,
+                                 rng.choice(ERRORS)])
+            else:
+                writer.writerow([timestamp, user_id, rng.choice(["success", "Success"]), response_time, ""])
+    return path
+
+
+@pytest.fixture
+def locust_log(tmp_path):
+    return write_locust_log(str(tmp_path / "locust_log.csv"))
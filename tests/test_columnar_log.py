@@ -0,0 +1,56 @@
+import os
+import csv
+
+from columnar_log import ColumnarLog, convert_csv, columnar_path_for, open_fresh_columnar, restores_csv
+
+
+def read_rows(csv_path):
+    with open(csv_path, 'r', encoding='utf-8', newline='') as f:
+        return [row for row in csv.reader(f) if row]
+
+
+def test_round_trip_restores_every_cell(locust_log):
+    cols_path = convert_csv(locust_log)
+    assert cols_path == columnar_path_for(locust_log)
+    with ColumnarLog(cols_path) as log:
+        assert [log.columns] + [list(row) for row in log.iter_rows()] == read_rows(locust_log)
+    assert restores_csv(cols_path, locust_log)
+
+
+def test_round_trip_keeps_number_formatting(tmp_path):
+    csv_path = str(tmp_path / "locust_log.csv")
+    rows = [
+        ["Timestamp", "Status", "Response Time (ms)"],
+        ["2025-01-01T00:00:00+01:00", "success", "12"],
+        ["1700000000.100", "success", "12.50"],
+        ["1700000000.2", "failure", "1e3"],
+        ["", "failure", "-0.0"],
+        ["abc", "success", ""],
+        ["1700000000.300", "success"]
+    ]
+    with open(csv_path, 'w', encoding='utf-8', newline='') as f:
+        csv.writer(f).writerows(rows)
+    cols_path = convert_csv(csv_path)
+    with ColumnarLog(cols_path) as log:
+        restored = [list(row) for row in log.iter_rows()]
+        assert log.column("Response Time (ms)")[1] == 12.5
+    # Short rows are padded to the header width
+    assert restored == rows[1:-1] + [["1700000000.300", "success", ""]]
+    assert restores_csv(cols_path, csv_path)
+
+
+def test_restores_csv_detects_a_changed_source(locust_log):
+    cols_path = convert_csv(locust_log)
+    with open(locust_log, 'a', encoding='utf-8', newline='') as f:
+        csv.writer(f).writerow(["1800000000.000", "user_1", "success", "1.00", ""])
+    assert not restores_csv(cols_path, locust_log)
+
+
+def test_stale_column_file_is_not_used(locust_log):
+    convert_csv(locust_log)
+    log = open_fresh_columnar(locust_log)
+    assert log is not None
+    log.close()
+    stat = os.stat(locust_log)
+    os.utime(locust_log, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1000000000))
+    assert open_fresh_columnar(locust_log) is None
@@ -0,0 +1,79 @@
+import math
+import random
+
+import pytest
+
+from latency_histogram import SUB_BUCKETS, LatencyHistogram
+from cardinality import ExactUserCounter, HyperLogLog
+
+
+def exact_percentile(values, percent):
+    ordered = sorted(values)
+    return ordered[max(1, math.ceil(len(ordered) * percent / 100.0)) - 1]
+
+
+@pytest.mark.parametrize('seed', range(3))
+def test_percentiles_within_relative_error(seed):
+    rng = random.Random(seed)
+    values = [rng.lognormvariate(5, 1.5) for _ in range(20000)]
+    histogram = LatencyHistogram()
+    for value in values:
+        histogram.record(value)
+    assert histogram.count == len(values)
+    assert histogram.mean == pytest.approx(sum(values) / len(values))
+    for percent in (1, 50, 90, 95, 99, 99.9, 100):
+        expected = exact_percentile(values, percent)
+        assert abs(histogram.percentile(percent) - expected) <= expected / SUB_BUCKETS
+
+
+def test_zero_and_missing_values():
+    histogram = LatencyHistogram()
+    for value in (0.0, 0.0, float('nan'), 5.0):
+        histogram.record(value)
+    assert histogram.count == 3
+    assert histogram.percentile(50) == 0.0
+    assert histogram.percentile(100) == 5.0
+    assert LatencyHistogram().percentile(99) == 0.0
+
+
+def test_merge_and_serialisation_are_exact():
+    rng = random.Random(7)
+    whole, first, second = LatencyHistogram(), LatencyHistogram(), LatencyHistogram()
+    for idx in range(5000):
+        value = rng.expovariate(1 / 200.0)
+        whole.record(value)
+        (first if idx % 2 else second).record(value)
+    merged = LatencyHistogram.from_dict(first.to_dict()).merge(second)
+    assert merged.buckets == whole.buckets
+    assert (merged.count, merged.min, merged.max) == (whole.count, whole.min, whole.max)
+    assert merged.percentiles() == whole.percentiles()
+    with pytest.raises(ValueError):
+        merged.merge(LatencyHistogram(sub_buckets=16))
+
+
+@pytest.mark.parametrize('distinct', (100, 5000, 200000))
+def test_hyperloglog_within_error_bound(distinct):
+    error = 0.01
+    counter = HyperLogLog(error=error)
+    for idx in range(distinct):
+        counter.add(f"user_{idx}")
+    # Four standard errors, so a correct implementation practically never fails
+    assert abs(counter.count() - distinct) <= 4 * error * distinct + 1
+
+
+def test_hyperloglog_merge_equals_union():
+    first, second, union = HyperLogLog(), HyperLogLog(), HyperLogLog()
+    for idx in range(30000):
+        (first if idx % 3 else second).add(str(idx))
+        union.add(str(idx))
+    assert first.merge(second).registers == union.registers
+
+
+def test_exact_user_counter():
+    first, second = ExactUserCounter(), ExactUserCounter()
+    for user_id in ("user_1", "user_2", "user_1", "07", "7", "alice", "user_99999999"):
+        first.add(user_id)
+    for user_id in ("user_2", "user_3", "alice", "bob"):
+        second.add(user_id)
+    assert first.count() == 6
+    assert first.merge(second).count() == 8
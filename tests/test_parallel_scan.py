@@ -0,0 +1,44 @@
+import io
+import csv
+
+import pytest
+
+from parallel_scan import split_record_ranges
+
+
+def records(data):
+    return list(csv.reader(io.StringIO(data.decode('utf-8'), newline='')))
+
+
+def make_log(rows):
+    buffer = io.StringIO(newline='')
+    writer = csv.writer(buffer, lineterminator='\n')
+    writer.writerow(["Timestamp", "Status", "Error Type"])
+    for idx in range(rows):
+        # Quoted fields with newlines, commas and escaped quotes on every third row
+        error = f'line one,\n"quoted"\nline {idx}' if idx % 3 == 0 else ""
+        writer.writerow([f"{1700000000 + idx}", "failure" if error else "success", error])
+    return buffer.getvalue().encode('utf-8')
+
+
+@pytest.mark.parametrize('chunk_bytes', (1, 7, 16, 64, 1000))
+def test_ranges_end_on_record_boundaries(chunk_bytes):
+    data = make_log(50)
+    data_start = data.index(b'\n') + 1
+    ranges = split_record_ranges(data, data_start, chunk_bytes)
+    assert ranges[0][0] == data_start and ranges[-1][1] == len(data)
+    assert all(end == start for (_, end), (start, _) in zip(ranges, ranges[1:]))
+    parts = [records(data[start:end]) for start, end in ranges]
+    assert all(parts)
+    assert [row for part in parts for row in part] == records(data[data_start:])
+
+
+def test_range_starting_inside_quotes():
+    data = b'h\n"a\nb\nc"\nd\n'
+    # Offset 4 lies inside the quoted field, its newline does not end the record
+    assert split_record_ranges(data, 2, 2) == [(2, 10), (10, 12)]
+
+
+def test_file_without_trailing_newline():
+    data = b'h\n1\n2\n"3\n4"'
+    assert split_record_ranges(data, 2, 1) == [(2, 4), (4, 6), (6, 11)]
@@ -0,0 +1,122 @@
+import re
+import csv
+
+import pytest
+
+from columnar_log import ColumnarLog, convert_csv
+from parallel_scan import scan_parallel
+from request_stats import RequestLogStats, resolve_columns
+import parallel_scan
+
+
+def reference_metrics(csv_path):
+    """The metrics as the multi-pass DictReader code computed them before RequestLogStats."""
+    total_requests = total_success = 0
+    sum_all_rt = sum_success_rt = 0.0
+    with open(csv_path, 'r', encoding='utf-8') as f:
+        for row in csv.DictReader(f):
+            total_requests += 1
+            if row['Response Time (ms)']:
+                try:
+                    rt = float(row['Response Time (ms)'])
+                except ValueError:
+                    continue
+                sum_all_rt += rt
+                if row['Status'].strip().lower() == 'success':
+                    total_success += 1
+                    sum_success_rt += rt
+
+    error_types = {}
+    with open(csv_path, 'r', encoding='utf-8') as f:
+        reader = csv.reader(f)
+        next(reader)
+        for row in reader:
+            if row[2].strip().lower() in ('error', 'failure', 'fail') and row[4].strip():
+                error_text = row[4].strip()
+                if "ReadTimeout" in error_text:
+                    error_type = "ReadTimeout"
+                elif "ConnectionError" in error_text:
+                    error_type = "ConnectionError"
+                else:
+                    match = re.search(r'([A-Za-z]+)(Error|Timeout|Exception)', error_text)
+                    if match:
+                        error_type = match.group(0)
+                    else:
+                        error_type = error_text[:30] + "..." if len(error_text) > 30 else error_text
+                error_types[error_type] = error_types.get(error_type, 0) + 1
+
+    unique_users = set()
+    with open(csv_path, 'r', encoding='utf-8') as f:
+        reader = csv.reader(f)
+        next(reader)
+        for row in reader:
+            if row[1].strip():
+                unique_users.add(row[1].strip())
+
+    return {
+        'total_requests': total_requests,
+        'total_success': total_success,
+        'avg_response_time': sum_all_rt / total_requests,
+        'avg_success_response_time': sum_success_rt / total_success,
+        'error_types': error_types,
+        'unique_users': len(unique_users)
+    }
+
+
+def assert_matches_reference(stats, expected):
+    assert stats.total_requests == expected['total_requests']
+    assert stats.total_success == expected['total_success']
+    assert stats.avg_response_time == pytest.approx(expected['avg_response_time'])
+    assert stats.avg_success_response_time == pytest.approx(expected['avg_success_response_time'])
+    assert stats.error_types == expected['error_types']
+    assert stats.unique_user_count == expected['unique_users']
+
+
+def assert_same_histogram(histogram, expected):
+    # Bucket counts merge exactly, only the float sum depends on the addition order
+    data, expected_data = histogram.to_dict(), expected.to_dict()
+    assert data.pop('sum') == pytest.approx(expected_data.pop('sum'))
+    assert data == expected_data
+
+
+def scan_csv(csv_path):
+    with open(csv_path, 'r', encoding='utf-8', newline='') as f:
+        reader = csv.reader(f)
+        columns = resolve_columns(next(reader))
+        return RequestLogStats().consume(reader, columns)
+
+
+def test_single_pass_matches_reference(locust_log):
+    assert_matches_reference(scan_csv(locust_log), reference_metrics(locust_log))
+
+
+def test_columnar_scan_matches_reference(locust_log):
+    with ColumnarLog(convert_csv(locust_log)) as log:
+        stats = RequestLogStats().consume_columnar(log)
+    assert_matches_reference(stats, reference_metrics(locust_log))
+
+
+def test_parallel_scan_matches_single_pass(locust_log, monkeypatch):
+    # Small ranges, so that quoted multi-line errors end up next to range boundaries
+    monkeypatch.setattr(parallel_scan, 'MIN_CHUNK_BYTES', 4096)
+    stats = scan_parallel(locust_log, workers=2, chunk_bytes=4096)
+    single = scan_csv(locust_log)
+    assert_matches_reference(stats, reference_metrics(locust_log))
+    assert list(stats.error_types) == list(single.error_types)
+    assert_same_histogram(stats.histogram, single.histogram)
+
+
+def test_merged_parts_equal_whole(locust_log):
+    with open(locust_log, 'r', encoding='utf-8', newline='') as f:
+        reader = csv.reader(f)
+        columns = resolve_columns(next(reader))
+        rows = list(reader)
+    half = len(rows) // 2
+    merged = RequestLogStats().consume(rows[:half], columns).merge(RequestLogStats().consume(rows[half:], columns))
+    whole = scan_csv(locust_log)
+    assert merged.total_requests == whole.total_requests
+    assert merged.error_types == whole.error_types
+    assert merged.errors.first_seen == whole.errors.first_seen
+    assert merged.errors.last_seen == whole.errors.last_seen
+    assert_same_histogram(merged.histogram, whole.histogram)
+    assert merged.unique_user_count == whole.unique_user_count
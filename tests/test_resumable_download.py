@@ -0,0 +1,113 @@
+import os
+import json
+import hashlib
+
+import pytest
+
+pytest.importorskip('paramiko')
+
+from ssh_manager import SSHManager
+
+
+class LocalFile:
+    def __init__(self, path, sftp):
+        self.file = open(path, 'rb')
+        self.sftp = sftp
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.file.close()
+
+    def readv(self, ranges):
+        if self.sftp.fail_after is not None:
+            if self.sftp.fail_after == 0:
+                raise IOError("channel closed")
+            self.sftp.fail_after -= 1
+        for offset, length in ranges:
+            self.file.seek(offset)
+            yield self.file.read(length)
+
+
+class LocalSFTP:
+    """Serves the 'remote' file from the local disk; fail_after readv calls it breaks."""
+
+    def __init__(self):
+        self.fail_after = None
+
+    def open(self, path, mode='rb'):
+        return LocalFile(path, self)
+
+
+@pytest.fixture
+def manager(monkeypatch):
+    manager = SSHManager('host', 'user', 'key')
+    sftp = manager.test_sftp = LocalSFTP()
+
+    def remote_file_info(remote_path):
+        if not os.path.exists(remote_path):
+            return None
+        with open(remote_path, 'rb') as f:
+            data = f.read()
+        return len(data), int(os.stat(remote_path).st_mtime), hashlib.sha256(data).hexdigest()
+
+    monkeypatch.setattr(manager, 'remote_file_info', remote_file_info)
+    monkeypatch.setattr(manager, '_sftp_call', lambda operation: operation(sftp))
+    monkeypatch.setattr(manager, 'ensure_connected', lambda probe=False: None)
+    return manager
+
+
+@pytest.fixture
+def remote(tmp_path):
+    path = tmp_path / "remote.bin"
+    path.write_bytes(os.urandom(100000))
+    return str(path)
+
+
+def test_complete_download_removes_part_and_sidecar(manager, remote, tmp_path):
+    local = str(tmp_path / "local.bin")
+    record = manager.download_file_resumable(remote, local, chunk_size=4096, max_in_flight=2)
+    assert record['complete'] and record['resumed_from'] == 0
+    assert open(local, 'rb').read() == open(remote, 'rb').read()
+    assert record['sha256'] == hashlib.sha256(open(remote, 'rb').read()).hexdigest()
+    assert not os.path.exists(local + ".part") and not os.path.exists(local + ".part.json")
+
+
+def test_interrupted_download_resumes_from_sidecar_offset(manager, remote, tmp_path):
+    local = str(tmp_path / "local.bin")
+    manager.test_sftp.fail_after = 3
+    record = manager.download_file_resumable(remote, local, chunk_size=4096, max_in_flight=2, max_reconnects=0)
+    assert not record['complete'] and 'error' in record
+    with open(local + ".part.json") as f:
+        offset = json.load(f)['offset']
+    assert offset == 3 * 2 * 4096 == os.path.getsize(local + ".part")
+
+    manager.test_sftp.fail_after = None
+    record = manager.download_file_resumable(remote, local, chunk_size=4096, max_in_flight=2)
+    assert record['complete'] and record['resumed_from'] == offset
+    assert open(local, 'rb').read() == open(remote, 'rb').read()
+
+
+def test_sidecar_of_a_changed_remote_file_is_discarded(manager, remote, tmp_path):
+    local = str(tmp_path / "local.bin")
+    with open(local + ".part", 'wb') as f:
+        f.write(b"x" * 8192)
+    with open(local + ".part.json", 'w') as f:
+        json.dump({'remote_path': remote, 'size': 123, 'mtime': 0, 'offset': 8192}, f)
+    record = manager.download_file_resumable(remote, local, chunk_size=4096)
+    assert record['complete'] and record['resumed_from'] == 0
+    assert open(local, 'rb').read() == open(remote, 'rb').read()
+
+
+def test_corrupt_prefix_restarts_from_zero_once(manager, remote, tmp_path):
+    local = str(tmp_path / "local.bin")
+    size, mtime, _ = manager.remote_file_info(remote)
+    # A matching sidecar, but the prefix is not the remote file's (e.g. an older file under the same name)
+    with open(local + ".part", 'wb') as f:
+        f.write(b"x" * 8192)
+    with open(local + ".part.json", 'w') as f:
+        json.dump({'remote_path': remote, 'size': size, 'mtime': mtime, 'offset': 8192}, f)
+    record = manager.download_file_resumable(remote, local, chunk_size=4096)
+    assert record['complete'] and record['resumed_from'] == 0
+    assert open(local, 'rb').read() == open(remote, 'rb').read()
@@ -0,0 +1,73 @@
+import os
+
+import pytest
+
+import summary_manifest
+from summary_manifest import SummaryManifest, summary_params
+
+
+@pytest.fixture
+def result_dir(tmp_path, locust_log):
+    (tmp_path / "console_output.log").write_text("Aggregated 10 0(0.00%)\n")
+    (tmp_path / "locust_log_summary.csv").write_text("# summary\n")
+    return str(tmp_path)
+
+
+def saved_manifest(result_dir, params, use_hashes=False):
+    manifest = SummaryManifest(result_dir, use_hashes=use_hashes)
+    manifest.save(os.path.join(result_dir, "locust_log_summary.csv"), params)
+    return manifest
+
+
+def touch(path):
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1000000000))
+
+
+def test_current_until_an_input_changes(result_dir):
+    params = summary_params("pod-kill", 1, 3)
+    manifest = saved_manifest(result_dir, params)
+    assert manifest.is_current(params)
+    assert manifest.summary_path() == os.path.join(result_dir, "locust_log_summary.csv")
+    with open(os.path.join(result_dir, "locust_log.csv"), 'a') as f:
+        f.write("1800000000.000,user_1,success,1.00,\n")
+    assert not manifest.is_current(params)
+
+
+def test_new_and_removed_inputs_make_it_stale(result_dir):
+    params = summary_params("pod-kill", 1, 3)
+    manifest = saved_manifest(result_dir, params)
+    metadata_path = os.path.join(result_dir, "metadata.json")
+    with open(metadata_path, 'w') as f:
+        f.write('{"user_count": 4}')
+    assert not manifest.is_current(params)
+    manifest = saved_manifest(result_dir, params)
+    os.remove(metadata_path)
+    assert not manifest.is_current(params)
+
+
+def test_touched_input_is_current_only_with_hashes(result_dir):
+    params = summary_params("pod-kill", 1, 3)
+    assert saved_manifest(result_dir, params).is_current(params)
+    hashed = saved_manifest(result_dir, params, use_hashes=True)
+    touch(os.path.join(result_dir, "locust_log.csv"))
+    assert hashed.is_current(params)
+    assert not SummaryManifest(result_dir).is_current(params)
+
+
+def test_params_processor_and_missing_summary(result_dir, monkeypatch):
+    params = summary_params("pod-kill", 1, 3, {'user_count_mode': 'exact'})
+    manifest = saved_manifest(result_dir, params)
+    assert not manifest.is_current(summary_params("pod-kill", 1, 2, {'user_count_mode': 'exact'}))
+    assert not manifest.is_current(summary_params("pod-kill", 1, 3, {'user_count_mode': 'approximate'}))
+    # Execution options don't change the summary content
+    assert manifest.is_current(summary_params("pod-kill", 1, 3, {'user_count_mode': 'exact', 'scan_workers': 8}))
+
+    monkeypatch.setattr(summary_manifest, '_processor_fingerprint', "0-changed")
+    assert not manifest.is_current(params)
+    monkeypatch.undo()
+
+    os.remove(os.path.join(result_dir, "locust_log_summary.csv"))
+    assert not manifest.is_current(params)
+    manifest.invalidate()
+    assert manifest.load() is None